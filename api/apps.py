@@ -1,6 +1,8 @@
 import importlib
 import logging
+import os
 import pkgutil
+import sys
 
 from django.apps import AppConfig
 
@@ -9,6 +11,16 @@ _ALREADY_REGISTERED = False
 
 logger = logging.getLogger(__name__)
 
+
+def _is_server_process() -> bool:
+    """
+    Whether the app serves requests, pipeline jobs must not be run by management commands
+    nor by the parent process of the autoreloader.
+    """
+    if os.path.basename(sys.argv[0]) != 'manage.py':
+        return True
+    return sys.argv[1:2] == ['runserver'] and (os.environ.get('RUN_MAIN') == 'true' or '--noreload' in sys.argv)
+
 class ApiConfig(AppConfig):
     name = 'api'
 
@@ -53,6 +65,14 @@ class ApiConfig(AppConfig):
         if plugin_classes:
             self._register_plugin_urls(plugin_classes)
 
+        # Every node type is defined once the plugins are imported
+        from core.audio.pipeline.audio_pipeline_node_registry import node_types
+        node_types.build()
+
+        if _is_server_process():
+            from core.audio.pipeline.audio_pipeline_job_executor import start_job_executor
+            start_job_executor()
+
         _ALREADY_REGISTERED = True
 
     def _register_plugin_urls(self, plugin_classes):
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.audio.pipeline.audio_pipeline_job_retention import compact_pipeline_job_history
+
+
+class Command(BaseCommand):
+    help = ("Applies the retention policy of pipeline jobs, run periodically by the open-cinema-job-retention "
+            "timer when Celery beat is not running")
+
+    def handle(self, *args, **options):
+        compacted = compact_pipeline_job_history(settings.PIPELINE_JOB_HISTORY_KEEP,
+                                                 settings.PIPELINE_JOB_HISTORY_BATCH_SIZE,
+                                                 settings.PIPELINE_JOB_SUMMARY_DAYS)
+        self.stdout.write(f"Compacted {compacted} pipeline jobs")
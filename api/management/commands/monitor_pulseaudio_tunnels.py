@@ -0,0 +1,17 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+
+from plugin.pulseaudio.audio.pulse_audio_tunnel_monitor import TunnelMonitor
+
+
+class Command(BaseCommand):
+    help = "Samples the health of the applied PulseAudio tunnel nodes, and reapplies the dead ones if enabled"
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stop.set())
+
+        TunnelMonitor().run(stop)
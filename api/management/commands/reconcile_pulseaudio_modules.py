@@ -0,0 +1,19 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from plugin.pulseaudio.audio.pulse_audio_module_reconciler import reconcile_modules
+
+
+class Command(BaseCommand):
+    help = ("Unloads the PulseAudio modules no node state references and prunes the node states whose module "
+            "is gone, typically run when the application starts")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be done")
+
+    def handle(self, *args, **options):
+        report = reconcile_modules(dry_run=options['dry_run'])
+        self.stdout.write(json.dumps(report.to_dict(), indent=2))
+        if report.errors:
+            self.stderr.write(f"{len(report.errors)} module(s) could not be unloaded")
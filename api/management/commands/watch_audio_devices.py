@@ -0,0 +1,56 @@
+import logging
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.tasks.audio_device_discovery import reconcile_backend_devices
+from core.audio.audio_backend import AudioBackend
+from core.audio.audio_backends import AudioBackends
+
+logger = logging.getLogger(__name__)
+
+
+def _poll(backend: AudioBackend, interval: float, stop: threading.Event) -> None:
+    """Fallback for the backends without a watcher."""
+    while not stop.is_set():
+        try:
+            reconcile_backend_devices(backend.name, backend.devices())
+        except Exception as e:
+            logger.exception(f"Failed to discover {backend.name} devices: {e}")
+        finally:
+            close_old_connections()
+        stop.wait(interval)
+
+
+class Command(BaseCommand):
+    help = "Keeps the known audio devices up to date by watching the device events of the enabled backends"
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stop.set())
+
+        interval = getattr(settings, 'AUDIO_DEVICE_RECONCILE_INTERVAL', 300)
+        threads = []
+        for backend in AudioBackends.get_enabled():
+            watcher = backend.get_device_watcher()
+            if watcher is not None:
+                target, target_args = watcher.run, (stop,)
+                self.stdout.write(f"Watching {backend.name} devices")
+            else:
+                target, target_args = _poll, (backend, interval, stop)
+                self.stdout.write(f"Polling {backend.name} devices every {interval}s")
+            thread = threading.Thread(target=target, args=target_args, name=f'device-watcher-{backend.name}')
+            thread.start()
+            threads.append(thread)
+
+        if not threads:
+            self.stdout.write("No audio backend is enabled")
+            return
+
+        stop.wait()
+        for thread in threads:
+            thread.join()
@@ -0,0 +1,17 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_squashed_0035_alter_knownaudiodevice_nice_name'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='audiopipelineapplyevent',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
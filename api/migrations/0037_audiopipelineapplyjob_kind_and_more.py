@@ -0,0 +1,47 @@
+import django_enum.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0036_alter_audiopipelineapplyevent_created_at'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='audiopipelineapplyjob',
+            name='api_AudioPipelineApplyJob_status_JobStatus',
+        ),
+        migrations.AlterField(
+            model_name='audiopipelineapplyjob',
+            name='status',
+            field=django_enum.fields.EnumCharField(choices=[('STARTED', 'Started'), ('RUNNING', 'Running'), ('SUCCESS', 'Success'), ('FAILED', 'Failed'), ('CANCELLED', 'Cancelled')], default='STARTED', max_length=9),
+        ),
+        migrations.AddConstraint(
+            model_name='audiopipelineapplyjob',
+            constraint=models.CheckConstraint(condition=models.Q(('status__in', ['STARTED', 'RUNNING', 'SUCCESS', 'FAILED', 'CANCELLED'])), name='api_AudioPipelineApplyJob_status_JobStatus'),
+        ),
+        migrations.AddField(
+            model_name='audiopipelineapplyjob',
+            name='kind',
+            field=django_enum.fields.EnumCharField(choices=[('APPLY', 'Apply'), ('UNAPPLY', 'Unapply')], default='APPLY', max_length=7),
+        ),
+        migrations.AddConstraint(
+            model_name='audiopipelineapplyjob',
+            constraint=models.CheckConstraint(condition=models.Q(('kind__in', ['APPLY', 'UNAPPLY'])), name='api_AudioPipelineApplyJob_kind_JobKind'),
+        ),
+        migrations.RemoveConstraint(
+            model_name='audiopipelineapplyevent',
+            name='api_AudioPipelineApplyEvent_event_type_EventType',
+        ),
+        migrations.AlterField(
+            model_name='audiopipelineapplyevent',
+            name='event_type',
+            field=django_enum.fields.EnumCharField(choices=[('START', 'Start'), ('SUCCESS', 'Success'), ('FAILURE', 'Failure'), ('STARTED_NODE', 'Started Node'), ('COMPLETED_NODE', 'Completed Node'), ('CANCELLED', 'Cancelled')], max_length=14),
+        ),
+        migrations.AddConstraint(
+            model_name='audiopipelineapplyevent',
+            constraint=models.CheckConstraint(condition=models.Q(('event_type__in', ['START', 'SUCCESS', 'FAILURE', 'STARTED_NODE', 'COMPLETED_NODE', 'CANCELLED'])), name='api_AudioPipelineApplyEvent_event_type_EventType'),
+        ),
+    ]
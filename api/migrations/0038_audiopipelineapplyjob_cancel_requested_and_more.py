@@ -0,0 +1,30 @@
+import django_enum.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0037_audiopipelineapplyjob_kind_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='audiopipelineapplyjob',
+            name='cancel_requested',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RemoveConstraint(
+            model_name='audiopipelineapplyevent',
+            name='api_AudioPipelineApplyEvent_event_type_EventType',
+        ),
+        migrations.AlterField(
+            model_name='audiopipelineapplyevent',
+            name='event_type',
+            field=django_enum.fields.EnumCharField(choices=[('START', 'Start'), ('SUCCESS', 'Success'), ('FAILURE', 'Failure'), ('STARTED_NODE', 'Started Node'), ('COMPLETED_NODE', 'Completed Node'), ('CANCELLED', 'Cancelled'), ('TIMEOUT', 'Timeout')], max_length=14),
+        ),
+        migrations.AddConstraint(
+            model_name='audiopipelineapplyevent',
+            constraint=models.CheckConstraint(condition=models.Q(('event_type__in', ['START', 'SUCCESS', 'FAILURE', 'STARTED_NODE', 'COMPLETED_NODE', 'CANCELLED', 'TIMEOUT'])), name='api_AudioPipelineApplyEvent_event_type_EventType'),
+        ),
+    ]
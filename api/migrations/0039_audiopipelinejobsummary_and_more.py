@@ -0,0 +1,40 @@
+import django.db.models.deletion
+import django_enum.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0038_audiopipelineapplyjob_cancel_requested_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AudioPipelineJobSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_id', models.BigIntegerField(unique=True)),
+                ('kind', django_enum.fields.EnumCharField(choices=[('APPLY', 'Apply'), ('UNAPPLY', 'Unapply')], max_length=7)),
+                ('status', django_enum.fields.EnumCharField(choices=[('STARTED', 'Started'), ('RUNNING', 'Running'), ('SUCCESS', 'Success'), ('FAILED', 'Failed'), ('CANCELLED', 'Cancelled')], max_length=9)),
+                ('created_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(null=True)),
+                ('event_count', models.IntegerField(default=0)),
+                ('failed_nodes', models.IntegerField(default=0)),
+                ('pipeline', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='api.audiopipeline')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['pipeline', '-created_at'], name='api_summary_pipeline_idx')],
+                'constraints': [models.CheckConstraint(condition=models.Q(('kind__in', ['APPLY', 'UNAPPLY'])), name='api_AudioPipelineJobSummary_kind_JobKind'), models.CheckConstraint(condition=models.Q(('status__in', ['STARTED', 'RUNNING', 'SUCCESS', 'FAILED', 'CANCELLED'])), name='api_AudioPipelineJobSummary_status_JobStatus')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='audiopipelineapplyevent',
+            index=models.Index(fields=['job', 'created_at'], name='api_event_job_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='audiopipelineapplyjob',
+            index=models.Index(fields=['pipeline', '-created_at'], name='api_job_pipeline_created_idx'),
+        ),
+    ]
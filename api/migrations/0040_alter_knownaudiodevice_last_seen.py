@@ -0,0 +1,17 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0039_audiopipelinejobsummary_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='knownaudiodevice',
+            name='last_seen',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='Last time device was detected'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0040_alter_knownaudiodevice_last_seen'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AudioDeviceDiscoveryState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=50, unique=True)),
+                ('fingerprint', models.CharField(blank=True, max_length=64)),
+                ('heartbeat_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -0,0 +1,36 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def open_active_devices(apps, schema_editor):
+    # Devices connected before the intervals existed, the earliest sure presence is their last_seen
+    KnownAudioDevice = apps.get_model('api', 'KnownAudioDevice')
+    AudioDevicePresence = apps.get_model('api', 'AudioDevicePresence')
+    AudioDevicePresence.objects.bulk_create([
+        AudioDevicePresence(device_id=device.id, up_from=device.last_seen)
+        for device in KnownAudioDevice.objects.filter(active=True)
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0041_audiodevicediscoverystate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AudioDevicePresence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('up_from', models.DateTimeField()),
+                ('up_to', models.DateTimeField(null=True)),
+                ('device', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='presences', to='api.knownaudiodevice')),
+            ],
+            options={
+                'ordering': ['up_from'],
+                'indexes': [models.Index(fields=['device', 'up_from'], name='api_presence_device_idx')],
+            },
+        ),
+        migrations.RunPython(open_active_devices, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0042_audiodevicepresence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pulseaudiopipenode',
+            name='latency_msec',
+            field=models.IntegerField(default=200, help_text='The latency target of the loopback, in milliseconds'),
+        ),
+        migrations.AddField(
+            model_name='pulseaudiopipenode',
+            name='adjust_time',
+            field=models.IntegerField(help_text='How often the loopback adjusts its rate to keep the latency, in seconds. 0 disables it', null=True),
+        ),
+        migrations.AddField(
+            model_name='pulseaudiopipenode',
+            name='max_latency_msec',
+            field=models.IntegerField(help_text='The latency the loopback may increase to after underruns, in milliseconds', null=True),
+        ),
+        migrations.AddField(
+            model_name='pulseaudiopipenode',
+            name='fast_adjust_threshold_msec',
+            field=models.IntegerField(help_text='Deviation from the latency target above which the loopback jumps back to it, in milliseconds', null=True),
+        ),
+        migrations.AddField(
+            model_name='pulseaudiopipenode',
+            name='auto_tune',
+            field=models.BooleanField(default=False, help_text='Lower the latency target after applying, as long as the loopback stays stable'),
+        ),
+        migrations.AddField(
+            model_name='pulseaudiopipenode',
+            name='tuned_latency_msec',
+            field=models.IntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='pulseaudiopipenode',
+            name='tuned_from_msec',
+            field=models.IntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='pulseaudiopipenode',
+            name='tuned_at',
+            field=models.DateTimeField(null=True),
+        ),
+    ]
@@ -0,0 +1,38 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0043_pulseaudiopipenode_latency'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PulseAudioRtpNode',
+            fields=[
+                ('audiopipelinenode_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='api.audiopipelinenode')),
+                ('mode', models.CharField(choices=[('SEND', 'send'), ('RECEIVE', 'receive')], help_text='The mode of the node. Either send or receive', max_length=255, null=True)),
+                ('destination_ip', models.CharField(default='224.0.0.56', help_text='The multicast group to send the stream to. Only available in send mode', max_length=255, null=True)),
+                ('port', models.IntegerField(help_text='The port to send the stream to, picked by PulseAudio if empty. Only available in send mode', null=True)),
+                ('ttl', models.IntegerField(help_text='The multicast TTL, 1 keeps the stream on the local network. Only available in send mode', null=True)),
+                ('loop', models.BooleanField(default=False, help_text='Also deliver the stream to the local host, for a receiver on the same machine. Only available in send mode')),
+                ('sap_address', models.CharField(help_text='The address the streams are announced on, 224.0.0.56 if empty. Only available in receive mode', max_length=255, null=True)),
+                ('latency_msec', models.IntegerField(help_text='The latency of the receiver, in milliseconds. Only available in receive mode', null=True)),
+                ('rate', models.IntegerField(help_text='The sample rate of the stream', null=True)),
+                ('channels', models.IntegerField(help_text='The number of channels of the stream', null=True)),
+            ],
+            bases=('api.audiopipelinenode',),
+        ),
+        migrations.CreateModel(
+            name='PulseAudioRtpNodeState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('device', models.ForeignKey(null=True, on_delete=django.db.models.deletion.RESTRICT, to='api.knownaudiodevice')),
+                ('module', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='api.pulseaudiocreatedmodule')),
+                ('node', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='api.pulseaudiortpnode')),
+                ('sink_module', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.pulseaudiocreatedmodule')),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+def cancel_superseded_jobs(apps, schema_editor):
+    # Jobs left pending by concurrent requests, only the latest of each pipeline would have run
+    AudioPipelineApplyJob = apps.get_model('api', 'AudioPipelineApplyJob')
+    latest = {}
+    for job in AudioPipelineApplyJob.objects.filter(status='STARTED').order_by('id'):
+        latest[job.pipeline_id] = job.id
+    (AudioPipelineApplyJob.objects
+     .filter(status='STARTED')
+     .exclude(id__in=list(latest.values()))
+     .update(status='CANCELLED'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0044_pulseaudiortpnode_pulseaudiortpnodestate'),
+    ]
+
+    operations = [
+        migrations.RunPython(cancel_superseded_jobs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='audiopipelineapplyjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'STARTED')), fields=('pipeline',),
+                                               name='api_job_one_pending_per_pipeline'),
+        ),
+    ]
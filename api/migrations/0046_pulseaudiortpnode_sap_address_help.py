@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 01:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0045_audiopipelineapplyjob_one_pending_per_pipeline'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pulseaudiortpnode',
+            name='sap_address',
+            field=models.CharField(help_text='The address the streams are announced on, 224.0.0.56 if empty. Every stream announced there is played, whatever its multicast group. Only available in receive mode', max_length=255, null=True),
+        ),
+    ]
@@ -1,9 +1,11 @@
 from api.models.audio.audio_device import AudioDevice
 from api.models.audio.known_audio_device import KnownAudioDevice
+from api.models.audio.audio_device_discovery_state import AudioDeviceDiscoveryState
+from api.models.audio.audio_device_presence import AudioDevicePresence
 from api.models.audio.pipeline.audio_pipeline_node import AudioPipelineNode
 from api.models.audio.pipeline.audio_pipeline_device_node import AudioPipelineDeviceNode
 from .camilladsp_pipeline import CamillaDSPPipeline
 from .camilladsp_filter import Filter
 from .camilladsp_mixer import Mixer
 
-__all__ = ["AudioDevice", "KnownAudioDevice", "AudioPipelineNode", "AudioPipelineDeviceNode", "CamillaDSPPipeline", "Filter", "Mixer"]
\ No newline at end of file
+__all__ = ["AudioDevice", "KnownAudioDevice", "AudioDeviceDiscoveryState", "AudioDevicePresence", "AudioPipelineNode", "AudioPipelineDeviceNode", "CamillaDSPPipeline", "Filter", "Mixer"]
\ No newline at end of file
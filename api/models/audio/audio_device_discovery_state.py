@@ -0,0 +1,37 @@
+from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+
+class AudioDeviceDiscoveryState(models.Model):
+    """
+    Fingerprint of the last device discovery written to KnownAudioDevice, per scope (a backend name,
+    or '*' for the discovery of every backend). A discovery with the same fingerprint has nothing to
+    write, only its heartbeat is updated.
+    """
+
+    ALL_BACKENDS = '*'
+
+    scope = models.CharField(max_length=50, unique=True)
+
+    fingerprint = models.CharField(max_length=64, blank=True)
+
+    # Last discovery with this fingerprint
+    heartbeat_at = models.DateTimeField(default=timezone.now)
+
+    # Last discovery that wrote the devices
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.scope}: {self.fingerprint} (seen {self.heartbeat_at})"
+
+
+def reset_discovery_fingerprints() -> None:
+    """Forces the next discoveries to write, called whenever the known devices are changed by other means."""
+    AudioDeviceDiscoveryState.objects.exclude(fingerprint='').update(fingerprint='')
+
+
+@receiver([post_save, post_delete], sender='api.KnownAudioDevice')
+def _known_device_changed(**kwargs):
+    reset_discovery_fingerprints()
@@ -0,0 +1,63 @@
+from django.db import models
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from api.models.audio.known_audio_device import KnownAudioDevice
+
+
+class AudioDevicePresence(models.Model):
+    """
+    Interval during which a device was connected. A row is only written when a device appears or
+    disappears, the interval of a device that is still connected has no end. See sync_presences.
+    """
+
+    device = models.ForeignKey(KnownAudioDevice, on_delete=models.CASCADE, related_name='presences')
+
+    up_from = models.DateTimeField()
+
+    up_to = models.DateTimeField(null=True)
+
+    class Meta:
+        ordering = ['up_from']
+        indexes = [
+            models.Index(fields=['device', 'up_from'], name='api_presence_device_idx'),
+        ]
+
+    def to_dict(self, since=None, until=None):
+        """The interval clipped to the given window."""
+        up_from = max(self.up_from, since) if since is not None else self.up_from
+        up_to = self.up_to if self.up_to is not None else until
+        if up_to is not None and until is not None:
+            up_to = min(up_to, until)
+        return {
+            'up_from': up_from,
+            'up_to': up_to,
+            'ongoing': self.up_to is None,
+        }
+
+
+def sync_presences(device_ids: list[int], at=None) -> None:
+    """
+    Brings the intervals of the given devices in line with their `active` flag: an interval is started for
+    an active device without an ongoing one, the ongoing interval of an inactive device is ended.
+    Every change of `active` goes through here, whether it is written by save() or by a bulk update.
+    """
+    if not device_ids:
+        return
+    at = at or timezone.now()
+    appeared = (KnownAudioDevice.objects
+                .filter(id__in=device_ids, active=True)
+                .exclude(id__in=AudioDevicePresence.objects.filter(up_to__isnull=True).values('device_id'))
+                .values_list('id', flat=True))
+    AudioDevicePresence.objects.bulk_create([AudioDevicePresence(device_id=i, up_from=at) for i in appeared])
+    (AudioDevicePresence.objects
+     .filter(device_id__in=device_ids, up_to__isnull=True, device__active=False)
+     .update(up_to=at))
+
+
+@receiver(post_save, sender=KnownAudioDevice)
+def _known_device_saved(instance: KnownAudioDevice, update_fields=None, **kwargs):
+    # Devices saved outside of the discovery, created or reactivated by a tunnel for example
+    if update_fields is None or 'active' in update_fields:
+        sync_presences([instance.id])
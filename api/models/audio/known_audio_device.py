@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class KnownAudioDevice(models.Model):
@@ -34,7 +35,8 @@ class KnownAudioDevice(models.Model):
     channels = models.IntegerField(help_text="Number of audio channels")
     active = models.BooleanField(default=False, help_text="Whether device is currently connected")
 
-    last_seen = models.DateTimeField(auto_now=True, help_text="Last time device was detected")
+    # Set by the discovery, which only writes the devices that changed, see sync_known_devices
+    last_seen = models.DateTimeField(default=timezone.now, help_text="Last time device was detected")
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
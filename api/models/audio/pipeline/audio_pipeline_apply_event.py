@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django_enum import EnumField
 
 from api.models import AudioPipelineNode
@@ -11,12 +12,15 @@ class EventType(models.TextChoices):
     FAILURE = 'FAILURE'
     STARTED_NODE = 'STARTED_NODE'
     COMPLETED_NODE = 'COMPLETED_NODE'
+    CANCELLED = 'CANCELLED'
+    TIMEOUT = 'TIMEOUT'
 
 
 class AudioPipelineApplyEvent(models.Model):
     job = models.ForeignKey(AudioPipelineApplyJob, on_delete=models.CASCADE)
 
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the event happens, not when it is written, events are inserted in batches
+    created_at = models.DateTimeField(default=timezone.now)
 
     event_type = EnumField(EventType, null=False)
 
@@ -31,3 +35,16 @@ class AudioPipelineApplyEvent(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Events are always read per job, in order
+            models.Index(fields=['job', 'created_at'], name='api_event_job_created_idx'),
+        ]
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'event_type': self.event_type,
+            'created_at': self.created_at,
+            'node': self.node_id,
+            'data': self.data
+        }
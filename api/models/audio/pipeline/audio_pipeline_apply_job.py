@@ -8,6 +8,11 @@ class JobStatus(models.TextChoices):
     RUNNING = 'RUNNING'
     SUCCESS = 'SUCCESS'
     FAILED = 'FAILED'
+    CANCELLED = 'CANCELLED'
+
+class JobKind(models.TextChoices):
+    APPLY = 'APPLY'
+    UNAPPLY = 'UNAPPLY'
 
 class AudioPipelineApplyJob(models.Model):
 
@@ -15,7 +20,20 @@ class AudioPipelineApplyJob(models.Model):
 
     status = EnumField(JobStatus, default=JobStatus.STARTED)
 
+    kind = EnumField(JobKind, default=JobKind.APPLY)
+
+    # Checked by the worker between nodes, see JobDeadline.checkpoint
+    cancel_requested = models.BooleanField(default=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['pipeline', '-created_at'], name='api_job_pipeline_created_idx'),
+        ]
+        constraints = [
+            # Pending jobs are coalesced, see create_pipeline_job
+            models.UniqueConstraint(fields=['pipeline'], condition=models.Q(status=JobStatus.STARTED),
+                                    name='api_job_one_pending_per_pipeline'),
+        ]
@@ -0,0 +1,53 @@
+from django.db import models
+from django_enum import EnumField
+
+from api.models.audio.audio_pipeline import AudioPipeline
+from api.models.audio.pipeline.audio_pipeline_apply_job import JobStatus, JobKind
+
+
+class AudioPipelineJobSummary(models.Model):
+    """
+    Compact outcome of a job whose detail was removed by the retention policy,
+    see compact_pipeline_job_history.
+    """
+
+    pipeline = models.ForeignKey(AudioPipeline, on_delete=models.CASCADE)
+
+    # Id of the deleted AudioPipelineApplyJob
+    job_id = models.BigIntegerField(unique=True)
+
+    kind = EnumField(JobKind)
+
+    status = EnumField(JobStatus)
+
+    created_at = models.DateTimeField()
+
+    # Time of the last event of the job, null if it had none
+    finished_at = models.DateTimeField(null=True)
+
+    event_count = models.IntegerField(default=0)
+
+    failed_nodes = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['pipeline', '-created_at'], name='api_summary_pipeline_idx'),
+        ]
+
+    def duration(self) -> float | None:
+        if self.finished_at is None:
+            return None
+        return (self.finished_at - self.created_at).total_seconds()
+
+    def to_dict(self):
+        return {
+            'job': self.job_id,
+            'kind': self.kind,
+            'status': self.status,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+            'duration': self.duration(),
+            'event_count': self.event_count,
+            'failed_nodes': self.failed_nodes,
+        }
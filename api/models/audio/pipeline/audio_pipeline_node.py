@@ -34,5 +34,13 @@ class AudioPipelineNode(models.Model):
         """
         return cls._meta.local_fields
 
+    @classmethod
+    def get_secret_fields(cls) -> list[Field]:
+        """
+        Returns the fields holding secrets, they are left out of the graph snapshots handed to the workers,
+        which read them from the database instead.
+        """
+        return []
+
     def get_slot_by_name(self, slot_name: str) -> AudioPipelineNodeSlot:
         return self.slots.get(name=slot_name)
\ No newline at end of file
@@ -40,6 +40,6 @@ class AudioPipelineNodeSlot(models.Model):
             "nice_name": self.name,
             "type": self.type.label,         # or .value
             "direction": self.direction.label,
-            "node": self.node.id
+            "node": self.node_id
         }
 
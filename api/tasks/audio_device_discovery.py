@@ -1,14 +1,191 @@
+import hashlib
 import logging
 from datetime import timedelta
+from typing import Iterable, NamedTuple
+
+from django.db import transaction
 from django.utils import timezone
 
-from api.models import KnownAudioDevice
-from core.audio.audio_backends import AudioBackends
+from api.models import KnownAudioDevice, AudioDeviceDiscoveryState
+from api.models.audio.audio_device_discovery_state import reset_discovery_fingerprints
+from api.models.audio.audio_device_presence import sync_presences
+from core.audio.audio_backends import AudioBackends, BackendDiscovery
+from core.audio.audio_device import AudioDevice
 
 logger = logging.getLogger(__name__)
 
 
-def discover_and_update_audio_devices():
+# last_seen of unchanged devices is only refreshed when older than this, to avoid rewriting every row
+LAST_SEEN_RESOLUTION = timedelta(minutes=5)
+
+
+class DeviceSyncResult(NamedTuple):
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deactivated: int = 0
+    # Set by discover_and_update_audio_devices
+    backends: tuple[BackendDiscovery, ...] = ()
+    snapshot_age: float = 0.0
+    # The discovery had the same fingerprint as the last one, nothing was written
+    skipped: bool = False
+
+
+def _device_values(device: AudioDevice) -> dict:
+    return {
+        'nice_name': device.nice_name,
+        'device_type': device.device_type.name,
+        'format': device.device_format.name,
+        'sample_rate': device.sample_rate,
+        'channels': device.channels,
+        'active': True,
+    }
+
+
+def discovery_fingerprint(devices: list[AudioDevice]) -> str:
+    """
+    Digest of a normalized discovery result, independent of the order of the devices.
+    """
+    entries = sorted(
+        (device.backend.name, device.name, device.device_type.name, device.device_format.name,
+         str(device.sample_rate), str(device.channels), device.nice_name or '')
+        for device in devices
+    )
+    return hashlib.sha256('\n'.join('\t'.join(entry) for entry in entries).encode()).hexdigest()
+
+
+def _heartbeat(scope: str, fingerprint: str) -> bool:
+    """
+    Updates the heartbeat of the scope if its last discovery had the same fingerprint, in one query.
+
+    :return: Whether the fingerprint matched.
+    """
+    return AudioDeviceDiscoveryState.objects.filter(scope=scope, fingerprint=fingerprint) \
+        .update(heartbeat_at=timezone.now()) > 0
+
+
+def _record_fingerprint(scope: str, fingerprint: str) -> None:
+    now = timezone.now()
+    AudioDeviceDiscoveryState.objects.update_or_create(
+        scope=scope, defaults={'fingerprint': fingerprint, 'heartbeat_at': now, 'changed_at': now})
+
+
+def sync_known_devices(devices: list[AudioDevice], deactivate_missing: bool = False,
+                       backends: Iterable[str] | None = None) -> DeviceSyncResult:
+    """
+    Records the given devices as active, only the rows that changed are written.
+    Existing rows are fetched in one query and diffed in memory, then created and updated in bulk,
+    all in a single transaction.
+
+    :param devices: The discovered devices.
+    :param deactivate_missing: Whether the known devices that are not in `devices` are marked inactive.
+    :param backends: Restricts the deactivation to these backends, all backends if None.
+    """
+    now = timezone.now()
+    discovered = {(device.backend.name, device.name): device for device in devices}
+
+    rows = KnownAudioDevice.objects.all()
+    if not deactivate_missing or backends is not None:
+        rows = rows.filter(backend__in={key[0] for key in discovered} | set(backends or ()))
+
+    with transaction.atomic():
+        existing = {(row.backend, row.name): row for row in rows.select_for_update()}
+
+        to_create: list[KnownAudioDevice] = []
+        to_update: list[KnownAudioDevice] = []
+        updated_fields: set[str] = set()
+        unchanged_ids: list[int] = []
+        reactivated_ids: set[int] = set()
+        for key, device in discovered.items():
+            values = _device_values(device)
+            row = existing.get(key)
+            if row is None:
+                to_create.append(KnownAudioDevice(backend=key[0], name=key[1], last_seen=now, **values))
+                logger.info(f"New device discovered: {device.name} ({device.backend.name})")
+                continue
+
+            changed = [field for field, value in values.items() if getattr(row, field) != value]
+            if not changed:
+                unchanged_ids.append(row.id)
+                continue
+            if 'active' in changed:
+                reactivated_ids.add(row.id)
+            for field in changed:
+                setattr(row, field, values[field])
+            row.last_seen = now
+            to_update.append(row)
+            updated_fields.update(changed)
+            logger.debug(f"Updated device: {device.name} ({device.backend.name}): {', '.join(changed)}")
+
+        if to_create:
+            KnownAudioDevice.objects.bulk_create(to_create)
+        if to_update:
+            KnownAudioDevice.objects.bulk_update(to_update, [*updated_fields, 'last_seen'])
+        # Presence intervals are only written when a device appears or disappears
+        appeared = [row.id for row in to_create] + [row.id for row in to_update if row.id in reactivated_ids]
+        sync_presences(appeared, now)
+        if unchanged_ids:
+            (KnownAudioDevice.objects
+             .filter(id__in=unchanged_ids, last_seen__lt=now - LAST_SEEN_RESOLUTION)
+             .update(last_seen=now))
+
+        deactivated = 0
+        if deactivate_missing:
+            scope = None if backends is None else set(backends)
+            missing = [row for key, row in existing.items()
+                       if row.active and key not in discovered and (scope is None or row.backend in scope)]
+            if missing:
+                deactivated = KnownAudioDevice.objects.filter(id__in=[row.id for row in missing]).update(active=False)
+                sync_presences([row.id for row in missing], now)
+                for row in missing:
+                    logger.info(f"Device marked as inactive: {row.name} ({row.backend})")
+
+        # Bulk operations send no signal, the fingerprints of the other scopes are no longer valid
+        if to_create or to_update or deactivated:
+            reset_discovery_fingerprints()
+
+    return DeviceSyncResult(len(to_create), len(to_update), len(unchanged_ids), deactivated)
+
+
+def update_known_devices(devices: list[AudioDevice]) -> DeviceSyncResult:
+    """
+    Records the given devices as active, used by the device watchers on hot-plug and change events.
+    """
+    return sync_known_devices(devices)
+
+
+def deactivate_known_devices(backend: str, names: Iterable[str]) -> int:
+    """
+    Marks the given devices of a backend as inactive.
+
+    :return: The number of devices that were active.
+    """
+    ids = list(KnownAudioDevice.objects
+               .filter(backend=backend, name__in=list(names), active=True)
+               .values_list('id', flat=True))
+    with transaction.atomic():
+        count = KnownAudioDevice.objects.filter(id__in=ids, active=True).update(active=False)
+        sync_presences(ids)
+    if count:
+        reset_discovery_fingerprints()
+        logger.info(f"{count} {backend} device(s) marked as inactive")
+    return count
+
+
+def reconcile_backend_devices(backend: str, devices: list[AudioDevice]) -> DeviceSyncResult:
+    """
+    Synchronizes the known devices of a single backend with its full device list.
+    Nothing is written if the list is the same as the last time.
+    """
+    fingerprint = discovery_fingerprint(devices)
+    if _heartbeat(backend, fingerprint):
+        return DeviceSyncResult(unchanged=len(devices), skipped=True)
+    result = sync_known_devices(devices, deactivate_missing=True, backends=[backend])
+    _record_fingerprint(backend, fingerprint)
+    return result
+
+
+def discover_and_update_audio_devices() -> DeviceSyncResult:
     """
     Periodic task to discover audio devices and update the KnownAudioDevice table.
     This should be run regularly (e.g., every 30 seconds) to keep device status current.
@@ -16,56 +193,30 @@ def discover_and_update_audio_devices():
     logger.info("Starting audio device discovery task")
 
     try:
-        # Discover all devices from backend
-        discovered_devices = AudioBackends.get_all_devices()
-
-        # Track which devices we've seen
-        seen_device_keys = set()
-
-        for device in discovered_devices:
-            # Create a unique key for this device
-            device_key = (device.backend.name, device.name)
-            seen_device_keys.add(device_key)
-
-            # Update or create a device in the database
-            known_device, created = KnownAudioDevice.objects.update_or_create(
-                backend=device.backend.name,
-                name=device.name,
-                defaults={
-                    'nice_name': device.nice_name,
-                    'device_type': device.device_type.name,
-                    'format': device.device_format.name,
-                    'sample_rate': device.sample_rate,
-                    'channels': device.channels,
-                    'active': True,
-                }
-            )
-
-            if created:
-                logger.info(f"New device discovered: {device.name} ({device.backend.name})")
-            else:
-                logger.debug(f"Updated device: {device.name} ({device.backend.name})")
-
-        # Mark devices as inactive if they weren't discovered
-        # (but only if they were seen recently - within last 5 minutes)
-        inactive_devices = KnownAudioDevice.objects.filter(
-            active=True,
-        ).exclude(
-            backend__in=[key[0] for key in seen_device_keys],
-            name__in=[key[1] for key in seen_device_keys]
-        )
-
-        for device in inactive_devices:
-            device_key = (device.backend, device.name)
-            if device_key not in seen_device_keys:
-                device.active = False
-                device.save()
-                logger.info(f"Device marked as inactive: {device.name} ({device.backend})")
-
-        logger.info(f"Audio device discovery completed. Found {len(discovered_devices)} active devices")
+        snapshot = AudioBackends.snapshot()
+        discoveries = snapshot.discoveries
+        discovered_devices = [device for discovery in discoveries for device in discovery.devices]
+
+        # The devices of a backend that failed are left as they are, such a partial result is not fingerprinted
+        failed = {discovery.backend for discovery in discoveries if discovery.error is not None}
+        fingerprint = None if failed else discovery_fingerprint(discovered_devices)
+        scope = AudioDeviceDiscoveryState.ALL_BACKENDS
+        if fingerprint is not None and _heartbeat(scope, fingerprint):
+            result = DeviceSyncResult(unchanged=len(discovered_devices), skipped=True)
+        else:
+            backends = set(KnownAudioDevice.objects.values_list('backend', flat=True).distinct()) - failed
+            result = sync_known_devices(discovered_devices, deactivate_missing=True, backends=backends)
+            if fingerprint is not None:
+                _record_fingerprint(scope, fingerprint)
+        result = result._replace(backends=tuple(discoveries), snapshot_age=snapshot.age())
+        logger.info(f"Audio device discovery completed. Found {len(discovered_devices)} active devices "
+                    f"({result.created} created, {result.updated} updated, {result.unchanged} unchanged, "
+                    f"{result.deactivated} deactivated)")
+        return result
 
     except Exception as e:
         logger.error(f"Error during audio device discovery: {e}", exc_info=True)
+        return DeviceSyncResult()
 
 
 # For manual invocation
@@ -1,19 +1,30 @@
 import logging
+from functools import partial
+from typing import Callable
 
 from celery import shared_task
+from django.conf import settings
 
 from api.models import AudioPipelineDeviceNode
 from api.models.audio.audio_pipeline import AudioPipeline
-from api.models.audio.pipeline.audio_pipeline_apply_job import AudioPipelineApplyJob, JobStatus
+from api.models.audio.pipeline.audio_pipeline_apply_event import EventType
+from api.models.audio.pipeline.audio_pipeline_apply_job import AudioPipelineApplyJob, JobStatus, JobKind
 from api.models.audio.pipeline.audio_pipeline_io_node import AudioPipelineIONode
 from api.models.audio.pipeline.audio_pipeline_processing_node import AudioPipelineProcessingNode
-from core.audio.pipeline.audio_pipeline_graph import AudioPipelineGraph, AudioPipelineGraphNode
+from core.audio.pipeline.audio_pipeline_graph import AudioPipelineGraphNode, AudioPipelineGraph
+from core.audio.pipeline.audio_pipeline_graph_snapshot import load_graph
 from core.audio.pipeline.audio_pipeline_job_utils import job_log_success_event, job_log_failure_event, PipelineJobEventData, \
-    job_log_failure_node_event, job_log_node_start_event, job_log_completed_node_event
+    job_log_failure_node_event, job_log_node_start_event, job_log_completed_node_event, JobEventBuffer, claim_job, \
+    job_log_timeout_event, job_log_cancelled_event
+from core.audio.pipeline.audio_pipeline_job_deadline import JobDeadline, run_with_timeout
+from core.audio.pipeline.audio_pipeline_job_lock import pipeline_lock
+from core.audio.pipeline.pipeline_job_interrupted_exception import PipelineJobInterruptedException, \
+    PipelineJobTimeoutException
+from core.audio.pipeline.pipeline_lock_timeout_exception import PipelineLockTimeoutException
 
 logger = logging.getLogger(__name__)
 
-def get_node_by_priority(root: AudioPipelineGraphNode, job: AudioPipelineApplyJob) -> list[AudioPipelineGraphNode]:
+def get_node_by_priority(root: AudioPipelineGraphNode, events: JobEventBuffer) -> list[AudioPipelineGraphNode]:
     device_nodes: list[AudioPipelineGraphNode] = []
     processing_nodes: list[AudioPipelineGraphNode] = []
     to_process: list[AudioPipelineGraphNode] = [root]
@@ -25,93 +36,217 @@ def get_node_by_priority(root: AudioPipelineGraphNode, job: AudioPipelineApplyJo
             processing_nodes.append(node)
         else:
             raise Exception(f"Cannot make priorities, unknown node type {type(node.data)}")
-        job_log_node_start_event(job, node.data)
+        job_log_node_start_event(events, node.data)
         to_process.extend([edge.to_node for edge in node.outgoing])
 
     return [*device_nodes, *processing_nodes]
 
-@shared_task(bind=True)
-def apply_audio_pipeline(self, pipeline_id: int, job_id: int):
-    job = AudioPipelineApplyJob.objects.get(id=job_id)
-    pipeline = AudioPipeline.objects.get(id=pipeline_id)
-    graph = AudioPipelineGraph(pipeline)
-
-    job.status = JobStatus.RUNNING
-    job.save()
-    roots = graph.get_roots()
-    if len(roots) == 0:
-        job_log_success_event(job)
-        return 0
-    if len(roots) > 1:
-        job_log_failure_event(job, PipelineJobEventData(graph_errors=['Multiple roots found']))
-        return 0
+def _is_noop(job: AudioPipelineApplyJob, pipeline: AudioPipeline) -> bool:
+    """
+    A job is a no-op when the pipeline is already in the state it would put it in.
+    """
+    if pipeline.stale:
+        return False
+    return pipeline.active if job.kind == JobKind.APPLY else not pipeline.active
+
 
+def _run_job(pipeline_id: int, job_id: int, run: Callable[[AudioPipeline, JobEventBuffer], None]):
+    """
+    Runs a job while holding the lock of its pipeline, so that the jobs of a pipeline never overlap.
+    Jobs that were superseded while waiting for the lock are skipped.
+    """
+    job = AudioPipelineApplyJob.objects.get(id=job_id)
     try:
-        nodes = get_node_by_priority(roots[0], job)
-    except Exception as e:
-        logger.exception(f"Failed to get node priorities for pipeline {pipeline_id}: {e}")
-        job_log_failure_event(job, PipelineJobEventData(graph_errors=[str(e)]))
-        pipeline.stale = True
-        pipeline.save()
-        return None
+        with pipeline_lock(pipeline_id):
+            if not claim_job(job):
+                logger.info(f"Skipping job {job_id}, it was cancelled before it started")
+                return None
+            pipeline = AudioPipeline.objects.get(id=pipeline_id)
+
+            with JobEventBuffer(job) as events:
+                if _is_noop(job, pipeline):
+                    events.log(EventType.SUCCESS, status=JobStatus.SUCCESS,
+                               data=PipelineJobEventData(reason='Pipeline is already in the requested state'))
+                    return None
+                run(pipeline, events)
+    except PipelineLockTimeoutException as e:
+        logger.error(f"Job {job_id} failed: {e}")
+        with JobEventBuffer(job) as events:
+            job_log_failure_event(events, PipelineJobEventData(graph_errors=[str(e)]))
+    return None
+
+
+def _new_deadline(job_id: int) -> JobDeadline:
+    return JobDeadline(job_id,
+                       getattr(settings, 'PIPELINE_JOB_TIMEOUT', None),
+                       getattr(settings, 'PIPELINE_NODE_TIMEOUT', None))
+
+
+def _wait_worker(e: PipelineJobTimeoutException, node_id: int) -> bool:
+    """
+    Waits a bounded time for the operation of a node that timed out.
 
-    for node in nodes:
+    :return: False if it was abandoned, the pipeline must then be left stale.
+    """
+    if e.wait_worker(getattr(settings, 'PIPELINE_NODE_ABANDON_AFTER', 10)):
+        return True
+    logger.error(f"Gave up on node {node_id}, it is still running. Its writes will be rolled back, "
+                 f"the modules it loads are left to the module reconciler")
+    return False
+
+
+def _run_node(node: AudioPipelineGraphNode, graph: AudioPipelineGraph, deadline: JobDeadline, apply: bool):
+    manager = node.data.get_manager()
+    action = manager.apply if apply else manager.unapply
+    run_with_timeout(partial(action, node, graph), deadline.node_budget(),
+                     f"{'Applying' if apply else 'Unapplying'} node {node.data.id}")
+
+
+def _log_interruption(events: JobEventBuffer, e: PipelineJobInterruptedException, node_id: int):
+    if isinstance(e, PipelineJobTimeoutException):
+        job_log_timeout_event(events, node_id, PipelineJobEventData(node_errors=[str(e)]))
+    else:
+        job_log_cancelled_event(events, PipelineJobEventData(reason=str(e)))
+
+
+def _rollback(nodes: list[AudioPipelineGraphNode], graph: AudioPipelineGraph, deadline: JobDeadline) -> bool:
+    """
+    Unapplies the given nodes in reverse order, after a timeout or a cancellation.
+    Every node operation is over or abandoned when it returns, an abandoned one cannot commit anything
+    so a later job cannot race with it.
+
+    :return: True if every node was rolled back.
+    """
+    success = True
+    for node in reversed(nodes):
         try:
-            node.data.get_manager().apply(node, graph)
-            job_log_completed_node_event(job, node.data.id)
+            # The job deadline may be over, only the node timeout applies to the rollback
+            run_with_timeout(partial(node.data.get_manager().unapply, node, graph), deadline.node_timeout,
+                             f'Rolling back node {node.data.id}')
+        except PipelineJobTimeoutException as e:
+            logger.error(f"Failed to roll back node {node.data.id}: {e}")
+            _wait_worker(e, node.data.id)
+            success = False
         except Exception as e:
-            logger.exception(f"Failed to apply node {node.data.id}: {e}")
-            job_log_failure_node_event(job, node.data, PipelineJobEventData(node_errors=[str(e)]))
+            logger.exception(f"Failed to roll back node {node.data.id}: {e}")
+            success = False
+    return success
+
+
+@shared_task(bind=True)
+def apply_audio_pipeline(self, pipeline_id: int, job_id: int, snapshot: dict | None = None):
+
+    def run(pipeline: AudioPipeline, events: JobEventBuffer):
+        deadline = _new_deadline(job_id)
+        graph = load_graph(pipeline, snapshot)
+
+        roots = graph.get_roots()
+        if len(roots) == 0:
+            job_log_success_event(events)
+            return
+        if len(roots) > 1:
+            job_log_failure_event(events, PipelineJobEventData(graph_errors=['Multiple roots found']))
+            return
+
+        try:
+            nodes = get_node_by_priority(roots[0], events)
+        except Exception as e:
+            logger.exception(f"Failed to get node priorities for pipeline {pipeline_id}: {e}")
+            job_log_failure_event(events, PipelineJobEventData(graph_errors=[str(e)]))
             pipeline.stale = True
             pipeline.save()
-            return None
-
-    job_log_success_event(job)
-    pipeline.active = True
-    pipeline.stale = False
-    pipeline.save()
+            return
+        # End of the planning phase
+        events.flush()
+
+        applied: list[AudioPipelineGraphNode] = []
+        for node in nodes:
+            try:
+                deadline.checkpoint()
+                _run_node(node, graph, deadline, apply=True)
+            except PipelineJobInterruptedException as e:
+                logger.warning(f"Apply of pipeline {pipeline_id} interrupted, rolling back: {e}")
+                _log_interruption(events, e, node.data.id)
+                events.flush()
+                abandoned = False
+                if isinstance(e, PipelineJobTimeoutException):
+                    # The apply of the node still runs, it is rolled back once it is over since it
+                    # may be partially applied. The pipeline lock is held in the meantime, for a
+                    # bounded time: a node that is still running is abandoned.
+                    if _wait_worker(e, node.data.id):
+                        applied.append(node)
+                    else:
+                        abandoned = True
+                rolled_back = _rollback(applied, graph, deadline)
+                pipeline.stale = abandoned or not rolled_back
+                pipeline.save()
+                return
+            except Exception as e:
+                logger.exception(f"Failed to apply node {node.data.id}: {e}")
+                job_log_failure_node_event(events, node.data, PipelineJobEventData(node_errors=[str(e)]))
+                pipeline.stale = True
+                pipeline.save()
+                return
+            applied.append(node)
+            job_log_completed_node_event(events, node.data.id)
+
+        job_log_success_event(events)
+        pipeline.active = True
+        pipeline.stale = False
+        pipeline.save()
 
-    return None
+    return _run_job(pipeline_id, job_id, run)
 
 
 @shared_task(bind=True)
-def unapply_audio_pipeline(self, pipeline_id: int, job_id: int):
-    job = AudioPipelineApplyJob.objects.get(id=job_id)
-    pipeline = AudioPipeline.objects.get(id=pipeline_id)
-    graph = AudioPipelineGraph(pipeline)
-
-    job.status = JobStatus.RUNNING
-    job.save()
-    roots = graph.get_roots()
-    if len(roots) == 0:
-        job_log_success_event(job)
-        return 0
-    if len(roots) > 1:
-        job_log_failure_event(job, PipelineJobEventData(graph_errors=['Multiple roots found']))
-        return 0
+def unapply_audio_pipeline(self, pipeline_id: int, job_id: int, snapshot: dict | None = None):
 
-    try:
-        nodes = get_node_by_priority(roots[0], job)
-    except Exception as e:
-        logger.exception(f"Failed to get node priorities for pipeline {pipeline_id}: {e}")
-        job_log_failure_event(job, PipelineJobEventData(graph_errors=[str(e)]))
-        pipeline.stale = True
-        pipeline.save()
-        return None
+    def run(pipeline: AudioPipeline, events: JobEventBuffer):
+        deadline = _new_deadline(job_id)
+        graph = load_graph(pipeline, snapshot)
+
+        roots = graph.get_roots()
+        if len(roots) == 0:
+            job_log_success_event(events)
+            return
+        if len(roots) > 1:
+            job_log_failure_event(events, PipelineJobEventData(graph_errors=['Multiple roots found']))
+            return
 
-    for node in reversed(nodes):
         try:
-            node.data.get_manager().unapply(node, graph)
-            job_log_completed_node_event(job, node.data.id)
+            nodes = get_node_by_priority(roots[0], events)
         except Exception as e:
-            job_log_failure_node_event(job, node.data, PipelineJobEventData(node_errors=[f'Error unapplying node: {str(e)}']))
+            logger.exception(f"Failed to get node priorities for pipeline {pipeline_id}: {e}")
+            job_log_failure_event(events, PipelineJobEventData(graph_errors=[str(e)]))
             pipeline.stale = True
             pipeline.save()
-            return None
-
-    job_log_success_event(job)
-    pipeline.active = False
-    pipeline.stale = False
-    pipeline.save()
+            return
+        # End of the planning phase
+        events.flush()
+
+        for node in reversed(nodes):
+            try:
+                deadline.checkpoint()
+                _run_node(node, graph, deadline, apply=False)
+                job_log_completed_node_event(events, node.data.id)
+            except PipelineJobInterruptedException as e:
+                # Nodes already unapplied are not applied again, the pipeline is left stale
+                _log_interruption(events, e, node.data.id)
+                events.flush()
+                if isinstance(e, PipelineJobTimeoutException):
+                    _wait_worker(e, node.data.id)
+                pipeline.stale = True
+                pipeline.save()
+                return
+            except Exception as e:
+                job_log_failure_node_event(events, node.data, PipelineJobEventData(node_errors=[f'Error unapplying node: {str(e)}']))
+                pipeline.stale = True
+                pipeline.save()
+                return
+
+        job_log_success_event(events)
+        pipeline.active = False
+        pipeline.stale = False
+        pipeline.save()
 
-    return None
+    return _run_job(pipeline_id, job_id, run)
@@ -0,0 +1,20 @@
+import logging
+
+from celery import shared_task
+from django.conf import settings
+
+from core.audio.pipeline.audio_pipeline_job_retention import compact_pipeline_job_history
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def compact_audio_pipeline_jobs():
+    """
+    Periodic task applying the retention policy of pipeline jobs, see CELERY_BEAT_SCHEDULE.
+    """
+    compacted = compact_pipeline_job_history(settings.PIPELINE_JOB_HISTORY_KEEP,
+                                             settings.PIPELINE_JOB_HISTORY_BATCH_SIZE,
+                                             settings.PIPELINE_JOB_SUMMARY_DAYS)
+    logger.info(f"Compacted {compacted} pipeline jobs")
+    return compacted
@@ -24,6 +24,7 @@ urlpatterns = [
 
     # Audio devices
     path("devices", api.views.audio.audio_devices.get_devices, name="get_devices"),
+    path("devices/presence", api.views.audio.audio_devices.get_devices_presence, name="get_devices_presence"),
     path("devices/<int:device_id>", api.views.audio.audio_devices.forget_device, name="forget_device"),
     path("devices/discover", api.views.audio.audio_devices.discover_devices, name="discover_devices"),
     path("devices/update", api.views.audio.device_discovery.trigger_discovery, name="trigger_discovery"),
@@ -33,7 +34,10 @@ urlpatterns = [
     path("pipelines/<int:pipeline_id>/validate", api.views.audio.pipeline.audio_pipeline_validation.validate_audio_pipeline, name="pipeline"),
     path("pipelines/<int:pipeline_id>/apply", api.views.audio.pipeline.audio_pipeline_apply.AudioPipelineApplyView.as_view(), name="pipeline_apply"),
     path("pipelines/<int:pipeline_id>/unapply", api.views.audio.pipeline.audio_pipeline_apply.AudioPipelineApplyView.as_view(), name="pipeline_unapply"),
+    path("pipelines/<int:pipeline_id>/health", api.views.audio.pipeline.audio_pipelines.AudioPipelineHealth.as_view(), name="pipeline_health"),
+    path("pipelines/<int:pipeline_id>/jobs", api.views.audio.pipeline.audio_pipeline_events.AudioPipelineJobHistory.as_view(), name="pipeline_jobs"),
     path("pipelines/<int:pipeline_id>/job/<int:job_id>", api.views.audio.pipeline.audio_pipeline_events.AudioPipelineApplyEventList.as_view(), name="pipeline_events"),
+    path("pipelines/<int:pipeline_id>/job/<int:job_id>/stream", api.views.audio.pipeline.audio_pipeline_events.AudioPipelineApplyEventStream.as_view(), name="pipeline_events_stream"),
     path("pipelines/<int:pipeline_id>/nodes", api.views.audio.pipeline.node.audio_pipeline_nodes.AudioPipelineNodeList.as_view(), name="pipeline_nodes"),
     path("pipelines/<int:pipeline_id>/nodes/positions", api.views.audio.pipeline.node.audio_pipeline_node_positions.AudioPipelineNodePositionList.as_view(), name="pipeline_node_positions"),
     path("pipelines/<int:pipeline_id>/nodes/<int:node_id>", api.views.audio.pipeline.node.audio_pipeline_nodes.AudioPipelineNodeDetail.as_view(), name="pipeline_node"),
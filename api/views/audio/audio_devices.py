@@ -1,9 +1,14 @@
+from datetime import timedelta
+
+from django.db.models import Q
 from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.views.decorators.http import require_http_methods
 from django.db.models.deletion import ProtectedError
 
-from api.models import KnownAudioDevice
-from core.audio.audio_backends import AudioBackends
+from api.models import KnownAudioDevice, AudioDeviceDiscoveryState, AudioDevicePresence
+from core.audio.audio_backends import AudioBackends, BackendDiscovery
 
 
 @require_http_methods(["GET"])
@@ -29,6 +34,15 @@ def get_devices(request):
     if device_type_filter:
         devices = devices.filter(device_type=device_type_filter.upper())
 
+    # Discoveries that found nothing new only update a heartbeat, not the last_seen of every device
+    heartbeats = dict(AudioDeviceDiscoveryState.objects.values_list('scope', 'heartbeat_at'))
+
+    def last_seen(device: KnownAudioDevice):
+        if not device.active:
+            return device.last_seen
+        seen = [device.last_seen, heartbeats.get(device.backend), heartbeats.get(AudioDeviceDiscoveryState.ALL_BACKENDS)]
+        return max(date for date in seen if date is not None)
+
     # Convert to JSON
     devices_data = [
         {
@@ -41,13 +55,77 @@ def get_devices(request):
             'sample_rate': device.sample_rate,
             'channels': device.channels,
             'active': device.active,
-            'last_seen': device.last_seen.isoformat()
+            'last_seen': last_seen(device).isoformat()
         }
         for device in devices
     ]
 
     return JsonResponse(devices_data, safe=False)
 
+
+def _parse_aware(value: str):
+    """
+    Parses an ISO 8601 date, one without a timezone is in the current timezone.
+
+    :raises ValueError: If the date is invalid.
+    """
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f"'{value}' is not an ISO 8601 date")
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+@require_http_methods(["GET"])
+def get_devices_presence(request):
+    """
+    Get the presence history of the devices over a time window.
+    Query parameters:
+    - since: Start of the window (ISO 8601, in the current timezone if it has none), 24 hours ago by default
+    - until: End of the window (ISO 8601, in the current timezone if it has none), now by default
+    - device: Only return the history of this device id
+    """
+    try:
+        until = _parse_aware(request.GET['until']) if 'until' in request.GET else timezone.now()
+        since = _parse_aware(request.GET['since']) if 'since' in request.GET else until - timedelta(hours=24)
+    except ValueError as e:
+        return JsonResponse({'error': f'Invalid time window: {e}'}, status=400)
+    if since >= until:
+        return JsonResponse({'error': 'Invalid time window'}, status=400)
+    device_id = request.GET.get('device')
+    if device_id is not None and not device_id.isdigit():
+        return JsonResponse({'error': f'Invalid device id: {device_id}'}, status=400)
+
+    presences = (AudioDevicePresence.objects
+                 .filter(up_from__lt=until)
+                 .filter(Q(up_to__isnull=True) | Q(up_to__gt=since))
+                 .select_related('device')
+                 .order_by('device_id', 'up_from'))
+    if device_id is not None:
+        presences = presences.filter(device_id=int(device_id))
+
+    devices = {}
+    for presence in presences:
+        entry = devices.setdefault(presence.device_id, {
+            'id': presence.device_id,
+            'backend': presence.device.backend,
+            'name': presence.device.name,
+            'uptime': 0.0,
+            # Number of times the device appeared in the window
+            'appearances': 0,
+            'intervals': [],
+        })
+        interval = presence.to_dict(since, until)
+        entry['intervals'].append(interval)
+        entry['uptime'] += (interval['up_to'] - interval['up_from']).total_seconds()
+        if presence.up_from >= since:
+            entry['appearances'] += 1
+
+    window = (until - since).total_seconds()
+    for entry in devices.values():
+        entry['uptime_ratio'] = round(entry['uptime'] / window, 4)
+
+    return JsonResponse({'since': since, 'until': until, 'devices': list(devices.values())}, safe=False)
+
 @require_http_methods(["DELETE"])
 def forget_device(request, device_id):
     """
@@ -74,8 +152,12 @@ def discover_devices(request):
     """
     Discover currently connected audio devices from all backends.
     This queries the actual hardware/system, not the database.
+    Query parameters:
+    - fresh: Set to 1 to scan again instead of using a recent snapshot
     """
-    devices = AudioBackends.get_all_devices()
+    snapshot = AudioBackends.snapshot(fresh=request.GET.get('fresh') == '1')
+    discoveries = snapshot.discoveries
+    devices = snapshot.devices
 
     # Convert AudioDevice objects to dictionaries for JSON serialization
     devices_data = [
@@ -90,4 +172,16 @@ def discover_devices(request):
         for device in devices
     ]
 
-    return JsonResponse(devices_data, safe=False)
\ No newline at end of file
+    response = JsonResponse(devices_data, safe=False)
+    # Per backend timings, the body stays a plain list of devices
+    response['Server-Timing'] = ', '.join(_server_timing(discovery) for discovery in discoveries)
+    response['X-Snapshot-Age'] = f'{snapshot.age():.3f}'
+    return response
+
+
+def _server_timing(discovery: BackendDiscovery) -> str:
+    timing = f'{discovery.backend};dur={discovery.duration * 1000:.1f}'
+    if discovery.error:
+        error = discovery.error.replace('"', "'")
+        timing += f';desc="{error}"'
+    return timing
\ No newline at end of file
@@ -17,7 +17,7 @@ def trigger_discovery(request):
     """
     try:
         logger.info("Manual device discovery triggered via API")
-        discover_and_update_audio_devices()
+        result = discover_and_update_audio_devices()
 
         from api.models import KnownAudioDevice
 
@@ -30,7 +30,14 @@ def trigger_discovery(request):
             'message': 'Device discovery completed successfully',
             'total_devices': total_devices,
             'active_devices': active_devices,
-            'inactive_devices': inactive_devices
+            'inactive_devices': inactive_devices,
+            'created': result.created,
+            'updated': result.updated,
+            'unchanged': result.unchanged,
+            'deactivated': result.deactivated,
+            'backends': [discovery.to_dict() for discovery in result.backends],
+            'snapshot_age': round(result.snapshot_age, 3),
+            'skipped': result.skipped,
         })
     except Exception as e:
         logger.error(f"Error during manual device discovery: {e}", exc_info=True)
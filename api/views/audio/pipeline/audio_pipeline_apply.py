@@ -2,14 +2,19 @@ from django.http import JsonResponse
 from rest_framework.views import APIView
 
 from api.models.audio.audio_pipeline import AudioPipeline
-from api.models.audio.pipeline.audio_pipeline_apply_event import AudioPipelineApplyEvent, EventType
-from api.models.audio.pipeline.audio_pipeline_apply_job import AudioPipelineApplyJob
-from api.tasks.audio_pipeline_job import apply_audio_pipeline, unapply_audio_pipeline
+from api.models.audio.pipeline.audio_pipeline_apply_job import JobKind
 from api.views.audio.pipeline.audio_pipeline_events import job_to_json
 from core.audio.pipeline.audio_pipeline_graph import AudioPipelineGraph
+from core.audio.pipeline.audio_pipeline_graph_snapshot import graph_to_snapshot
+from core.audio.pipeline.audio_pipeline_job_utils import create_pipeline_job, submit_pipeline_job
 
 
 class AudioPipelineApplyView(APIView):
+    """
+    Requests are coalesced per pipeline: while a job of the same kind is waiting to be processed,
+    it is returned instead of enqueuing a new one. A request of the other kind cancels the waiting jobs.
+    A job that cannot be handed to the executor is failed, and answered with a 503.
+    """
 
     def post(self, request, pipeline_id):
         pipeline = AudioPipeline.objects.get(id=pipeline_id)
@@ -18,19 +23,18 @@ class AudioPipelineApplyView(APIView):
         if not pipeline_graph.validate().valid():
             return JsonResponse(data={'error': 'Pipeline is not valid'}, status=400)
 
-        job = AudioPipelineApplyJob.objects.create(pipeline=pipeline)
-        AudioPipelineApplyEvent.objects.create(job=job, event_type=EventType.START)
-
-        apply_audio_pipeline.delay(pipeline_id, job.id)
+        job, created = create_pipeline_job(pipeline, JobKind.APPLY)
+        # The graph is already loaded, hand it to the worker so that it does not query it again
+        if created and not submit_pipeline_job(job, graph_to_snapshot(pipeline, pipeline_graph)):
+            return JsonResponse(data=job_to_json(job), status=503)
 
         return JsonResponse(data=job_to_json(job), status=200)
 
     def delete(self, request, pipeline_id):
         pipeline = AudioPipeline.objects.get(id=pipeline_id)
 
-        job = AudioPipelineApplyJob.objects.create(pipeline=pipeline)
-        AudioPipelineApplyEvent.objects.create(job=job, event_type=EventType.START)
-
-        unapply_audio_pipeline.delay(pipeline_id, job.id)
+        job, created = create_pipeline_job(pipeline, JobKind.UNAPPLY)
+        if created and not submit_pipeline_job(job):
+            return JsonResponse(data=job_to_json(job), status=503)
 
-        return JsonResponse(data=job_to_json(job), status=200)
\ No newline at end of file
+        return JsonResponse(data=job_to_json(job), status=200)
@@ -1,23 +1,18 @@
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from rest_framework.views import APIView
 
 from api.models.audio.pipeline.audio_pipeline_apply_event import AudioPipelineApplyEvent
-from api.models.audio.pipeline.audio_pipeline_apply_job import AudioPipelineApplyJob
+from api.models.audio.pipeline.audio_pipeline_apply_job import AudioPipelineApplyJob, JobStatus
+from api.models.audio.pipeline.audio_pipeline_job_summary import AudioPipelineJobSummary
+from core.audio.pipeline.audio_pipeline_job_utils import request_job_cancellation
+from core.audio.pipeline.audio_pipeline_job_stream import stream_job_events, stream_slots
 
 def job_to_json(job: AudioPipelineApplyJob):
     return {
             'id': job.id,
             'status': job.status,
             'created_at': job.created_at,
-            'events': [
-                {
-                    'id': event.id,
-                    'event_type': event.event_type,
-                    'created_at': event.created_at,
-                    'node': event.node.id if event.node else None,
-                    'data': event.data
-                }
-                for event in job.audiopipelineapplyevent_set.all()]
+            'events': [event.to_dict() for event in job.audiopipelineapplyevent_set.all()]
         }
 
 class AudioPipelineApplyEventList(APIView):
@@ -26,3 +21,88 @@ class AudioPipelineApplyEventList(APIView):
         job = AudioPipelineApplyJob.objects.get(id=job_id)
 
         return JsonResponse(job_to_json(job), safe=False)
+
+    def delete(self, request, pipeline_id, job_id):
+        """
+        Cancels the job. A pending job is cancelled right away, a running one stops before its next node
+        and rolls back what it applied, the response is then 202 and the job must be followed to its end.
+        """
+        try:
+            job = AudioPipelineApplyJob.objects.get(id=job_id, pipeline_id=pipeline_id)
+        except AudioPipelineApplyJob.DoesNotExist:
+            return JsonResponse({'error': 'Job not found'}, status=404)
+
+        if not request_job_cancellation(job):
+            return JsonResponse({'error': f'Job {job_id} is already finished'}, status=409)
+
+        job.refresh_from_db()
+        return JsonResponse(job_to_json(job), safe=False, status=200 if job.status == JobStatus.CANCELLED else 202)
+
+
+class AudioPipelineJobHistory(APIView):
+    """
+    Lists the recent jobs of a pipeline, followed by the summaries of the older ones, newest first.
+    Query parameters:
+    - limit: Number of jobs and of summaries per page, 50 by default and 200 at most
+    - before: Only list the jobs older than this job id, the `next` value of the previous page
+    - summaries_before: Same for the summaries, the `next_summaries` value of the previous page
+    """
+
+    MAX_LIMIT = 200
+
+    def get(self, request, pipeline_id):
+        try:
+            limit = min(int(request.GET.get('limit', 50)), self.MAX_LIMIT)
+            before = int(request.GET['before']) if 'before' in request.GET else None
+            summaries_before = int(request.GET['summaries_before']) if 'summaries_before' in request.GET else None
+        except ValueError:
+            return JsonResponse({'error': 'limit, before and summaries_before must be integers'}, status=400)
+        if limit <= 0:
+            return JsonResponse({'error': 'limit must be positive'}, status=400)
+
+        jobs = AudioPipelineApplyJob.objects.filter(pipeline_id=pipeline_id).order_by('-id')
+        if before is not None:
+            jobs = jobs.filter(id__lt=before)
+        summaries = AudioPipelineJobSummary.objects.filter(pipeline_id=pipeline_id).order_by('-id')
+        if summaries_before is not None:
+            summaries = summaries.filter(id__lt=summaries_before)
+        # One more row tells whether there is a next page
+        jobs = list(jobs[:limit + 1])
+        summaries = list(summaries[:limit + 1])
+
+        return JsonResponse({
+            'jobs': [{'id': job.id, 'kind': job.kind, 'status': job.status, 'created_at': job.created_at}
+                     for job in jobs[:limit]],
+            'next': jobs[limit - 1].id if len(jobs) > limit else None,
+            'summaries': [summary.to_dict() for summary in summaries[:limit]],
+            'next_summaries': summaries[limit - 1].id if len(summaries) > limit else None,
+        }, safe=False)
+
+
+class AudioPipelineApplyEventStream(APIView):
+    """
+    Streams the events of a job as server-sent events until the job is finished.
+    A client can resume after the last event it received with the standard Last-Event-ID header
+    or the last_event_id query parameter, which EventSource does when a stream ends on its duration cap.
+    """
+
+    def get(self, request, pipeline_id, job_id):
+        if not AudioPipelineApplyJob.objects.filter(id=job_id, pipeline_id=pipeline_id).exists():
+            return JsonResponse({'error': 'Job not found'}, status=404)
+
+        last_event_id = request.headers.get('Last-Event-ID', request.GET.get('last_event_id', 0))
+        try:
+            last_event_id = int(last_event_id)
+        except ValueError:
+            return JsonResponse({'error': f'Invalid last event id: {last_event_id}'}, status=400)
+
+        stream = stream_slots.open(stream_job_events(job_id, last_event_id))
+        if stream is None:
+            response = JsonResponse({'error': 'Too many job event streams, try again later'}, status=503)
+            response['Retry-After'] = '5'
+            return response
+
+        response = StreamingHttpResponse(stream, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # Do not let nginx buffer the stream
+        return response
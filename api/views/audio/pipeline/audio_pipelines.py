@@ -10,8 +10,8 @@ from api.models.audio.audio_pipeline import AudioPipeline
 from api.models.audio.pipeline.audio_pipeline_edge import AudioPipelineEdge
 from api.models.audio.pipeline.audio_pipeline_node import AudioPipelineNode
 from api.models.audio.pipeline.audio_pipeline_node_slot import AudioPipelineNodeSlot
-from api.views.audio.pipeline.node.audio_pipeline_nodes import NodeSerializer, node_to_json, get_concrete_node, update_slots, \
-    json_node_to_model, find_model_by_name, fill_model_from_json
+from api.views.audio.pipeline.node.audio_pipeline_nodes import NodeSerializer, node_to_json, get_concrete_nodes, \
+    get_nodes_health, update_slots, json_node_to_model, find_model_by_name, fill_model_from_json
 from api.views.audio.pipeline.pipeline_guard_mixin import PipelineGuardMixin
 
 
@@ -85,13 +85,21 @@ class AudioPipelineList(PipelineGuardMixin, APIView):
 
 
 def pipeline_to_json(pipeline: AudioPipeline) -> dict[str, Any]:
-    nodes = pipeline.audiopipelinenode_set.all()
+    """
+    Serializes a pipeline with its nodes and edges. The number of queries only depends on the number
+    of node types in the pipeline, not on the number of nodes. The health of the nodes is fetched once per
+    manager class, see get_nodes_health.
+    """
+    nodes = list(pipeline.audiopipelinenode_set.all())
     node_ids = [n.id for n in nodes]
-    edges = AudioPipelineEdge.objects.filter(slot_a__node_id__in=node_ids,
-                                             slot_b__node_id__in=node_ids).distinct().all()
+    edges = (AudioPipelineEdge.objects
+             .filter(slot_a__node_id__in=node_ids, slot_b__node_id__in=node_ids)
+             .select_related('slot_a', 'slot_b')
+             .distinct())
 
     # Get concrete subclass instances
-    concrete_nodes = [get_concrete_node(node) for node in nodes]
+    concrete_nodes = get_concrete_nodes(nodes)
+    health = get_nodes_health(concrete_nodes)
 
     return {
         'id': pipeline.id,
@@ -100,7 +108,7 @@ def pipeline_to_json(pipeline: AudioPipeline) -> dict[str, Any]:
         'updated_at': pipeline.updated_at,
         'active': pipeline.active,
         'stale': pipeline.stale,
-        'nodes': [node_to_json(node) for node in concrete_nodes],
+        'nodes': [node_to_json(node, health.get(node.id)) for node in concrete_nodes],
         'edges': [
             {
                 'id': edge.id,
@@ -130,7 +138,8 @@ def update_edges(nodes: list[AudioPipelineNode], edges) -> None:
         edge.slot_b = slot_b
         edge.save()
 
-    for edge in AudioPipelineEdge.objects.filter(slot_a__node__in=node_ids, slot_b__node__in=node_ids).distinct():
+    for edge in (AudioPipelineEdge.objects.filter(slot_a__node__in=node_ids, slot_b__node__in=node_ids)
+                 .select_related('slot_a', 'slot_b').distinct()):
         # look for edges that are not in the data anymore and delete them
         found = False
         for data_edge in edges:
@@ -203,3 +212,12 @@ class AudioPipelineDetail(PipelineGuardMixin, APIView):
 
         return JsonResponse(pipeline_to_json(pipeline), safe=False)
 
+
+class AudioPipelineHealth(APIView):
+    """Runtime health of the monitored nodes of a pipeline, by node id, fetched once per manager class."""
+
+    def get(self, request, pipeline_id):
+        nodes = get_concrete_nodes(list(AudioPipelineNode.objects.filter(pipeline_id=pipeline_id)))
+        health = get_nodes_health(nodes)
+        return JsonResponse({node_id: node_health for node_id, node_health in health.items()
+                             if node_health is not None}, safe=False)
@@ -1,8 +1,6 @@
 import json
 from typing import Any
 
-from django.apps import apps
-from django.db import models
 from django.db.models.fields import Field
 from django.http import JsonResponse
 from rest_framework import serializers
@@ -10,6 +8,7 @@ from rest_framework.views import APIView
 
 from api.models import AudioPipelineNode
 from api.views.audio.pipeline.pipeline_guard_mixin import PipelineGuardMixin
+from core.audio.pipeline.audio_pipeline_node_registry import node_types
 
 
 class NodeSerializer(serializers.Serializer):
@@ -31,75 +30,16 @@ class NodeSerializer(serializers.Serializer):
         return value
 
     def validate(self, data):
-        """Validate field types if present for the specific node type."""
+        """Validate field types if present for the specific node type, all the errors are reported at once."""
         type_name = data.get('type_name')
         fields_data = data.get('fields', {})
 
         if type_name and fields_data:
-            cls = find_model_by_name(type_name)
-            if cls:
-                # Validate fields presence
-                for field in cls.get_exposed_fields():
-                    if '_ptr' in field.name:
-                        continue
-                    if not field.null and not field.blank and field.default == models.NOT_PROVIDED:
-                        if field.name not in fields_data and field.name not in ['id', 'type_name']:
-                            raise serializers.ValidationError(
-                                f'Field "{field.name}" is required for type {type_name}'
-                            )
-                # Validate types of provided fields
-                for field_name, field_value in fields_data.items():
-                    try:
-                        field = cls._meta.get_field(field_name)
-
-                        # Skip validation if value is None and field allows null
-                        if field_value is None:
-                            if not field.null:
-                                raise serializers.ValidationError(
-                                    f'Field "{field_name}" does not allow null values'
-                                )
-                            continue
-
-                        # Type validation based on field type
-                        if isinstance(field, models.IntegerField):
-                            if not isinstance(field_value, int):
-                                raise serializers.ValidationError(
-                                    f'Field "{field_name}" must be an integer, got {type(field_value).__name__}'
-                                )
-                        elif isinstance(field, models.FloatField):
-                            if not isinstance(field_value, (int, float)):
-                                raise serializers.ValidationError(
-                                    f'Field "{field_name}" must be a number, got {type(field_value).__name__}'
-                                )
-                        elif isinstance(field, models.BooleanField):
-                            if not isinstance(field_value, bool):
-                                raise serializers.ValidationError(
-                                    f'Field "{field_name}" must be a boolean, got {type(field_value).__name__}'
-                                )
-                        elif isinstance(field, (models.CharField, models.TextField)):
-                            if not isinstance(field_value, str):
-                                raise serializers.ValidationError(
-                                    f'Field "{field_name}" must be a string, got {type(field_value).__name__}'
-                                )
-                            # Check max_length for CharField
-                            if isinstance(field, models.CharField) and field.max_length:
-                                if len(field_value) > field.max_length:
-                                    raise serializers.ValidationError(
-                                        f'Field "{field_name}" max length is {field.max_length}, got {len(field_value)}'
-                                    )
-                        elif field.is_relation:
-                            # For foreign keys, check if the ID is an integer
-                            if not isinstance(field_value, int):
-                                raise serializers.ValidationError(
-                                    f'Field "{field_name}" (foreign key) must be an integer ID, got {type(field_value).__name__}'
-                                )
-
-                    except Exception as e:
-                        if isinstance(e, serializers.ValidationError):
-                            raise
-                        raise serializers.ValidationError(
-                            f'Field "{field_name}" does not exist for type {type_name}'
-                        )
+            node_type = node_types.get(type_name)
+            if node_type:
+                errors = node_type.validation.validate(fields_data)
+                if errors:
+                    raise serializers.ValidationError(errors)
 
         return data
 
@@ -112,10 +52,8 @@ def recursive_subclasses[T](cls: type[T]) -> set[type[T]]:
 
 
 def find_model_by_name(name: str) -> type[AudioPipelineNode] | None:
-    for model in apps.get_models():
-        if model.__name__ == name:
-            return model
-    return None
+    node_type = node_types.get(name)
+    return node_type.cls if node_type is not None else None
 
 
 def fill_model_from_json(node: AudioPipelineNode, data: dict[str, Any]) -> None:
@@ -135,13 +73,20 @@ def fill_model_from_json(node: AudioPipelineNode, data: dict[str, Any]) -> None:
                 setattr(node, field.name, data['fields'][field.name])
 
 
-def node_to_json(node: AudioPipelineNode) -> dict[str, Any]:
-    return {
+def node_to_json(node: AudioPipelineNode, health: dict | None = None) -> dict[str, Any]:
+    """
+    :param health: The health of the node, see get_nodes_health. Fetch it for all the nodes at once, it may
+    take a round trip to the store of the plugin.
+    """
+    data = {
         'id': node.id,
         'type_name': node.__class__.__name__,
         'slots': [slot.to_dict() for slot in node.slots.all()],
         'fields': get_fields_value(node, node.get_exposed_fields())
     }
+    if health is not None:
+        data['health'] = health
+    return data
 
 
 def json_node_to_model(data_node) -> AudioPipelineNode:
@@ -189,6 +134,45 @@ def get_concrete_node(node: AudioPipelineNode) -> AudioPipelineNode:
     return node
 
 
+def _relation_fields(cls: type[AudioPipelineNode]) -> list[str]:
+    return [field.name for field in cls.get_exposed_fields()
+            if field.is_relation and (field.many_to_one or field.one_to_one) and '_ptr' not in field.name]
+
+
+def get_concrete_nodes(nodes: list[AudioPipelineNode]) -> list[AudioPipelineNode]:
+    """
+    Get the concrete subclass instances of base nodes, with their slots and exposed relations loaded.
+    Nodes are fetched with one query per node type, instead of one query per node and subclass.
+    """
+    by_type: dict[str, list[int]] = {}
+    for node in nodes:
+        by_type.setdefault(node.type_name, []).append(node.id)
+
+    concrete: dict[int, AudioPipelineNode] = {}
+    for type_name, ids in by_type.items():
+        cls = find_model_by_name(type_name)
+        if cls is None:
+            continue
+        queryset = cls.objects.filter(id__in=ids).select_related(*_relation_fields(cls)).prefetch_related('slots')
+        concrete.update((node.id, node) for node in queryset)
+
+    # Nodes whose type cannot be resolved are returned as they are, in their original order
+    return [concrete.get(node.id, node) for node in nodes]
+
+
+def get_nodes_health(nodes: list[AudioPipelineNode]) -> dict[int, dict | None]:
+    """Health of concrete nodes, fetched once per manager class."""
+    by_manager: dict[type, list[AudioPipelineNode]] = {}
+    for node in nodes:
+        if type(node) is not AudioPipelineNode:
+            by_manager.setdefault(type(node.get_manager()), []).append(node)
+
+    health = {}
+    for manager_cls, manager_nodes in by_manager.items():
+        health.update(manager_cls.get_nodes_health(manager_nodes))
+    return health
+
+
 def update_slots(node: AudioPipelineNode) -> None:
     slots = {s.name: s for s in node.get_manager().get_dynamic_slots_schematics()}
     existing_slots = {s.name: s for s in node.slots.all()}
@@ -207,7 +191,7 @@ def update_slots(node: AudioPipelineNode) -> None:
 class AudioPipelineNodeList(PipelineGuardMixin, APIView):
 
     def get(self, request, pipeline_id):
-        nodes = AudioPipelineNode.objects.filter(pipeline_id=pipeline_id).all()
+        nodes = AudioPipelineNode.objects.filter(pipeline_id=pipeline_id).prefetch_related('slots')
         data = [node_to_json(node) for node in nodes]
 
         return JsonResponse(data, safe=False)
@@ -235,7 +219,7 @@ class AudioPipelineNodeDetail(PipelineGuardMixin, APIView):
             base_node = AudioPipelineNode.objects.get(id=node_id)
             cls = find_model_by_name(base_node.type_name)
             node = cls.objects.get(id=node_id)
-            data = node_to_json(node)
+            data = node_to_json(node, get_nodes_health([node]).get(node.id))
         except AudioPipelineNode.DoesNotExist:
             return JsonResponse({'error': 'Node not found'}, status=404)
 
@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, TYPE_CHECKING
 
 from api.models import AudioDevice
 
+if TYPE_CHECKING:
+    from core.audio.audio_device_watcher import AudioDeviceWatcher
+
 class AudioBackend(ABC):
 
     @property
@@ -13,3 +16,9 @@ class AudioBackend(ABC):
     @abstractmethod
     def devices(self) -> List[AudioDevice]:
         pass
+
+    def get_device_watcher(self) -> 'AudioDeviceWatcher | None':
+        """
+        A backend can provide a watcher notifying device changes, it is otherwise polled
+        """
+        return None
@@ -1,10 +1,86 @@
-from abc import ABC, abstractmethod
-from typing import List
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeoutError
+from typing import List, NamedTuple
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 
 from api.models.preferences_audio_backend import PreferencesAudioBackend
 from core.audio.audio_backend import AudioBackend
+from core.audio.audio_device import AudioDevice
 from core.plugin_system import OCPlugin
 
+logger = logging.getLogger(__name__)
+
+
+class BackendDiscovery(NamedTuple):
+    """Outcome of the device discovery of one backend."""
+    backend: str
+    devices: list[AudioDevice]
+    duration: float
+    error: str | None = None
+
+    def to_dict(self):
+        return {
+            'backend': self.backend,
+            'devices': len(self.devices),
+            'duration_ms': round(self.duration * 1000, 1),
+            'error': self.error,
+        }
+
+
+class DiscoverySnapshot(NamedTuple):
+    """Result of a discovery of every enabled backend, shared by the callers within its TTL."""
+    discoveries: list[BackendDiscovery]
+    taken_at: float
+
+    @property
+    def devices(self) -> list[AudioDevice]:
+        return [device for discovery in self.discoveries for device in discovery.devices]
+
+    def age(self) -> float:
+        return time.monotonic() - self.taken_at
+
+
+# Enabled backend names, other processes see a change after at most _ENABLED_TTL seconds
+_ENABLED_TTL = 30.0
+_enabled: tuple[float, frozenset[str]] | None = None
+_enabled_lock = threading.Lock()
+
+# Discoveries run on a small shared pool, a backend stuck in a call keeps its worker busy
+# and is not queried again until that call returns
+_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='audio-discovery')
+_running: dict[str, Future] = {}
+_running_lock = threading.Lock()
+
+
+# Last discovery snapshot and the scan in progress, concurrent callers wait on the same scan
+_snapshot: DiscoverySnapshot | None = None
+_snapshot_scan: Future | None = None
+_snapshot_lock = threading.Lock()
+
+
+@receiver([post_save, post_delete], sender=PreferencesAudioBackend)
+def _invalidate_enabled_backends(**kwargs):
+    global _enabled, _snapshot
+    with _enabled_lock:
+        _enabled = None
+    with _snapshot_lock:
+        _snapshot = None
+
+
+def _discover(backend: AudioBackend) -> tuple[list[AudioDevice], float]:
+    started = time.monotonic()
+    try:
+        return backend.devices(), time.monotonic() - started
+    finally:
+        close_old_connections()
+
+
 class AudioBackends:
 
     @staticmethod
@@ -12,12 +88,91 @@ class AudioBackends:
         """Returns instances of all discovered AudioBackend implementations."""
         return OCPlugin.get_registered_audio_backends()
 
+    @staticmethod
+    def get_enabled_names() -> frozenset[str]:
+        """Names of the enabled backends, cached until the preferences change."""
+        global _enabled
+        with _enabled_lock:
+            if _enabled is None or time.monotonic() - _enabled[0] > _ENABLED_TTL:
+                names = PreferencesAudioBackend.objects.filter(enabled=True).values_list('name', flat=True)
+                _enabled = (time.monotonic(), frozenset(names))
+            return _enabled[1]
+
+    @staticmethod
+    def get_enabled() -> List[AudioBackend]:
+        enabled = AudioBackends.get_enabled_names()
+        return [backend for backend in AudioBackends.get_all() if backend.name in enabled]
+
+    @staticmethod
+    def discover() -> List[BackendDiscovery]:
+        """
+        Queries the enabled backends in parallel. Each backend is given AUDIO_BACKEND_TIMEOUT seconds
+        (or its own entry of AUDIO_BACKEND_TIMEOUTS), a backend that fails or times out is reported
+        with an error and no device, the others are still returned.
+        """
+        default_timeout = getattr(settings, 'AUDIO_BACKEND_TIMEOUT', 5.0)
+        timeouts = getattr(settings, 'AUDIO_BACKEND_TIMEOUTS', {})
+
+        started = time.monotonic()
+        futures: dict[str, Future | None] = {}
+        with _running_lock:
+            for backend in AudioBackends.get_enabled():
+                previous = _running.get(backend.name)
+                if previous is not None and not previous.done():
+                    futures[backend.name] = None
+                    continue
+                future = _pool.submit(_discover, backend)
+                _running[backend.name] = future
+                futures[backend.name] = future
+
+        results = []
+        for name, future in futures.items():
+            if future is None:
+                results.append(BackendDiscovery(name, [], 0.0, 'A previous discovery is still running'))
+                continue
+            timeout = timeouts.get(name, default_timeout)
+            try:
+                devices, duration = future.result(timeout=max(0.0, started + timeout - time.monotonic()))
+                results.append(BackendDiscovery(name, devices, duration))
+            except FutureTimeoutError:
+                logger.warning(f"Discovery of {name} devices did not complete within {timeout}s")
+                results.append(BackendDiscovery(name, [], time.monotonic() - started, f'Timed out after {timeout}s'))
+            except Exception as e:
+                logger.exception(f"Discovery of {name} devices failed: {e}")
+                results.append(BackendDiscovery(name, [], time.monotonic() - started, str(e)))
+        return results
+
+    @staticmethod
+    def snapshot(fresh: bool = False) -> DiscoverySnapshot:
+        """
+        Returns the last discovery if it is younger than AUDIO_DISCOVERY_TTL seconds, otherwise scans
+        the backends. Only one scan runs at a time, callers arriving during a scan wait for its result,
+        even with `fresh` as the scan started after the data they want to refresh.
+        """
+        global _snapshot, _snapshot_scan
+        ttl = getattr(settings, 'AUDIO_DISCOVERY_TTL', 2.0)
+        with _snapshot_lock:
+            if not fresh and _snapshot is not None and _snapshot.age() < ttl:
+                return _snapshot
+            scan = _snapshot_scan
+            owner = scan is None
+            if owner:
+                scan = _snapshot_scan = Future()
+
+        if owner:
+            try:
+                result = DiscoverySnapshot(AudioBackends.discover(), time.monotonic())
+                with _snapshot_lock:
+                    _snapshot = result
+                scan.set_result(result)
+            except BaseException as e:
+                scan.set_exception(e)
+            finally:
+                with _snapshot_lock:
+                    _snapshot_scan = None
+        return scan.result()
+
     @staticmethod
     def get_all_devices():
         """Returns all audio devices from enabled backends."""
-        enabled_backends_name = [b.name for b in PreferencesAudioBackend.objects.all() if b.enabled]
-        devices = []
-        for backend in AudioBackends.get_all():
-            if backend.name in enabled_backends_name:
-                devices.extend(backend.devices())
-        return devices
+        return AudioBackends.snapshot().devices
@@ -0,0 +1,17 @@
+import threading
+from abc import ABC, abstractmethod
+
+
+class AudioDeviceWatcher(ABC):
+    """
+    Keeps the known devices of a backend up to date by listening to the changes of the system,
+    instead of polling the whole device list. Provided by backends through AudioBackend.get_device_watcher.
+    """
+
+    @abstractmethod
+    def run(self, stop: threading.Event) -> None:
+        """
+        Watches the devices until `stop` is set. Implementations must reconcile the whole device
+        list when they start and then periodically, in case an event was missed.
+        """
+        pass
@@ -1,6 +1,8 @@
+from functools import cached_property
 from typing import NamedTuple, TYPE_CHECKING
 
 from api.models.audio.pipeline.audio_pipeline_edge import AudioPipelineEdge
+from core.audio.pipeline.validation_cache import ValidationCache, node_validation_cache, edge_validation_cache
 from core.audio.pipeline.validation_result import ValidationResult, ValidationResultNode, ValidationResultEdge
 from core.utils.graph import GraphEdge, Graph, GraphNode
 from api.models.audio.pipeline.audio_pipeline_node_slot import AudioPipelineNodeSlot, SlotType
@@ -28,40 +30,62 @@ class AudioPipelineGraph(Graph['AudioPipelineNode', EdgeSlots]):
     def __init__(self, pipeline: 'AudioPipeline'):
         from api.views.audio.pipeline.audio_pipelines import find_model_by_name
 
-        # Create graph nodes from pipeline nodes
-        node_map = {}  # Map AudioPipelineNode.id -> GraphNode
+        # We must find the real node type for validation functions to be called
+        nodes = []
         for db_node in pipeline.audiopipelinenode_set.all():
-            # We must find the real node type for validation functions to be called
             cls = find_model_by_name(db_node.type_name)
-            real_node = cls.objects.get(id=db_node.id)
-            graph_node: AudioPipelineGraphNode = GraphNode(data=real_node)
-            node_map[db_node.id] = graph_node
+            nodes.append(cls.objects.get(id=db_node.id))
 
-        # Create graph edges from slot connections
-        graph_edges = []
+        # Collect edges from slot connections
+        edges = []
         seen_edges = set()
-
         for db_node in pipeline.audiopipelinenode_set.all():
             for slot in db_node.slots.all():
                 # Process outgoing edges from this slot
                 for db_edge in slot.outgoing_edges.all():
                     if db_edge.id not in seen_edges:
                         seen_edges.add(db_edge.id)
+                        edges.append((db_edge, db_edge.slot_a, db_edge.slot_b))
 
-                        from_node = node_map[db_edge.slot_a.node_id]
-                        to_node = node_map[db_edge.slot_b.node_id]
-                        from_slot = db_edge.slot_a
-                        to_slot = db_edge.slot_b
+        super().__init__()
+        self._link(nodes, edges)
+
+    @classmethod
+    def from_models(cls,
+                    nodes: list['AudioPipelineNode'],
+                    edges: list[tuple[AudioPipelineEdge, AudioPipelineNodeSlot, AudioPipelineNodeSlot]]
+                    ) -> 'AudioPipelineGraph':
+        """
+        Builds a graph from already loaded models, without querying the database.
+
+        :param nodes: Concrete node instances of the pipeline.
+        :param edges: Tuples of (edge, slot_a, slot_b) where slot_a and slot_b belong to the given nodes.
+        """
+        graph = cls.__new__(cls)
+        Graph.__init__(graph)
+        graph._link(nodes, edges)
+        return graph
+
+    def _link(self, nodes: list['AudioPipelineNode'],
+              edges: list[tuple[AudioPipelineEdge, AudioPipelineNodeSlot, AudioPipelineNodeSlot]]):
+        # Create graph nodes from pipeline nodes
+        node_map = {}  # Map AudioPipelineNode.id -> GraphNode
+        for real_node in nodes:
+            graph_node: AudioPipelineGraphNode = GraphNode(data=real_node)
+            node_map[real_node.id] = graph_node
 
-                        graph_edge = GraphEdge['AudioPipelineNode', EdgeSlots](
-                            data=EdgeSlots(db_edge.id, db_edge, from_node, to_node, from_slot, to_slot),
-                            from_node=from_node,
-                            to_node=to_node
-                        )
-                        graph_edges.append(graph_edge)
+        # Create graph edges from slot connections
+        graph_edges = []
+        for db_edge, from_slot, to_slot in edges:
+            from_node = node_map[from_slot.node_id]
+            to_node = node_map[to_slot.node_id]
 
-        # Build the graph
-        super().__init__()
+            graph_edge = GraphEdge['AudioPipelineNode', EdgeSlots](
+                data=EdgeSlots(db_edge.id, db_edge, from_node, to_node, from_slot, to_slot),
+                from_node=from_node,
+                to_node=to_node
+            )
+            graph_edges.append(graph_edge)
 
         # Add all nodes first (including orphans with no connections)
         self.nodes = list(node_map.values())
@@ -74,21 +98,82 @@ class AudioPipelineGraph(Graph['AudioPipelineNode', EdgeSlots]):
             if edge not in edge.to_node.incoming:
                 edge.to_node.incoming.append(edge)
 
+    @cached_property
+    def slot_schematics(self) -> dict[int, dict[str, AudioPipelineNodeSlot]]:
+        """
+        Index of the dynamic slot schematics of every node, by node id then slot name.
+        Computed once per graph build, schematics are idempotent for a given node state.
+        """
+        return {
+            node.data.id: {slot.name: slot for slot in node.data.get_manager().get_dynamic_slots_schematics()}
+            for node in self.nodes
+        }
+
+    def node_revision(self, node: AudioPipelineGraphNode) -> tuple:
+        """
+        Revision of a node for validation purposes. It changes whenever the node is saved,
+        whenever an edge is connected to or removed from it, and whenever the related objects
+        or the slot schematics of the node change.
+        """
+        return (
+            node.data.type_name,
+            node.data.updated_at,
+            tuple(sorted(edge.data.id for edge in node.incoming)),
+            tuple(sorted(edge.data.id for edge in node.outgoing)),
+            node.data.get_manager().get_validation_revision(),
+            tuple((name, slot.type, slot.direction) for name, slot in self.slot_schematics[node.data.id].items()),
+        )
+
+    def _validate_node(self, node: AudioPipelineGraphNode) -> ValidationResultNode | None:
+        revision = self.node_revision(node)
+        cached = node_validation_cache.get(node.data.id, revision)
+        if cached is not ValidationCache.MISS:
+            return cached
+
+        validation_result = node.data.get_manager().validate(node, self)
+        if validation_result is not None and validation_result.valid():
+            validation_result = None
+        node_validation_cache.put(node.data.id, revision, validation_result)
+        return validation_result
+
+    def _validate_edge(self, edge: AudioPipelineGraphEdge) -> list[str]:
+        revision = (self.node_revision(edge.from_node), self.node_revision(edge.to_node),
+                    edge.data.incoming_slot.name, edge.data.outgoing_slot.name)
+        cached = edge_validation_cache.get(edge.data.id, revision)
+        if cached is not ValidationCache.MISS:
+            return cached
+
+        errors: list[str] = []
+        slot_a = self.slot_schematics[edge.from_node.data.id].get(edge.data.incoming_slot.name)
+        slot_b = self.slot_schematics[edge.to_node.data.id].get(edge.data.outgoing_slot.name)
+        if slot_a is not None and slot_b is not None:
+            if slot_a.type == SlotType.DEVICE_AUDIO_OUTPUT:
+                errors.append(f"Output device cannot only receive audio")
+            if slot_b.type == SlotType.DEVICE_AUDIO_INPUT:
+                errors.append(f"Input device cannot only send audio")
+            if slot_a.type == SlotType.DEVICE_AUDIO_INPUT and slot_b.type != SlotType.AUDIO_CONSUMER:
+                errors.append(f"Input device must be connected to an audio consumer")
+            if slot_a.type == SlotType.AUDIO_PRODUCER and slot_b.type != SlotType.DEVICE_AUDIO_OUTPUT:
+                errors.append(f"Producer cannot only send audio to an output device")
+
+        edge_validation_cache.put(edge.data.id, revision, errors)
+        return errors
+
     def validate(self) -> ValidationResult:
         node_validations: dict[int, ValidationResultNode] = {}
         for node in self.nodes:
-            real_node = node.data
-            validation_result = real_node.get_manager().validate(node, self)
-            if validation_result is not None and not validation_result.valid():
+            validation_result = self._validate_node(node)
+            if validation_result is not None:
                 node_validations[validation_result.node] = validation_result
 
+        # Graph level checks depend on the whole topology, they are cheap and always recomputed
         graph_errors: list[str] = []
         if len(self.get_roots()) > 1:
             graph_errors.append("Pipeline must have exactly one root node")
             for root in self.get_roots():
-                node_validation = node_validations[
-                    root.data.id] if root.data.id in node_validations else ValidationResultNode(root.data.id, [], {},
-                                                                                                {})
+                # Copy the cached result, it must not be mutated
+                cached = node_validations.get(root.data.id, ValidationResultNode(root.data.id, [], {}, {}))
+                node_validation = ValidationResultNode(cached.node, list(cached.errors), cached.fields, cached.slots)
                 if len(root.incoming) == 0 and len(root.outgoing) == 0:
                     node_validation.errors.append("This node is orphaned")
                 else:
@@ -100,22 +185,8 @@ class AudioPipelineGraph(Graph['AudioPipelineNode', EdgeSlots]):
 
         edge_errors: list[ValidationResultEdge] = []
         for edge in self.edges:
-            for slot_a in edge.from_node.data.get_manager().get_dynamic_slots_schematics():
-                print(edge.data)
-                if slot_a.name != edge.data.incoming_slot.name:
-                    continue
-                for slot_b in edge.to_node.data.get_manager().get_dynamic_slots_schematics():
-                    if slot_b.name != edge.data.outgoing_slot.name:
-                        continue
-                    if slot_a.type == SlotType.DEVICE_AUDIO_OUTPUT:
-                        edge_errors.append(ValidationResultEdge(edge.data.id, [f"Output device cannot only receive audio"]))
-                    if slot_b.type == SlotType.DEVICE_AUDIO_INPUT:
-                        edge_errors.append(ValidationResultEdge(edge.data.id, [f"Input device cannot only send audio"]))
-                    if slot_a.type == SlotType.DEVICE_AUDIO_INPUT and slot_b.type != SlotType.AUDIO_CONSUMER:
-                        edge_errors.append(ValidationResultEdge(edge.data.id, [f"Input device must be connected to an audio consumer"]))
-                    if slot_a.type == SlotType.AUDIO_PRODUCER and slot_b.type != SlotType.DEVICE_AUDIO_OUTPUT:
-                        edge_errors.append(ValidationResultEdge(edge.data.id, [f"Producer cannot only send audio to an output device"]))
-                    break
-                break
+            errors = self._validate_edge(edge)
+            if errors:
+                edge_errors.append(ValidationResultEdge(edge.data.id, list(errors)))
 
         return ValidationResult(list(node_validations.values()), edge_errors, graph_errors)
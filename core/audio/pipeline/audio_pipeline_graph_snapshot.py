@@ -0,0 +1,133 @@
+import hashlib
+import logging
+from typing import Any, TYPE_CHECKING
+
+from django.db import DEFAULT_DB_ALIAS
+
+from api.models.audio.pipeline.audio_pipeline_edge import AudioPipelineEdge
+from api.models.audio.pipeline.audio_pipeline_node import AudioPipelineNode
+from api.models.audio.pipeline.audio_pipeline_node_slot import AudioPipelineNodeSlot, SlotType, SlotDirection
+from core.audio.pipeline.audio_pipeline_graph import AudioPipelineGraph
+
+if TYPE_CHECKING:
+    from api.models.audio.audio_pipeline import AudioPipeline
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the snapshot changes, older snapshots are then ignored by workers
+SNAPSHOT_VERSION = 2
+
+_SLOT_FIELDS = ['id', 'name', 'type', 'direction', 'node_id']
+_EDGE_FIELDS = ['id', 'slot_a_id', 'slot_b_id', 'updated_at']
+
+
+def _revision(nodes: list[tuple[int, Any]], edges: list[tuple[int, Any]]) -> str:
+    """
+    Digest of the ids and update timestamps of every node and edge of a pipeline.
+    """
+    digest = hashlib.sha1()
+    for node_id, updated_at in sorted(nodes):
+        digest.update(f'n{node_id}:{updated_at.isoformat()};'.encode())
+    for edge_id, updated_at in sorted(edges):
+        digest.update(f'e{edge_id}:{updated_at.isoformat()};'.encode())
+    return digest.hexdigest()
+
+
+def pipeline_revision(pipeline_id: int) -> str:
+    """
+    Computes the current revision of a pipeline from the database, in two cheap queries.
+    """
+    nodes = AudioPipelineNode.objects.filter(pipeline_id=pipeline_id).values_list('id', 'updated_at')
+    edges = AudioPipelineEdge.objects.filter(slot_a__node__pipeline_id=pipeline_id).values_list('id', 'updated_at')
+    return _revision(list(nodes), list(edges))
+
+
+def _field_value(node: AudioPipelineNode, field) -> str | None:
+    value = field.value_from_object(node)
+    return None if value is None else field.value_to_string(node)
+
+
+def graph_to_snapshot(pipeline: 'AudioPipeline', graph: AudioPipelineGraph) -> dict[str, Any]:
+    """
+    Serializes a graph into a compact JSON compatible dict that can be handed to a worker.
+    Every concrete field of the nodes is stored (this includes the exposed ones) so that the
+    worker can rebuild the node instances without querying them, except the secret fields which
+    do not go through the broker: the rebuilt instances load them from the database when read.
+    """
+    nodes = [node.data for node in graph.nodes]
+    slots: dict[int, AudioPipelineNodeSlot] = {}
+    for edge in graph.edges:
+        slots[edge.data.incoming_slot.id] = edge.data.incoming_slot
+        slots[edge.data.outgoing_slot.id] = edge.data.outgoing_slot
+
+    return {
+        'version': SNAPSHOT_VERSION,
+        'pipeline': pipeline.id,
+        'revision': _revision([(n.id, n.updated_at) for n in nodes],
+                              [(e.data.id, e.data.data.updated_at) for e in graph.edges]),
+        'nodes': [
+            {
+                'type_name': node.type_name,
+                'fields': {f.attname: _field_value(node, f) for f in node._meta.concrete_fields
+                           if f not in node.get_secret_fields()},
+            } for node in nodes
+        ],
+        'slots': [[slot.id, slot.name, int(slot.type), int(slot.direction), slot.node_id] for slot in slots.values()],
+        'edges': [[e.data.id, e.data.incoming_slot.id, e.data.outgoing_slot.id, e.data.data.updated_at.isoformat()]
+                  for e in graph.edges],
+    }
+
+
+def graph_from_snapshot(snapshot: dict[str, Any]) -> AudioPipelineGraph:
+    """
+    Rebuilds a graph from a snapshot without any database query.
+    The instances are marked as loaded from the database so that relations can still be followed lazily,
+    and the fields missing from the snapshot are deferred.
+    """
+    from api.views.audio.pipeline.audio_pipelines import find_model_by_name
+
+    nodes = []
+    for data_node in snapshot['nodes']:
+        cls = find_model_by_name(data_node['type_name'])
+        if cls is None:
+            raise ReferenceError(f"Class {data_node['type_name']} not found in registered Django models")
+        field_names = []
+        values = []
+        for field in cls._meta.concrete_fields:
+            if field.attname not in data_node['fields']:
+                continue
+            value = data_node['fields'][field.attname]
+            field_names.append(field.attname)
+            values.append(None if value is None else field.to_python(value))
+        nodes.append(cls.from_db(DEFAULT_DB_ALIAS, field_names, values))
+
+    slots = {}
+    for slot_id, name, slot_type, direction, node_id in snapshot['slots']:
+        slots[slot_id] = AudioPipelineNodeSlot.from_db(
+            DEFAULT_DB_ALIAS, _SLOT_FIELDS, [slot_id, name, SlotType(slot_type), SlotDirection(direction), node_id])
+
+    edges = []
+    updated_at_field = AudioPipelineEdge._meta.get_field('updated_at')
+    for edge_id, slot_a_id, slot_b_id, updated_at in snapshot['edges']:
+        edge = AudioPipelineEdge.from_db(
+            DEFAULT_DB_ALIAS, _EDGE_FIELDS, [edge_id, slot_a_id, slot_b_id, updated_at_field.to_python(updated_at)])
+        edges.append((edge, slots[slot_a_id], slots[slot_b_id]))
+
+    return AudioPipelineGraph.from_models(nodes, edges)
+
+
+def load_graph(pipeline: 'AudioPipeline', snapshot: dict[str, Any] | None) -> AudioPipelineGraph:
+    """
+    Returns the graph of the pipeline, rehydrated from the snapshot when it is still up to date.
+    Falls back on building the graph from the database when the snapshot is missing, from another
+    version or when the pipeline was modified after the snapshot was taken.
+    """
+    if snapshot is None:
+        return AudioPipelineGraph(pipeline)
+    if snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('pipeline') != pipeline.id:
+        logger.warning(f"Ignoring incompatible graph snapshot for pipeline {pipeline.id}")
+        return AudioPipelineGraph(pipeline)
+    if snapshot.get('revision') != pipeline_revision(pipeline.id):
+        logger.info(f"Graph snapshot of pipeline {pipeline.id} is outdated, rebuilding it from the database")
+        return AudioPipelineGraph(pipeline)
+    return graph_from_snapshot(snapshot)
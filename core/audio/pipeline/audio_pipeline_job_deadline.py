@@ -0,0 +1,121 @@
+import logging
+import threading
+import time
+from typing import Callable
+
+from django.db import close_old_connections, transaction
+
+from api.models.audio.pipeline.audio_pipeline_apply_job import AudioPipelineApplyJob
+from core.audio.pipeline.pipeline_job_interrupted_exception import PipelineJobCancelledException, \
+    PipelineJobTimeoutException
+
+logger = logging.getLogger(__name__)
+
+
+class JobDeadline:
+    """
+    Deadlines of a running job: the job as a whole must complete within `job_timeout` seconds and
+    every node within `node_timeout` seconds. A timeout of 0 or None disables the limit.
+    """
+
+    def __init__(self, job_id: int, job_timeout: float | None, node_timeout: float | None):
+        self.job_id = job_id
+        self.expires_at = time.monotonic() + job_timeout if job_timeout else None
+        self.node_timeout = node_timeout or None
+
+    def remaining(self) -> float | None:
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def node_budget(self) -> float | None:
+        """Time a node is given to complete, bounded by the time left to the job."""
+        remaining = self.remaining()
+        if remaining is None:
+            return self.node_timeout
+        if self.node_timeout is None:
+            return remaining
+        return min(self.node_timeout, remaining)
+
+    def checkpoint(self) -> None:
+        """
+        Cooperative cancellation point, called between nodes.
+
+        :raises PipelineJobCancelledException: If the cancellation of the job was requested.
+        :raises PipelineJobTimeoutException: If the job deadline is exceeded.
+        """
+        if AudioPipelineApplyJob.objects.filter(id=self.job_id, cancel_requested=True).exists():
+            raise PipelineJobCancelledException(f'Job {self.job_id} was cancelled')
+        if self.remaining() == 0.0:
+            raise PipelineJobTimeoutException(f'Job {self.job_id} exceeded its deadline')
+
+
+class NodeWorker:
+    """
+    Thread running a node operation in a transaction. The transaction is only committed if the job still
+    waits for the operation: once abandoned, whatever the operation writes is rolled back when it returns,
+    the modules it may load are left to the module reconciler.
+    """
+
+    def __init__(self, fn: Callable[[], None], description: str):
+        self.fn = fn
+        self.description = description
+        self.error: BaseException | None = None
+        self.thread = threading.Thread(target=self._run, name=f'pipeline-node-{description}', daemon=True)
+        # Held while the transaction ends, so that the job knows whether it was committed
+        self._commit_lock = threading.Lock()
+        self._abandoned = False
+        self._done = False
+
+    def _run(self) -> None:
+        locked = False
+        try:
+            with transaction.atomic():
+                self.fn()
+                self._commit_lock.acquire()
+                locked = True
+                if self._abandoned:
+                    logger.warning(f"{self.description} returned after it was abandoned, its writes are rolled back")
+                    transaction.set_rollback(True)
+        except BaseException as e:
+            self.error = e
+        finally:
+            if not locked:
+                self._commit_lock.acquire()
+            self._done = not self._abandoned
+            self._commit_lock.release()
+            close_old_connections()
+
+    def wait(self, timeout: float | None) -> bool:
+        """
+        Waits at most `timeout` seconds for the operation, then gives up on it.
+
+        :return: True if the operation is over, False if it was abandoned.
+        """
+        self.thread.join(timeout)
+        with self._commit_lock:
+            if not self._done:
+                self._abandoned = True
+            return self._done
+
+
+def run_with_timeout(fn: Callable[[], None], timeout: float | None, description: str) -> None:
+    """
+    Runs `fn` and waits for it at most `timeout` seconds. Blocking calls cannot be interrupted,
+    so `fn` runs on a daemon thread that keeps running when it times out, see NodeWorker. The caller is
+    released to report the timeout, it waits a bounded time for the worker with `wait_worker` before
+    rolling back whatever `fn` may have done.
+
+    :raises PipelineJobTimeoutException: If `fn` did not complete in time.
+    """
+    if timeout is None:
+        fn()
+        return
+
+    worker = NodeWorker(fn, description)
+    worker.thread.start()
+    worker.thread.join(timeout)
+    if worker.thread.is_alive():
+        raise PipelineJobTimeoutException(f'{description} did not complete within {timeout:.1f}s', worker=worker)
+    if worker.error is not None:
+        raise worker.error
@@ -0,0 +1,118 @@
+import logging
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from api.models.audio.pipeline.audio_pipeline_apply_job import AudioPipelineApplyJob, JobKind, JobStatus
+
+logger = logging.getLogger(__name__)
+
+
+def _get_task(kind: JobKind):
+    from api.tasks.audio_pipeline_job import apply_audio_pipeline, unapply_audio_pipeline
+    return apply_audio_pipeline if kind == JobKind.APPLY else unapply_audio_pipeline
+
+
+class AudioPipelineJobExecutor(ABC):
+    """
+    Runs the apply and unapply jobs of pipelines. The implementation is selected with the
+    PIPELINE_JOB_EXECUTOR setting, see get_job_executor.
+    """
+
+    @abstractmethod
+    def submit(self, job: AudioPipelineApplyJob, snapshot: dict[str, Any] | None = None) -> None:
+        """
+        Schedules the job, it must not be waited for except by the eager executor.
+
+        :param job: The job to run, its kind selects the task.
+        :param snapshot: Optional graph snapshot handed to the task.
+        """
+        pass
+
+
+class CeleryJobExecutor(AudioPipelineJobExecutor):
+    """Sends the jobs to the Celery workers through the broker."""
+
+    def submit(self, job: AudioPipelineApplyJob, snapshot: dict[str, Any] | None = None) -> None:
+        _get_task(job.kind).delay(job.pipeline_id, job.id, snapshot)
+
+
+class EagerJobExecutor(AudioPipelineJobExecutor):
+    """Runs the jobs synchronously in the calling thread, meant for tests and debugging."""
+
+    def submit(self, job: AudioPipelineApplyJob, snapshot: dict[str, Any] | None = None) -> None:
+        _get_task(job.kind)(job.pipeline_id, job.id, snapshot)
+
+
+class ThreadPoolJobExecutor(AudioPipelineJobExecutor):
+    """
+    Runs the jobs on a thread pool of the current process, no broker nor worker is needed.
+
+    The job table is the queue: when the executor starts, with the app, the jobs that were waiting
+    when the process stopped are submitted again. A job is only ever run once as workers claim it
+    atomically, and the pipeline locks are shared by the processes of the web server, see pipeline_lock.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='pipeline-job')
+        self.pool.submit(self._recover)
+
+    def submit(self, job: AudioPipelineApplyJob, snapshot: dict[str, Any] | None = None) -> None:
+        self.pool.submit(self._run, job.pipeline_id, job.id, job.kind, snapshot)
+
+    @staticmethod
+    def _run(pipeline_id: int, job_id: int, kind: JobKind, snapshot: dict[str, Any] | None) -> None:
+        try:
+            _get_task(kind)(pipeline_id, job_id, snapshot)
+        except Exception as e:
+            logger.exception(f"Job {job_id} failed: {e}")
+        finally:
+            close_old_connections()
+
+    def _recover(self) -> None:
+        try:
+            for job in AudioPipelineApplyJob.objects.filter(status=JobStatus.STARTED).order_by('id'):
+                logger.info(f"Resubmitting pending job {job.id} of pipeline {job.pipeline_id}")
+                self.submit(job)
+        except Exception as e:
+            logger.exception(f"Failed to recover pending jobs: {e}")
+        finally:
+            close_old_connections()
+
+
+EXECUTORS: dict[str, type[AudioPipelineJobExecutor]] = {
+    'celery': CeleryJobExecutor,
+    'thread': ThreadPoolJobExecutor,
+    'eager': EagerJobExecutor,
+}
+
+_executor: AudioPipelineJobExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_job_executor() -> AudioPipelineJobExecutor:
+    """Returns the process wide executor selected by the PIPELINE_JOB_EXECUTOR setting."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            name = getattr(settings, 'PIPELINE_JOB_EXECUTOR', 'celery')
+            if name not in EXECUTORS:
+                raise ValueError(f"Unknown pipeline job executor '{name}', expected one of {list(EXECUTORS)}")
+            if name == 'thread':
+                _executor = ThreadPoolJobExecutor(getattr(settings, 'PIPELINE_JOB_THREADS', 2))
+            else:
+                _executor = EXECUTORS[name]()
+        return _executor
+
+
+def start_job_executor() -> None:
+    """
+    Starts the executor along with the server, so that the thread executor recovers the pending jobs
+    right away instead of on the first request.
+    """
+    if getattr(settings, 'PIPELINE_JOB_EXECUTOR', 'celery') == 'thread':
+        get_job_executor()
@@ -0,0 +1,75 @@
+import fcntl
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from django.conf import settings
+
+from core.audio.pipeline.audio_pipeline_job_stream import get_redis
+from core.audio.pipeline.pipeline_lock_timeout_exception import PipelineLockTimeoutException
+
+logger = logging.getLogger(__name__)
+
+
+class _FileLock:
+    """Lock on a file of PIPELINE_JOB_LOCK_DIR, shared by the processes of the host and freed if the holder dies."""
+
+    def __init__(self, pipeline_id: int):
+        self.path = os.path.join(settings.PIPELINE_JOB_LOCK_DIR, f'pipeline-{pipeline_id}.lock')
+        self.file = None
+
+    def acquire(self, timeout: float) -> bool:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        file = open(self.path, 'a')
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                self.file = file
+                return True
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    file.close()
+                    return False
+                time.sleep(0.05)
+
+    def release(self) -> None:
+        fcntl.flock(self.file, fcntl.LOCK_UN)
+        self.file.close()
+
+
+@contextmanager
+def pipeline_lock(pipeline_id: int, blocking_timeout: float | None = None) -> Iterator[None]:
+    """
+    Serializes the jobs of a pipeline. The lock is held in redis so that it is shared by every worker,
+    it expires after PIPELINE_JOB_LOCK_TIMEOUT seconds so that a crashed worker cannot hold it forever.
+    Without redis, the lock is a file lock, shared by the processes of the host only.
+
+    :param blocking_timeout: Seconds to wait for the lock, PIPELINE_JOB_LOCK_TIMEOUT by default.
+    :raises PipelineLockTimeoutException: If the lock could not be acquired in time.
+    """
+    timeout = getattr(settings, 'PIPELINE_JOB_LOCK_TIMEOUT', 600)
+    if blocking_timeout is None:
+        blocking_timeout = timeout
+    client = get_redis()
+    if client is not None:
+        lock = client.lock(f'opencinema:pipeline:{pipeline_id}:lock', timeout=timeout,
+                           blocking_timeout=blocking_timeout)
+        acquired = lock.acquire()
+    else:
+        lock = _FileLock(pipeline_id)
+        acquired = lock.acquire(blocking_timeout)
+
+    if not acquired:
+        raise PipelineLockTimeoutException(
+            f'Could not acquire the lock of pipeline {pipeline_id} in {blocking_timeout}s')
+    try:
+        yield
+    finally:
+        try:
+            lock.release()
+        except Exception as e:
+            # The redis lock may have expired in the meantime
+            logger.warning(f"Failed to release the lock of pipeline {pipeline_id}: {e}")
@@ -0,0 +1,99 @@
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from api.models.audio.audio_pipeline import AudioPipeline
+from api.models.audio.pipeline.audio_pipeline_apply_event import AudioPipelineApplyEvent, EventType
+from api.models.audio.pipeline.audio_pipeline_apply_job import AudioPipelineApplyJob
+from api.models.audio.pipeline.audio_pipeline_job_summary import AudioPipelineJobSummary
+from core.audio.pipeline.audio_pipeline_job_stream import FINAL_STATUSES
+
+logger = logging.getLogger(__name__)
+
+
+def _compact_batch(jobs: list[dict]) -> None:
+    """
+    Replaces the given jobs and their events by summary rows, in a single transaction.
+    """
+    job_ids = [job['id'] for job in jobs]
+    stats = {
+        row['job_id']: row for row in AudioPipelineApplyEvent.objects
+        .filter(job_id__in=job_ids)
+        .values('job_id')
+        .annotate(event_count=Count('id'),
+                  finished_at=Max('created_at'),
+                  failed_nodes=Count('node_id', filter=Q(event_type__in=[EventType.FAILURE, EventType.TIMEOUT])))
+    }
+
+    summaries = []
+    for job in jobs:
+        job_stats = stats.get(job['id'], {})
+        summaries.append(AudioPipelineJobSummary(
+            pipeline_id=job['pipeline_id'],
+            job_id=job['id'],
+            kind=job['kind'],
+            status=job['status'],
+            created_at=job['created_at'],
+            finished_at=job_stats.get('finished_at'),
+            event_count=job_stats.get('event_count', 0),
+            failed_nodes=job_stats.get('failed_nodes', 0),
+        ))
+
+    with transaction.atomic():
+        AudioPipelineJobSummary.objects.bulk_create(summaries, ignore_conflicts=True)
+        # Events have no dependent rows, they are removed in one query along with their jobs
+        AudioPipelineApplyJob.objects.filter(id__in=job_ids).delete()
+
+
+def compact_pipeline_jobs(pipeline_id: int, keep: int, batch_size: int = 500) -> int:
+    """
+    Keeps the last `keep` jobs of a pipeline with all their events, older finished jobs are rolled up
+    into AudioPipelineJobSummary rows and deleted, `batch_size` jobs at a time.
+
+    :return: The number of compacted jobs.
+    """
+    # Creation time of the newest job that is not kept
+    cutoff = next(iter(AudioPipelineApplyJob.objects
+                       .filter(pipeline_id=pipeline_id)
+                       .order_by('-created_at')
+                       .values_list('created_at', flat=True)[keep:keep + 1]), None)
+    if cutoff is None:
+        return 0
+
+    compacted = 0
+    while True:
+        jobs = list(AudioPipelineApplyJob.objects
+                    .filter(pipeline_id=pipeline_id, created_at__lte=cutoff, status__in=FINAL_STATUSES)
+                    .order_by('created_at')
+                    .values('id', 'pipeline_id', 'kind', 'status', 'created_at')[:batch_size])
+        if not jobs:
+            return compacted
+        _compact_batch(jobs)
+        compacted += len(jobs)
+
+
+def compact_pipeline_job_history(keep: int, batch_size: int = 500, summary_days: int | None = None) -> int:
+    """
+    Applies the retention policy of jobs to every pipeline, see compact_pipeline_jobs.
+    Summaries older than `summary_days` days are deleted as well, they are kept forever if it is None.
+
+    :return: The number of compacted jobs.
+    """
+    compacted = 0
+    for pipeline_id in AudioPipeline.objects.values_list('id', flat=True):
+        try:
+            compacted += compact_pipeline_jobs(pipeline_id, keep, batch_size)
+        except Exception as e:
+            logger.exception(f"Failed to compact the jobs of pipeline {pipeline_id}: {e}")
+
+    if summary_days:
+        deleted, _ = (AudioPipelineJobSummary.objects
+                      .filter(created_at__lt=timezone.now() - timedelta(days=summary_days))
+                      .delete())
+        if deleted:
+            logger.info(f"Deleted {deleted} job summaries older than {summary_days} days")
+
+    return compacted
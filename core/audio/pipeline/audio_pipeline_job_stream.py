@@ -0,0 +1,169 @@
+import json
+import logging
+import threading
+import time
+from typing import Iterator, Iterable
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from api.models.audio.pipeline.audio_pipeline_apply_event import AudioPipelineApplyEvent
+from api.models.audio.pipeline.audio_pipeline_apply_job import AudioPipelineApplyJob, JobStatus
+
+logger = logging.getLogger(__name__)
+
+FINAL_STATUSES = (JobStatus.SUCCESS, JobStatus.FAILED, JobStatus.CANCELLED)
+
+_redis = None
+_redis_lock = threading.Lock()
+
+
+def get_redis():
+    """
+    Returns a shared redis client on the job events URL (the Celery broker by default),
+    or None if it is not a redis URL.
+    """
+    global _redis
+    url = getattr(settings, 'JOB_EVENTS_REDIS_URL', settings.CELERY_BROKER_URL)
+    if not url or not url.startswith(('redis://', 'rediss://', 'unix://')):
+        return None
+    with _redis_lock:
+        if _redis is None:
+            import redis
+            _redis = redis.Redis.from_url(url)
+        return _redis
+
+
+def job_channel(job_id: int) -> str:
+    return f'opencinema:job:{job_id}'
+
+
+def publish_job_events(job_id: int, status: JobStatus, events: Iterable[AudioPipelineApplyEvent]) -> None:
+    """
+    Publishes already saved events of a job. Publishing is best effort, subscribers that miss a message
+    catch up from the database when they reconnect with the last event id they received.
+    """
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline(transaction=False)
+        for event in events:
+            pipe.publish(job_channel(job_id), json.dumps({'status': status, 'event': event.to_dict()},
+                                                         cls=DjangoJSONEncoder))
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to publish events of job {job_id}: {e}")
+
+
+def _format_sse(status: str, event: dict) -> str:
+    data = json.dumps({'status': status, 'event': event}, cls=DjangoJSONEncoder)
+    return f"id: {event['id']}\nevent: job_event\ndata: {data}\n\n"
+
+
+def _stored_events(job_id: int, last_event_id: int) -> tuple[list[str], int, bool]:
+    """
+    :return: The stored events after `last_event_id` formatted as SSE, the id of the last one and whether
+    the job reached a final status.
+    """
+    job = AudioPipelineApplyJob.objects.get(id=job_id)
+    messages = []
+    for event in job.audiopipelineapplyevent_set.filter(id__gt=last_event_id).order_by('id'):
+        messages.append(_format_sse(job.status, event.to_dict()))
+        last_event_id = event.id
+    return messages, last_event_id, job.status in FINAL_STATUSES
+
+
+class StreamSlots:
+    """
+    Bounds the number of streams served at once by this process, each of them holds a worker thread.
+    """
+
+    def __init__(self, limit: int):
+        self._semaphore = threading.BoundedSemaphore(limit)
+
+    def open(self, stream: Iterator[str]) -> '_SlotStream | None':
+        """:return: The stream, which frees its slot once closed, or None if every slot is taken."""
+        if not self._semaphore.acquire(blocking=False):
+            return None
+        return _SlotStream(stream, self._semaphore)
+
+
+class _SlotStream:
+    """Stream holding a slot, Django closes it once the response is done, even if it was never iterated."""
+
+    def __init__(self, stream: Iterator[str], semaphore: threading.BoundedSemaphore):
+        self._stream = stream
+        self._semaphore = semaphore
+        self._closed = False
+
+    def __iter__(self):
+        return self._stream
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._stream.close()
+        finally:
+            self._semaphore.release()
+
+
+stream_slots = StreamSlots(getattr(settings, 'PIPELINE_JOB_STREAM_MAX_CONNECTIONS', 4))
+
+
+def stream_job_events(job_id: int, last_event_id: int = 0, heartbeat: float = 15.0,
+                      poll_interval: float = 1.0, max_duration: float | None = None) -> Iterator[str]:
+    """
+    Yields the events of a job as server-sent events, starting after `last_event_id`.
+
+    The channel is subscribed before the events already in the database are replayed, so nothing is
+    lost in between. Events are always read from the database, after the last one sent: a message wakes
+    the stream up and a heartbeat without message checks it in case a message was not published. The
+    stream ends once the job reaches a final status, or after
+    `max_duration` seconds (PIPELINE_JOB_STREAM_MAX_DURATION by default): the client then reconnects
+    with the id of the last event it received.
+    When redis is not available, the database is polled every `poll_interval` seconds instead.
+    """
+    if max_duration is None:
+        max_duration = getattr(settings, 'PIPELINE_JOB_STREAM_MAX_DURATION', 300)
+    deadline = time.monotonic() + max_duration
+    client = get_redis()
+    pubsub = None
+    if client is not None:
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(job_channel(job_id))
+        except Exception as e:
+            logger.warning(f"Cannot subscribe to events of job {job_id}, falling back on polling: {e}")
+            pubsub = None
+
+    try:
+        while True:
+            messages, last_event_id, final = _stored_events(job_id, last_event_id)
+            yield from messages
+            remaining = deadline - time.monotonic()
+            if final or remaining <= 0:
+                return
+
+            if pubsub is None:
+                time.sleep(min(poll_interval, remaining))
+                yield ': keepalive\n\n'
+                continue
+
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                message = pubsub.get_message(timeout=min(heartbeat, remaining))
+                if message is None:
+                    yield ': keepalive\n\n'
+                    break
+                # A message only signals new events: the ones of an earlier publish that failed are
+                # only in the database, so the cursor is advanced from it
+                if json.loads(message['data'])['event']['id'] > last_event_id:
+                    break
+    finally:
+        if pubsub is not None:
+            pubsub.close()
@@ -1,61 +1,237 @@
+import logging
+import time
+from datetime import timedelta
 from typing import NamedTuple, Any
 
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
 from api.models import AudioPipelineNode
 from api.models.audio.pipeline.audio_pipeline_apply_event import AudioPipelineApplyEvent, EventType
-from api.models.audio.pipeline.audio_pipeline_apply_job import AudioPipelineApplyJob, JobStatus
+from api.models.audio.audio_pipeline import AudioPipeline
+from api.models.audio.pipeline.audio_pipeline_apply_job import AudioPipelineApplyJob, JobStatus, JobKind
+from core.audio.pipeline.audio_pipeline_job_executor import get_job_executor
+from core.audio.pipeline.audio_pipeline_job_stream import publish_job_events, FINAL_STATUSES
+
+logger = logging.getLogger(__name__)
 
 
 class PipelineJobEventData(NamedTuple):
     graph_errors: list[str] = list()
     node_errors: list[str] = list()
+    reason: str | None = None
 
     def to_dict(self) -> dict:
         return self._asdict()
 
 
-def job_log_success_event(job: AudioPipelineApplyJob):
-    AudioPipelineApplyEvent(
-        job_id=job.id,
-        event_type=EventType.SUCCESS
-    ).save()
-    job.status = JobStatus.SUCCESS
-    job.save()
-
-
-def job_log_node_start_event(job: AudioPipelineApplyJob, node: AudioPipelineNode):
-    AudioPipelineApplyEvent(
-        job_id=job.id,
-        node=node,
-        event_type=EventType.STARTED_NODE
-    ).save()
-    job.status = JobStatus.RUNNING
-    job.save()
-
-
-def job_log_failure_event(job: AudioPipelineApplyJob, data: PipelineJobEventData):
-    AudioPipelineApplyEvent(
-        job_id=job.id,
-        event_type=EventType.FAILURE,
-        data=data.to_dict()
-    ).save()
-    job.status = JobStatus.FAILED
-    job.save()
-
-
-def job_log_failure_node_event(job: AudioPipelineApplyJob, node: AudioPipelineNode, data: PipelineJobEventData):
-    AudioPipelineApplyEvent(
-        job_id=job.id,
-        node=node,
-        event_type=EventType.FAILURE,
-        data=data.to_dict()
-    ).save()
-    job.status = JobStatus.FAILED
-    job.save()
-
-
-def job_log_completed_node_event(job: AudioPipelineApplyJob, node_id: int):
-    AudioPipelineApplyEvent(
-        job=job,
-        event_type=EventType.COMPLETED_NODE,
-        node_id=node_id
-    ).save()
+class JobEventBuffer:
+    """
+    Collects the events of a job in memory and writes them in a single bulk insert, along with
+    a single update of the job status. Written events are then published to the live job streams.
+
+    Events are flushed when `flush` is called (at phase boundaries), when `max_events` events are
+    pending or when the oldest pending event is older than `max_delay` seconds.
+    Used as a context manager, pending events are always flushed on exit, even if an exception
+    is raised. In that case a failure event is recorded if the job did not reach a final status.
+    """
+
+    def __init__(self, job: AudioPipelineApplyJob, max_events: int = 50, max_delay: float = 0.5):
+        self.job = job
+        self.max_events = max_events
+        self.max_delay = max_delay
+        self._pending: list[AudioPipelineApplyEvent] = []
+        self._pending_since: float | None = None
+        self._status: JobStatus | None = None
+
+    def __enter__(self) -> 'JobEventBuffer':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_value is not None and self.job.status not in FINAL_STATUSES:
+            self.log(EventType.FAILURE, data=PipelineJobEventData(graph_errors=[str(exc_value)]),
+                     status=JobStatus.FAILED)
+        try:
+            self.flush()
+        except Exception:
+            if exc_value is None:
+                raise
+            # Do not hide the original error
+            logger.exception(f"Failed to flush events of job {self.job.id}")
+        return False
+
+    def log(self, event_type: EventType, node_id: int | None = None, data: PipelineJobEventData | None = None,
+            status: JobStatus | None = None) -> None:
+        self._pending.append(AudioPipelineApplyEvent(
+            job_id=self.job.id,
+            node_id=node_id,
+            event_type=event_type,
+            data=data.to_dict() if data is not None else None,
+            created_at=timezone.now()
+        ))
+        if status is not None:
+            self.set_status(status)
+        if self._pending_since is None:
+            self._pending_since = time.monotonic()
+
+        if len(self._pending) >= self.max_events or time.monotonic() - self._pending_since >= self.max_delay:
+            self.flush()
+
+    def set_status(self, status: JobStatus) -> None:
+        self._status = status
+        self.job.status = status
+
+    def flush(self) -> None:
+        if not self._pending and self._status is None:
+            return
+        with transaction.atomic():
+            if self._pending:
+                AudioPipelineApplyEvent.objects.bulk_create(self._pending)
+            if self._status is not None:
+                AudioPipelineApplyJob.objects.filter(id=self.job.id).update(status=self._status)
+        # Push to the live subscribers once the events are committed and have their ids, the caller
+        # may hold a transaction of its own
+        job_id, status, events = self.job.id, self.job.status, self._pending
+        transaction.on_commit(lambda: publish_job_events(job_id, status, events))
+        self._pending = []
+        self._pending_since = None
+        self._status = None
+
+
+def job_log_success_event(events: JobEventBuffer):
+    events.log(EventType.SUCCESS, status=JobStatus.SUCCESS)
+
+
+def job_log_node_start_event(events: JobEventBuffer, node: AudioPipelineNode):
+    events.log(EventType.STARTED_NODE, node_id=node.id, status=JobStatus.RUNNING)
+
+
+def job_log_failure_event(events: JobEventBuffer, data: PipelineJobEventData):
+    events.log(EventType.FAILURE, data=data, status=JobStatus.FAILED)
+
+
+def job_log_failure_node_event(events: JobEventBuffer, node: AudioPipelineNode, data: PipelineJobEventData):
+    events.log(EventType.FAILURE, node_id=node.id, data=data, status=JobStatus.FAILED)
+
+
+def job_log_completed_node_event(events: JobEventBuffer, node_id: int):
+    events.log(EventType.COMPLETED_NODE, node_id=node_id)
+
+
+def job_log_timeout_event(events: JobEventBuffer, node_id: int | None, data: PipelineJobEventData):
+    events.log(EventType.TIMEOUT, node_id=node_id, data=data, status=JobStatus.FAILED)
+
+
+def job_log_cancelled_event(events: JobEventBuffer, data: PipelineJobEventData):
+    events.log(EventType.CANCELLED, data=data, status=JobStatus.CANCELLED)
+
+
+def _mark_cancelled(jobs: list[AudioPipelineApplyJob]) -> list[AudioPipelineApplyJob]:
+    """:return: The jobs that were cancelled, a job that is already running is left untouched."""
+    cancelled = []
+    for job in jobs:
+        if AudioPipelineApplyJob.objects.filter(id=job.id, status=JobStatus.STARTED).update(status=JobStatus.CANCELLED):
+            job.status = JobStatus.CANCELLED
+            cancelled.append(job)
+    return cancelled
+
+
+def _log_cancelled(jobs: list[AudioPipelineApplyJob], reason: str) -> None:
+    for job in jobs:
+        with JobEventBuffer(job) as events:
+            events.log(EventType.CANCELLED, data=PipelineJobEventData(reason=reason))
+
+
+def cancel_pending_jobs(jobs: list[AudioPipelineApplyJob], reason: str) -> None:
+    """
+    Cancels the given jobs if they did not start yet, a job that is already running is left untouched.
+    """
+    with transaction.atomic():
+        _log_cancelled(_mark_cancelled(jobs), reason)
+
+
+def _pending_jobs(pipeline: AudioPipeline) -> list[AudioPipelineApplyJob]:
+    return list(AudioPipelineApplyJob.objects.filter(pipeline=pipeline, status=JobStatus.STARTED).order_by('-id'))
+
+
+def _is_stuck(job: AudioPipelineApplyJob) -> bool:
+    """Whether a pending job has waited too long to be picked up, its message may have been lost."""
+    timeout = getattr(settings, 'PIPELINE_JOB_PENDING_TIMEOUT', 60)
+    return job.created_at < timezone.now() - timedelta(seconds=timeout)
+
+
+def create_pipeline_job(pipeline: AudioPipeline, kind: JobKind, attempts: int = 3) -> tuple[AudioPipelineApplyJob, bool]:
+    """
+    Creates a job for the pipeline, coalescing it with the job that is waiting to be processed.
+    If the pending job is of the same kind, it is returned instead of creating a new one.
+    Otherwise, or if it has been pending for more than PIPELINE_JOB_PENDING_TIMEOUT seconds,
+    the new job supersedes it, and it is cancelled.
+
+    A pipeline has at most one pending job, enforced by a unique constraint: when concurrent requests
+    race, the losers try again and coalesce with the job of the winner.
+
+    :return: The job to track and whether it was created.
+    """
+    for attempt in range(attempts):
+        try:
+            with transaction.atomic():
+                pending = _pending_jobs(pipeline)
+                if pending and pending[0].kind == kind and not _is_stuck(pending[0]):
+                    return pending[0], False
+
+                # Cancelled first, the new job could not be pending alongside them
+                superseded = _mark_cancelled(pending)
+                job = AudioPipelineApplyJob.objects.create(pipeline=pipeline, kind=kind)
+                AudioPipelineApplyEvent.objects.create(job=job, event_type=EventType.START)
+                _log_cancelled(superseded, f'Superseded by job {job.id}')
+            return job, True
+        except IntegrityError:
+            if attempt == attempts - 1:
+                raise
+            logger.debug(f"Concurrent job creation on pipeline {pipeline.id}, trying again")
+
+
+def submit_pipeline_job(job: AudioPipelineApplyJob, snapshot: dict[str, Any] | None = None) -> bool:
+    """
+    Hands a job created by create_pipeline_job to the executor. A job that cannot be submitted is failed,
+    as no worker would ever claim it.
+
+    :return: False if the job could not be submitted.
+    """
+    try:
+        get_job_executor().submit(job, snapshot)
+        return True
+    except Exception as e:
+        logger.exception(f"Failed to submit job {job.id}: {e}")
+        if AudioPipelineApplyJob.objects.filter(id=job.id, status=JobStatus.STARTED).update(status=JobStatus.FAILED):
+            job.status = JobStatus.FAILED
+            with JobEventBuffer(job) as events:
+                events.log(EventType.FAILURE, data=PipelineJobEventData(graph_errors=[f'Failed to submit the job: {e}']))
+        return False
+
+
+def claim_job(job: AudioPipelineApplyJob) -> bool:
+    """
+    Atomically moves a pending job to running.
+
+    :return: False if the job was cancelled or already claimed by another worker.
+    """
+    if AudioPipelineApplyJob.objects.filter(id=job.id, status=JobStatus.STARTED).update(status=JobStatus.RUNNING):
+        job.status = JobStatus.RUNNING
+        return True
+    return False
+
+
+def request_job_cancellation(job: AudioPipelineApplyJob) -> bool:
+    """
+    Cancels a pending job right away, or asks the worker of a running job to stop at the next node.
+
+    :return: False if the job is already finished.
+    """
+    if job.status == JobStatus.STARTED:
+        cancel_pending_jobs([job], 'Cancelled on request')
+        job.refresh_from_db()
+        if job.status == JobStatus.CANCELLED:
+            return True
+    return AudioPipelineApplyJob.objects.filter(id=job.id, status=JobStatus.RUNNING).update(cancel_requested=True) > 0
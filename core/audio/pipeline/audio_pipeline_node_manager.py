@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Hashable
 
 from api.models.audio.pipeline.audio_pipeline_node_slot import AudioPipelineNodeSlot
 from core.audio.pipeline.audio_pipeline_graph import AudioPipelineGraph, AudioPipelineGraphNode
@@ -44,6 +44,31 @@ class AudioPipelineNodeManager(ABC):
         """
         return None
 
+    def get_validation_revision(self) -> Hashable:
+        """
+        Revision of the related objects the validation and the slot schematics of the node depend on,
+        it is part of the validation cache key. Managers reading other models must override it.
+        """
+        return ()
+
+    def get_health(self) -> dict | None:
+        """
+        Runtime health of the applied node, as monitored by its plugin.
+
+        :return: A JSON serializable summary, or None if the node is not monitored.
+        """
+        return None
+
+    @classmethod
+    def get_nodes_health(cls, nodes: list) -> dict[int, dict | None]:
+        """
+        Health of several nodes managed by this class, at once. Managers whose health comes from an external
+        store override it to read it in one go.
+
+        :return: The health of each node by id, see get_health.
+        """
+        return {node.id: node.get_manager().get_health() for node in nodes}
+
     @abstractmethod
     def get_slot_data(self, slot_name: str) -> Any:
         """
@@ -0,0 +1,230 @@
+import logging
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, NamedTuple
+
+from django.db import models
+from django.db.models.fields import Field
+from django.db.models.signals import class_prepared
+
+from api.models.audio.pipeline.audio_pipeline_io_node import AudioPipelineIONode
+from api.models.audio.pipeline.audio_pipeline_node import AudioPipelineNode
+from api.models.audio.pipeline.audio_pipeline_processing_node import AudioPipelineProcessingNode
+
+logger = logging.getLogger(__name__)
+
+# Checks a non null value of a field, returns an error message or None
+FieldCheck = Callable[[str, Any], str | None]
+
+
+class FieldValidator(NamedTuple):
+    field: Field
+    nullable: bool
+    check: FieldCheck | None
+
+
+class NodeValidationPlan:
+    """
+    Validation of the fields of a node type, compiled once: the required fields and a check per field.
+    All the errors of a payload are collected in one pass.
+    """
+
+    __slots__ = ('type_name', 'required', 'validators')
+
+    def __init__(self, type_name: str, exposed_fields: tuple[Field, ...], validators: Mapping[str, FieldValidator]):
+        self.type_name = type_name
+        self.required = tuple(field.name for field in exposed_fields
+                              if not field.null and not field.blank and field.default == models.NOT_PROVIDED
+                              and field.name not in ('id', 'type_name'))
+        self.validators = validators
+
+    def validate(self, fields_data: Mapping[str, Any]) -> list[str]:
+        """:return: The errors of the given field values, empty if they are valid."""
+        errors = [f'Field "{name}" is required for type {self.type_name}'
+                  for name in self.required if name not in fields_data]
+        validators = self.validators
+        for name, value in fields_data.items():
+            validator = validators.get(name)
+            if validator is None:
+                errors.append(f'Field "{name}" does not exist for type {self.type_name}')
+            elif value is None:
+                if not validator.nullable:
+                    errors.append(f'Field "{name}" does not allow null values')
+            elif validator.check is not None:
+                error = validator.check(name, value)
+                if error is not None:
+                    errors.append(error)
+        return errors
+
+
+class NodeType(NamedTuple):
+    cls: type[AudioPipelineNode]
+    type_name: str
+    # Exposed fields, without the parent links
+    exposed_fields: tuple[Field, ...]
+    # Validators of every field that can be set from the API, by name
+    validators: Mapping[str, FieldValidator]
+    # 'device', 'processing' or None for the nodes that are not listed in the schematics
+    category: str | None
+    schematic: dict[str, Any]
+    validation: NodeValidationPlan
+
+
+def field_to_json(field: Field):
+    if hasattr(field, 'choices') and field.choices is not None:
+        choices = [{'label': choice[0], 'value': choice[1]} for choice in field.choices]
+    else:
+        choices = []
+
+    return {
+        'name': field.name,
+        'type': field.__class__.__name__,
+        'is_relation': field.is_relation,
+        'help_text': field.help_text if hasattr(field, 'help_text') else None,
+        'choices': choices,
+        'nullable': field.null
+    }
+
+
+def node_type_to_json(cls: type[AudioPipelineNode]) -> dict[str, Any]:
+    return {
+        'type_name': cls.__name__,
+        'fields': [field_to_json(f)
+                   for f in cls.get_exposed_fields()
+                   if '_ptr' not in f.name],
+    }
+
+
+def _type_check(types: tuple[type, ...], expected: str) -> FieldCheck:
+    def check(name: str, value: Any) -> str | None:
+        if not isinstance(value, types):
+            return f'Field "{name}" must be {expected}, got {type(value).__name__}'
+        return None
+    return check
+
+
+def _string_check(max_length: int | None) -> FieldCheck:
+    def check(name: str, value: Any) -> str | None:
+        if not isinstance(value, str):
+            return f'Field "{name}" must be a string, got {type(value).__name__}'
+        if max_length and len(value) > max_length:
+            return f'Field "{name}" max length is {max_length}, got {len(value)}'
+        return None
+    return check
+
+
+def _relation_check(name: str, value: Any) -> str | None:
+    # For foreign keys, check if the ID is an integer
+    if not isinstance(value, int):
+        return f'Field "{name}" (foreign key) must be an integer ID, got {type(value).__name__}'
+    return None
+
+
+def compile_field_validator(field) -> FieldValidator:
+    """Picks the check of a field once, instead of going through the field classes for every value."""
+    if isinstance(field, models.IntegerField):
+        check = _type_check((int,), 'an integer')
+    elif isinstance(field, models.FloatField):
+        check = _type_check((int, float), 'a number')
+    elif isinstance(field, models.BooleanField):
+        check = _type_check((bool,), 'a boolean')
+    elif isinstance(field, (models.CharField, models.TextField)):
+        check = _string_check(field.max_length if isinstance(field, models.CharField) else None)
+    elif field.is_relation:
+        check = _relation_check
+    else:
+        check = None
+    return FieldValidator(field, bool(field.null), check)
+
+
+def _category(cls: type[AudioPipelineNode]) -> str | None:
+    if AudioPipelineIONode in cls.__bases__:
+        return 'device'
+    if AudioPipelineProcessingNode in cls.__bases__:
+        return 'processing'
+    return None
+
+
+def _node_classes(cls: type[AudioPipelineNode]) -> list[type[AudioPipelineNode]]:
+    """Subclasses of a node class in definition order, depth first."""
+    classes = []
+    for subclass in cls.__subclasses__():
+        if not subclass._meta.abstract:
+            classes.append(subclass)
+        classes.extend(_node_classes(subclass))
+    return classes
+
+
+def build_node_type(cls: type[AudioPipelineNode]) -> NodeType:
+    exposed_fields = tuple(field for field in cls.get_exposed_fields() if '_ptr' not in field.name)
+    validators = MappingProxyType({field.name: compile_field_validator(field) for field in cls._meta.get_fields()})
+    return NodeType(
+        cls=cls,
+        type_name=cls.__name__,
+        exposed_fields=exposed_fields,
+        validators=validators,
+        category=_category(cls),
+        schematic=node_type_to_json(cls),
+        validation=NodeValidationPlan(cls.__name__, exposed_fields, validators),
+    )
+
+
+class NodeTypeRegistry:
+    """
+    Node types by type_name, built once when the app is ready instead of scanning the models on every lookup.
+    The types are an immutable snapshot, replaced as a whole when a model is defined afterwards,
+    for example by a plugin imported late.
+    """
+
+    def __init__(self):
+        self._types: Mapping[str, NodeType] | None = None
+        self._schematics: dict[str, list[dict]] | None = None
+        self._lock = threading.Lock()
+
+    def build(self) -> Mapping[str, NodeType]:
+        types = {}
+        for cls in _node_classes(AudioPipelineNode):
+            if cls.__name__ in types:
+                logger.warning(f"Node type {cls.__name__} is defined twice, {cls.__module__} is ignored")
+                continue
+            types[cls.__name__] = build_node_type(cls)
+        schematics = {'device': [], 'processing': []}
+        for node_type in types.values():
+            if node_type.category is not None:
+                schematics[node_type.category].append(node_type.schematic)
+
+        with self._lock:
+            self._types = MappingProxyType(types)
+            self._schematics = schematics
+        logger.info(f"Registered {len(types)} node types")
+        return self._types
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._types = None
+            self._schematics = None
+
+    def types(self) -> Mapping[str, NodeType]:
+        types = self._types
+        return types if types is not None else self.build()
+
+    def get(self, type_name: str) -> NodeType | None:
+        return self.types().get(type_name)
+
+    def schematics(self) -> dict[str, list[dict]]:
+        schematics = self._schematics
+        if schematics is None:
+            self.build()
+            schematics = self._schematics
+        return schematics
+
+
+node_types = NodeTypeRegistry()
+
+
+def _on_class_prepared(sender, **kwargs):
+    if issubclass(sender, AudioPipelineNode):
+        node_types.invalidate()
+
+
+class_prepared.connect(_on_class_prepared)
@@ -0,0 +1,31 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.audio.pipeline.audio_pipeline_job_deadline import NodeWorker
+
+
+class PipelineJobInterruptedException(Exception):
+    pass
+
+
+class PipelineJobCancelledException(PipelineJobInterruptedException):
+    pass
+
+
+class PipelineJobTimeoutException(PipelineJobInterruptedException):
+
+    def __init__(self, message: str, worker: 'NodeWorker | None' = None):
+        super().__init__(message)
+        # Node operation that timed out, it keeps running until its blocking call returns
+        self.worker = worker
+
+    def wait_worker(self, timeout: float | None) -> bool:
+        """
+        Waits at most `timeout` seconds for the node operation that timed out to exit, so that it cannot
+        act after the rollback.
+
+        :return: True if it is over, False if it was abandoned: what it writes later is rolled back.
+        """
+        if self.worker is None:
+            return True
+        return self.worker.wait(timeout)
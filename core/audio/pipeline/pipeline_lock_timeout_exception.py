@@ -0,0 +1,2 @@
+class PipelineLockTimeoutException(Exception):
+    pass
\ No newline at end of file
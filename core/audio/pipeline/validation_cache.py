@@ -0,0 +1,45 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class ValidationCache:
+    """
+    Process wide LRU cache of validation results, keyed by an object id and a revision.
+
+    An entry is only returned if the stored revision matches the requested one, so callers
+    never have to invalidate explicitly: a changed node simply produces a new revision.
+    """
+
+    MISS = object()
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: OrderedDict[int, tuple[Hashable, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: int, revision: Hashable) -> Any:
+        """
+        :return: The cached value, or ValidationCache.MISS if there is no entry for this revision.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != revision:
+                return ValidationCache.MISS
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: int, revision: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (revision, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+node_validation_cache = ValidationCache()
+edge_validation_cache = ValidationCache()
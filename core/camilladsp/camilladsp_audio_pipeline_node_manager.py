@@ -27,6 +27,13 @@ class CamillaDSPAudioPipelineNodeManager(AudioPipelineNodeManager):
                                   node=self.node)
         ]
 
+    def get_validation_revision(self) -> tuple:
+        # The pipeline may be unset by a bulk update that does not touch the node
+        pipeline = self.node.camilladsp_pipeline
+        if pipeline is None:
+            return None,
+        return pipeline.id, pipeline.updated_at, pipeline.input_device_id, pipeline.output_device_id
+
     def apply(self, graph_node: AudioPipelineGraphNode, graph: AudioPipelineGraph):
         # graph_node.incoming[0].data.incoming_slot.
         # TODO Make
@@ -38,7 +45,8 @@ class CamillaDSPAudioPipelineNodeManager(AudioPipelineNodeManager):
     def validate(self, graph_node: AudioPipelineGraphNode, graph: AudioPipelineGraph) -> ValidationResultNode | None:
         field_errors = {}
         try:
-            self.node.camilladsp_pipeline
+            if self.node.camilladsp_pipeline is None:
+                field_errors['camilladsp_pipeline'] = 'CamillaDSP Pipeline not set'
         except ObjectDoesNotExist:
             field_errors['camilladsp_pipeline'] = 'CamillaDSP Pipeline not set'
 
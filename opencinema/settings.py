@@ -151,6 +151,74 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# How pipeline jobs are run: 'celery' (workers through the broker), 'thread' (thread pool in the
+# web server process, no redis nor worker needed) or 'eager' (synchronously, for tests)
+PIPELINE_JOB_EXECUTOR = env('PIPELINE_JOB_EXECUTOR', default='celery')
+PIPELINE_JOB_THREADS = env.int('PIPELINE_JOB_THREADS', default=2)
+# Seconds after which a job that was not picked up is superseded by the next request instead of coalescing it
+PIPELINE_JOB_PENDING_TIMEOUT = env.int('PIPELINE_JOB_PENDING_TIMEOUT', default=60)
+
+# Redis used to push pipeline job events to the live streams and to lock pipelines,
+# defaults to the Celery broker. Leave empty to go without redis.
+JOB_EVENTS_REDIS_URL = env('JOB_EVENTS_REDIS_URL', default=CELERY_BROKER_URL if PIPELINE_JOB_EXECUTOR == 'celery' else '')
+# A job event stream holds a worker thread: streams served at once per process, and seconds after which
+# a stream ends, the client reconnecting with the last event id it received
+PIPELINE_JOB_STREAM_MAX_CONNECTIONS = env.int('PIPELINE_JOB_STREAM_MAX_CONNECTIONS', default=4)
+PIPELINE_JOB_STREAM_MAX_DURATION = env.int('PIPELINE_JOB_STREAM_MAX_DURATION', default=300)
+
+# Seconds a pipeline job may hold (or wait for) the lock of its pipeline
+PIPELINE_JOB_LOCK_TIMEOUT = env.int('PIPELINE_JOB_LOCK_TIMEOUT', default=600)
+# Directory of the pipeline lock files, used instead of redis so that every process of the host shares the locks
+PIPELINE_JOB_LOCK_DIR = env('PIPELINE_JOB_LOCK_DIR', default=str(BASE_DIR / '.locks'))
+
+# Seconds a whole apply/unapply job and each of its nodes may take, 0 disables the limit
+PIPELINE_JOB_TIMEOUT = env.int('PIPELINE_JOB_TIMEOUT', default=300)
+PIPELINE_NODE_TIMEOUT = env.int('PIPELINE_NODE_TIMEOUT', default=30)
+# Seconds a timed out node is given to return before it is abandoned, the pipeline is then left stale
+PIPELINE_NODE_ABANDON_AFTER = env.int('PIPELINE_NODE_ABANDON_AFTER', default=10)
+
+# Number of jobs kept with all their events per pipeline, older ones are rolled up into summaries
+PIPELINE_JOB_HISTORY_KEEP = env.int('PIPELINE_JOB_HISTORY_KEEP', default=20)
+PIPELINE_JOB_HISTORY_BATCH_SIZE = env.int('PIPELINE_JOB_HISTORY_BATCH_SIZE', default=500)
+# Days the summaries are kept, 0 keeps them forever
+PIPELINE_JOB_SUMMARY_DAYS = env.int('PIPELINE_JOB_SUMMARY_DAYS', default=365)
+
+# Task modules are not named tasks.py, they are imported explicitly by the workers
+CELERY_IMPORTS = ('api.tasks.audio_pipeline_job', 'api.tasks.audio_pipeline_job_history')
+
+# Run with `celery -A opencinema beat`, installs without Celery run `manage.py compact_pipeline_jobs` from a systemd timer
+CELERY_BEAT_SCHEDULE = {
+    'compact-audio-pipeline-jobs': {
+        'task': 'api.tasks.audio_pipeline_job_history.compact_audio_pipeline_jobs',
+        'schedule': env.int('PIPELINE_JOB_HISTORY_INTERVAL', default=3600),
+    },
+}
+
+# Seconds a backend is given to list its devices, per backend values can be set in AUDIO_BACKEND_TIMEOUTS
+AUDIO_BACKEND_TIMEOUT = env.float('AUDIO_BACKEND_TIMEOUT', default=5.0)
+AUDIO_BACKEND_TIMEOUTS = {'alsa': env.float('AUDIO_BACKEND_TIMEOUT_ALSA', default=10.0)}
+
+# Seconds a discovery result is reused by devices/discover and devices/update
+AUDIO_DISCOVERY_TTL = env.float('AUDIO_DISCOVERY_TTL', default=2.0)
+
+# Seconds between two full synchronizations of the known devices by `manage.py watch_audio_devices`,
+# backends without device events are polled at this interval
+AUDIO_DEVICE_RECONCILE_INTERVAL = env.int('AUDIO_DEVICE_RECONCILE_INTERVAL', default=300)
+
+# Auto-tune of the PulseAudio pipe nodes: lowest latency target tried, and seconds the tuning may take.
+# The tuning runs within the node timeout, the budget must stay below PIPELINE_NODE_TIMEOUT
+PULSEAUDIO_LOOPBACK_MIN_LATENCY = env.int('PULSEAUDIO_LOOPBACK_MIN_LATENCY', default=10)
+PULSEAUDIO_LOOPBACK_TUNE_BUDGET = env.float('PULSEAUDIO_LOOPBACK_TUNE_BUDGET', default=15.0)
+
+# Health of the PulseAudio tunnel nodes, sampled by `manage.py monitor_pulseaudio_tunnels`: seconds between
+# two samples, samples kept per tunnel, and whether a dead tunnel is reapplied after PULSEAUDIO_TUNNEL_REAPPLY_AFTER seconds
+PULSEAUDIO_TUNNEL_MONITOR_INTERVAL = env.float('PULSEAUDIO_TUNNEL_MONITOR_INTERVAL', default=5.0)
+PULSEAUDIO_TUNNEL_HEALTH_SAMPLES = env.int('PULSEAUDIO_TUNNEL_HEALTH_SAMPLES', default=120)
+PULSEAUDIO_TUNNEL_AUTO_REAPPLY = env.bool('PULSEAUDIO_TUNNEL_AUTO_REAPPLY', default=False)
+PULSEAUDIO_TUNNEL_REAPPLY_AFTER = env.float('PULSEAUDIO_TUNNEL_REAPPLY_AFTER', default=30.0)
+# Directory of the health series, used instead of redis so that the web workers read what the monitor recorded
+PULSEAUDIO_TUNNEL_HEALTH_DIR = env('PULSEAUDIO_TUNNEL_HEALTH_DIR', default=str(BASE_DIR / '.tunnel-health'))
+
 # Logging configuration
 LOGGING = {
     'version': 1,
@@ -0,0 +1,195 @@
+import hashlib
+import logging
+import re
+import threading
+from typing import NamedTuple
+
+import alsaaudio
+
+from core.audio.sample_format_enum import SampleFormatEnum
+
+logger = logging.getLogger(__name__)
+
+PROC_CARDS = '/proc/asound/cards'
+
+# Mapping ALSA format constants to SampleFormatEnum
+ALSA_FORMAT_MAP = {
+    alsaaudio.PCM_FORMAT_U8: SampleFormatEnum.U8,
+    alsaaudio.PCM_FORMAT_S16_LE: SampleFormatEnum.S16LE,
+    alsaaudio.PCM_FORMAT_S16_BE: SampleFormatEnum.S16BE,
+    alsaaudio.PCM_FORMAT_S24_LE: SampleFormatEnum.S24LE,
+    alsaaudio.PCM_FORMAT_S24_BE: SampleFormatEnum.S24BE,
+    alsaaudio.PCM_FORMAT_S32_LE: SampleFormatEnum.S32LE,
+    alsaaudio.PCM_FORMAT_S32_BE: SampleFormatEnum.S32BE,
+    alsaaudio.PCM_FORMAT_FLOAT_LE: SampleFormatEnum.FLOAT32LE,
+    alsaaudio.PCM_FORMAT_FLOAT_BE: SampleFormatEnum.FLOAT32BE,
+}
+
+# Format reported for a device supporting several of them, the most precise first
+FORMAT_PREFERENCE = [
+    SampleFormatEnum.S32LE,
+    SampleFormatEnum.FLOAT32LE,
+    SampleFormatEnum.S24LE,
+    SampleFormatEnum.S16LE,
+    SampleFormatEnum.S32BE,
+    SampleFormatEnum.S24BE,
+    SampleFormatEnum.S16BE,
+    SampleFormatEnum.U8,
+]
+
+RATE_PREFERENCE = [48000, 44100, 96000]
+
+_CARD_LINE = re.compile(r'^\s*(\d+)\s+\[(\S+)\s*]:\s*(.*)$')
+_DEVICE_CARD = re.compile(r'CARD=([^,]+)')
+
+
+class AlsaCard(NamedTuple):
+    index: int
+    id: str
+    name: str
+    # Changes when the card is replaced, even under the same id
+    identity: str
+
+
+class AlsaCapabilities(NamedTuple):
+    """Hardware parameters supported by a PCM, as reported by hw_params."""
+    formats: list[SampleFormatEnum]
+    min_rate: int
+    max_rate: int
+    rates: list[int]
+    channels: list[int]
+
+    def preferred_format(self) -> SampleFormatEnum:
+        for sample_format in FORMAT_PREFERENCE:
+            if sample_format in self.formats:
+                return sample_format
+        return self.formats[0] if self.formats else SampleFormatEnum.S16LE
+
+    def preferred_rate(self) -> int:
+        for rate in RATE_PREFERENCE:
+            if (rate in self.rates) if self.rates else (self.min_rate <= rate <= self.max_rate):
+                return rate
+        return self.max_rate
+
+    def preferred_channels(self) -> int:
+        return max(self.channels) if self.channels else 2
+
+
+DEFAULT_CAPABILITIES = AlsaCapabilities([SampleFormatEnum.S16LE], 48000, 48000, [48000], [2])
+
+
+def read_cards() -> dict[str, AlsaCard]:
+    """
+    Parses /proc/asound/cards, which is cheap to read and changes whenever a card comes or goes.
+
+    :return: The cards by id.
+    """
+    try:
+        with open(PROC_CARDS) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return {}
+
+    cards = {}
+    for i, line in enumerate(lines):
+        match = _CARD_LINE.match(line)
+        if match is None:
+            continue
+        index, card_id, name = int(match.group(1)), match.group(2), match.group(3).strip()
+        # The second line holds the long name, with the bus address of the card
+        long_name = lines[i + 1].strip() if i + 1 < len(lines) else ''
+        cards[card_id] = AlsaCard(index, card_id, name, f'{index}:{card_id}:{name}:{long_name}')
+    return cards
+
+
+def cards_fingerprint(cards: dict[str, AlsaCard]) -> str:
+    return hashlib.sha1('|'.join(sorted(card.identity for card in cards.values())).encode()).hexdigest()
+
+
+def device_card(device_name: str, cards: dict[str, AlsaCard]) -> AlsaCard | None:
+    """
+    Finds the card of a PCM name such as 'hw:CARD=PCH,DEV=0', None for virtual devices like 'default'.
+    """
+    match = _DEVICE_CARD.search(device_name)
+    if match is None:
+        return None
+    card = match.group(1)
+    if card in cards:
+        return cards[card]
+    if card.isdigit():
+        return next((c for c in cards.values() if c.index == int(card)), None)
+    return None
+
+
+def _normalize_rates(rates) -> tuple[int, int, list[int]]:
+    if isinstance(rates, int):
+        return rates, rates, [rates]
+    if isinstance(rates, tuple):
+        return rates[0], rates[1], []
+    rates = sorted(rates)
+    return rates[0], rates[-1], rates
+
+
+def probe(device_name: str, pcm_type: int) -> AlsaCapabilities:
+    """
+    Opens the PCM without blocking and queries its hw_params.
+
+    :raises alsaaudio.ALSAAudioError: If the device cannot be opened, for example when it is busy.
+    """
+    pcm = alsaaudio.PCM(pcm_type, mode=alsaaudio.PCM_NONBLOCK, device=device_name)
+    try:
+        formats = [ALSA_FORMAT_MAP[value] for value in pcm.getformats().values() if value in ALSA_FORMAT_MAP]
+        min_rate, max_rate, rates = _normalize_rates(pcm.getrates())
+        channels = sorted(pcm.getchannels())
+    finally:
+        pcm.close()
+    return AlsaCapabilities(formats, min_rate, max_rate, rates, channels)
+
+
+class AlsaCapabilityCache:
+    """
+    Capabilities of the PCMs, kept as long as their card is the same. Devices are only opened again
+    when their card changed, virtual devices (without a card) when any card changed.
+    """
+
+    def __init__(self):
+        self._entries: dict[tuple[int, str], tuple[str, AlsaCapabilities]] = {}
+        self._lock = threading.Lock()
+        self.probes = 0
+        self.hits = 0
+
+    def get(self, device_name: str, pcm_type: int, cards: dict[str, AlsaCard],
+            fingerprint: str) -> AlsaCapabilities:
+        card = device_card(device_name, cards)
+        identity = card.identity if card is not None else fingerprint
+        key = (pcm_type, device_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == identity:
+                self.hits += 1
+                return entry[1]
+
+        try:
+            capabilities = probe(device_name, pcm_type)
+        except alsaaudio.ALSAAudioError as e:
+            if entry is not None:
+                # Busy devices keep their last known capabilities
+                logger.debug(f"Cannot probe ALSA device {device_name}, keeping its capabilities: {e}")
+                return entry[1]
+            raise
+        with self._lock:
+            self.probes += 1
+            self._entries[key] = (identity, capabilities)
+        return capabilities
+
+    def invalidate_card(self, card: AlsaCard | None) -> None:
+        """Forgets the devices of a card, all devices if None."""
+        with self._lock:
+            if card is None:
+                self._entries.clear()
+                return
+            for key in [key for key, entry in self._entries.items() if entry[0] == card.identity]:
+                del self._entries[key]
+
+
+capability_cache = AlsaCapabilityCache()
@@ -0,0 +1,150 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from api.tasks.audio_device_discovery import update_known_devices, deactivate_known_devices, \
+    reconcile_backend_devices
+from core.audio.audio_device_watcher import AudioDeviceWatcher
+from plugin.alsa.audio.alsa_capabilities import AlsaCard, capability_cache, read_cards, cards_fingerprint, \
+    device_card
+from plugin.alsa.audio.backend import AlsaAudioBackend, PCM_TYPES
+
+logger = logging.getLogger(__name__)
+
+DEV_SND = b'/dev/snd'
+
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+
+
+class _Inotify:
+    """Minimal inotify binding, no dependency is needed for the two calls we make."""
+
+    def __init__(self, path: bytes, mask: int):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        if libc.inotify_add_watch(self.fd, path, mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f'Cannot watch {path.decode()}')
+
+    def wait(self, timeout: float) -> bool:
+        """:return: Whether events were received, they are drained."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            while os.read(self.fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class AlsaDeviceWatcher(AudioDeviceWatcher):
+    """
+    Detects ALSA cards coming and going from the device nodes of /dev/snd (inotify), confirmed by the
+    fingerprint of /proc/asound/cards. Only the devices of the affected cards are probed and written.
+    When inotify is not available, the fingerprint is polled every `poll_interval` seconds instead,
+    which only costs a read of a small procfs file.
+    """
+
+    def __init__(self, backend: AlsaAudioBackend, reconcile_interval: float | None = None,
+                 poll_interval: float = 2.0, settle_delay: float = 0.5):
+        self.backend = backend
+        self.reconcile_interval = reconcile_interval or getattr(settings, 'AUDIO_DEVICE_RECONCILE_INTERVAL', 300)
+        self.poll_interval = poll_interval
+        # udev creates the nodes of a card one after the other
+        self.settle_delay = settle_delay
+        self._cards: dict[str, AlsaCard] = {}
+        # Device names by card id, None for the devices without a card
+        self._names: dict[str | None, set[str]] = {}
+
+    def run(self, stop: threading.Event) -> None:
+        try:
+            inotify = _Inotify(DEV_SND, IN_CREATE | IN_DELETE)
+        except (OSError, AttributeError) as e:
+            logger.warning(f"Cannot watch {DEV_SND.decode()}, polling {self.poll_interval}s instead: {e}")
+            inotify = None
+
+        next_reconcile = 0.0
+        try:
+            while not stop.is_set():
+                try:
+                    if time.monotonic() >= next_reconcile:
+                        self._reconcile()
+                        next_reconcile = time.monotonic() + self.reconcile_interval
+
+                    timeout = min(1.0, max(0.0, next_reconcile - time.monotonic()))
+                    if inotify is not None:
+                        if not inotify.wait(timeout):
+                            continue
+                        stop.wait(self.settle_delay)
+                        inotify.wait(0)
+                    elif stop.wait(min(self.poll_interval, timeout)):
+                        break
+                    self._check_cards()
+                except Exception as e:
+                    logger.exception(f"ALSA device watcher failed: {e}")
+                    stop.wait(self.poll_interval)
+                finally:
+                    close_old_connections()
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def _remember(self, devices) -> None:
+        self._names = {}
+        for device in devices:
+            card = device_card(device.name, self._cards)
+            self._names.setdefault(card.id if card is not None else None, set()).add(device.name)
+
+    def _reconcile(self) -> None:
+        self._cards = read_cards()
+        devices = self.backend.devices()
+        self._remember(devices)
+        reconcile_backend_devices(self.backend.name, devices)
+        logger.debug(f"Reconciled {len(devices)} ALSA devices")
+
+    def _check_cards(self) -> None:
+        cards = read_cards()
+        if cards_fingerprint(cards) == cards_fingerprint(self._cards):
+            return
+
+        previous = self._cards
+        removed = [card for card_id, card in previous.items()
+                   if card_id not in cards or cards[card_id].identity != card.identity]
+        added = [card for card_id, card in cards.items()
+                 if card_id not in previous or previous[card_id].identity != card.identity]
+        self._cards = cards
+
+        names: list[str] = []
+        for card in removed:
+            capability_cache.invalidate_card(card)
+            names.extend(self._names.pop(card.id, ()))
+        if names:
+            deactivate_known_devices(self.backend.name, names)
+
+        fingerprint = cards_fingerprint(cards)
+        for card in added:
+            devices = []
+            for pcm_type in PCM_TYPES:
+                devices.extend(self.backend.card_devices(pcm_type, cards, only_card=card, fingerprint=fingerprint))
+            self._names[card.id] = {device.name for device in devices}
+            if devices:
+                update_known_devices(devices)
+
+        logger.info(f"ALSA cards changed: {', '.join(card.id for card in added) or 'none'} added, "
+                    f"{', '.join(card.id for card in removed) or 'none'} removed")
@@ -4,22 +4,14 @@ import alsaaudio
 
 from core.audio.audio_backend import AudioBackend
 from core.audio.audio_device import AudioDevice, AudioDeviceType
-from core.audio.sample_format_enum import SampleFormatEnum
+from plugin.alsa.audio.alsa_capabilities import AlsaCapabilities, AlsaCard, DEFAULT_CAPABILITIES, capability_cache, \
+    read_cards, cards_fingerprint, device_card
 
 logger = logging.getLogger(__name__)
 
-
-# Mapping ALSA format constants to SampleFormatEnum
-ALSA_FORMAT_MAP = {
-    alsaaudio.PCM_FORMAT_U8: SampleFormatEnum.U8,
-    alsaaudio.PCM_FORMAT_S16_LE: SampleFormatEnum.S16LE,
-    alsaaudio.PCM_FORMAT_S16_BE: SampleFormatEnum.S16BE,
-    alsaaudio.PCM_FORMAT_S24_LE: SampleFormatEnum.S24LE,
-    alsaaudio.PCM_FORMAT_S24_BE: SampleFormatEnum.S24BE,
-    alsaaudio.PCM_FORMAT_S32_LE: SampleFormatEnum.S32LE,
-    alsaaudio.PCM_FORMAT_S32_BE: SampleFormatEnum.S32BE,
-    alsaaudio.PCM_FORMAT_FLOAT_LE: SampleFormatEnum.FLOAT32LE,
-    alsaaudio.PCM_FORMAT_FLOAT_BE: SampleFormatEnum.FLOAT32BE,
+PCM_TYPES = {
+    alsaaudio.PCM_CAPTURE: AudioDeviceType.CAPTURE,
+    alsaaudio.PCM_PLAYBACK: AudioDeviceType.PLAYBACK,
 }
 
 
@@ -29,59 +21,57 @@ class AlsaAudioBackend(AudioBackend):
     def name(self):
         return "alsa"
 
-    def devices(self):
+    def _to_device(self, device_name: str, device_type: AudioDeviceType, card: AlsaCard | None,
+                   capabilities: AlsaCapabilities) -> AudioDevice:
+        return AudioDevice(
+            self,
+            device_name,
+            f'{card.name} ({device_name})' if card is not None else device_name,
+            device_type,
+            capabilities.preferred_format(),
+            capabilities.preferred_rate(),
+            capabilities.preferred_channels()
+        )
+
+    def card_devices(self, pcm_type: int, cards: dict[str, AlsaCard], only_card: AlsaCard | None = None,
+                     fingerprint: str | None = None) -> list[AudioDevice]:
+        """
+        Lists the PCMs of a direction with their capabilities, only those of `only_card` if given.
+        """
+        fingerprint = fingerprint or cards_fingerprint(cards)
+        device_type = PCM_TYPES[pcm_type]
         devices = []
-        try:
-            # Get PCM capture devices
+        for device_name in alsaaudio.pcms(pcm_type):
+            card = device_card(device_name, cards)
+            if only_card is not None and card != only_card:
+                continue
+            logger.debug(f"Found ALSA {device_type.name.lower()} device: {device_name}")
             try:
-                capture_devices = alsaaudio.pcms(alsaaudio.PCM_CAPTURE)
-                for device_name in capture_devices:
-                    try:
-                        logger.debug(f"Found ALSA capture device: {device_name}")
-                        # Try to open the device to get its capabilities
-                        pcm = alsaaudio.PCM(alsaaudio.PCM_CAPTURE, device=device_name)
-
-                        # Get device info - use defaults if we can't query specific values
-                        # Note: pyalsaaudio doesn't provide direct access to all device capabilities
-                        # We'll use common defaults
-                        devices.append(AudioDevice(
-                            self,
-                            device_name,
-                            AudioDeviceType.CAPTURE,
-                            SampleFormatEnum.S16LE,  # Default format
-                            48000,  # Default sample rate
-                            2  # Default channel count
-                        ))
-                        pcm.close()
-                    except alsaaudio.ALSAAudioError as e:
-                        logger.warning(f"Failed to process capture device {device_name}: {e}")
+                capabilities = capability_cache.get(device_name, pcm_type, cards, fingerprint)
             except alsaaudio.ALSAAudioError as e:
-                logger.error(f"Failed to list ALSA capture devices: {e}")
-
-            # Get PCM playback devices
-            try:
-                playback_devices = alsaaudio.pcms(alsaaudio.PCM_PLAYBACK)
-                for device_name in playback_devices:
-                    try:
-                        logger.debug(f"Found ALSA playback device: {device_name}")
-                        pcm = alsaaudio.PCM(alsaaudio.PCM_PLAYBACK, device=device_name)
+                logger.warning(f"Failed to probe {device_type.name.lower()} device {device_name}: {e}")
+                capabilities = DEFAULT_CAPABILITIES
+            devices.append(self._to_device(device_name, device_type, card, capabilities))
+        return devices
 
-                        devices.append(AudioDevice(
-                            self,
-                            device_name,
-                            AudioDeviceType.PLAYBACK,
-                            SampleFormatEnum.S16LE,  # Default format
-                            48000,  # Default sample rate
-                            2  # Default channel count
-                        ))
-                        pcm.close()
-                    except alsaaudio.ALSAAudioError as e:
-                        logger.warning(f"Failed to process playback device {device_name}: {e}")
-            except alsaaudio.ALSAAudioError as e:
-                logger.error(f"Failed to list ALSA playback devices: {e}")
+    def devices(self):
+        devices = []
+        try:
+            cards = read_cards()
+            fingerprint = cards_fingerprint(cards)
+            for pcm_type in PCM_TYPES:
+                try:
+                    devices.extend(self.card_devices(pcm_type, cards, fingerprint=fingerprint))
+                except alsaaudio.ALSAAudioError as e:
+                    logger.error(f"Failed to list ALSA {PCM_TYPES[pcm_type].name.lower()} devices: {e}")
 
         except Exception as e:
             logger.error(f"Unexpected error while listing ALSA devices: {e}")
 
-        logger.info(f"ALSA backend discovered {len(devices)} devices")
-        return devices
\ No newline at end of file
+        logger.info(f"ALSA backend discovered {len(devices)} devices "
+                    f"({capability_cache.probes} probes, {capability_cache.hits} cache hits so far)")
+        return devices
+
+    def get_device_watcher(self):
+        from plugin.alsa.audio.alsa_device_watcher import AlsaDeviceWatcher
+        return AlsaDeviceWatcher(self)
@@ -7,6 +7,8 @@ from pulsectl import PulseError
 from core.audio.audio_backend import AudioBackend
 from core.audio.audio_device import AudioDevice, AudioDeviceType
 from core.audio.sample_format_enum import SampleFormatEnum
+from plugin.pulseaudio.audio import pulse_audio_introspection as introspection
+from plugin.pulseaudio.audio.pulse_audio_connection import pulse_connection
 from plugin.pulseaudio.models.pulse_audio_created_device import PulseAudioCreatedModule
 
 logger = logging.getLogger(__name__)
@@ -35,98 +37,86 @@ class PulseAudioBackend(AudioBackend):
     def name(self):
         return "pulseaudio"
 
+    def source_to_device(self, source) -> AudioDevice:
+        return AudioDevice(
+            self,
+            source.name,
+            source.proplist.get('device.string'),
+            AudioDeviceType.CAPTURE,
+            SampleFormatEnum(PaSampleFormat(source.sample_spec.format).name),
+            source.sample_spec.rate,
+            source.channel_count
+        )
+
+    def sink_to_device(self, sink) -> AudioDevice:
+        return AudioDevice(
+            self,
+            sink.name,
+            sink.proplist.get('device.string'),
+            AudioDeviceType.PLAYBACK,
+            SampleFormatEnum(PaSampleFormat(sink.sample_spec.format).name),
+            sink.sample_spec.rate,
+            sink.sample_spec.channels
+        )
+
     def get_source(self, device_name: str) -> AudioDevice:
-        with pulsectl.Pulse("list-devices") as p:
-            source = p.get_source_by_name(device_name)
-            if source is None:
-                raise ValueError(f"Device '{device_name}' not found")
-            return AudioDevice(
-                self,
-                source.name,
-                AudioDeviceType.CAPTURE,
-                SampleFormatEnum(PaSampleFormat(source.sample_spec.format).name),
-                source.sample_spec.rate,
-                source.channel_count
-            )
+        source = pulse_connection.call(lambda p: p.get_source_by_name(device_name))
+        if source is None:
+            raise ValueError(f"Device '{device_name}' not found")
+        return self.source_to_device(source)
 
     def get_sink(self, device_name: str) -> AudioDevice:
-        with pulsectl.Pulse("list-devices") as p:
-            sink = p.get_sink_by_name(device_name)
-            if sink is None:
-                raise ValueError(f"Device '{device_name}' not found")
-            return AudioDevice(
-                self,
-                sink.name,
-                AudioDeviceType.PLAYBACK,
-                SampleFormatEnum(PaSampleFormat(sink.sample_spec.format).name),
-                sink.sample_spec.rate,
-                sink.channel_count
-            )
+        sink = pulse_connection.call(lambda p: p.get_sink_by_name(device_name))
+        if sink is None:
+            raise ValueError(f"Device '{device_name}' not found")
+        return self.sink_to_device(sink)
 
     def devices(self):
-        devices = []
         try:
-            with pulsectl.Pulse("list-devices") as p:
-                # Process sources (capture devices)
-                for source in p.source_list():
-                    try:
-                        logger.debug(f"Found PulseAudio source: {source.name}")
-                        source = p.get_source_by_name(source.name)  # There is a bug in pulsectl, this is the way to get the real informations
-
-                        devices.append(AudioDevice(
-                            self,
-                            source.name,
-                            source.proplist.get('device.string'),
-                            AudioDeviceType.CAPTURE,
-                            SampleFormatEnum(PaSampleFormat(source.sample_spec.format).name),
-                            source.sample_spec.rate,
-                            source.channel_count
-                        ))
-                        print(f"{source.name}: format:{source.sample_spec.format} ch: {source.channel_count}")
-                    except Exception as e:
-                        print(e)
-                        logger.error(f"Failed to process source {source.name}: {e}")
-
-                # Process sinks (playback devices)
-                for sink in p.sink_list():
-                    try:
-                        logger.debug(f"Found PulseAudio sink: {sink.name}")
-                        sink = p.get_sink_by_name(sink.name)
-
-                        devices.append(AudioDevice(
-                            self,
-                            sink.name,
-                            sink.proplist.get('device.string'),
-                            AudioDeviceType.PLAYBACK,
-                            SampleFormatEnum(PaSampleFormat(sink.sample_spec.format).name),
-                            sink.sample_spec.rate,
-                            sink.sample_spec.channels
-                        ))
-                    except Exception as e:
-                        logger.error(f"Failed to process sink {sink.name}: {e}")
-
+            return pulse_connection.call(self._list_devices)
         except pulsectl.PulseError as e:
             logger.error(f"PulseAudio error while listing devices: {e}")
         except Exception as e:
             logger.error(f"Unexpected error while listing PulseAudio devices: {e}")
+        return []
+
+    def _list_devices(self, p: pulsectl.Pulse) -> list[AudioDevice]:
+        devices = []
+        # Process sources (capture devices)
+        for source in introspection.source_list(p):
+            try:
+                logger.debug(f"Found PulseAudio source: {source.name}")
+                devices.append(self.source_to_device(source))
+            except Exception as e:
+                logger.error(f"Failed to process source {source.name}: {e}")
+
+        # Process sinks (playback devices)
+        for sink in introspection.sink_list(p):
+            try:
+                logger.debug(f"Found PulseAudio sink: {sink.name}")
+                devices.append(self.sink_to_device(sink))
+            except Exception as e:
+                logger.error(f"Failed to process sink {sink.name}: {e}")
 
         logger.info(f"PulseAudio backend discovered {len(devices)} devices")
         return devices
 
+    def get_device_watcher(self):
+        from plugin.pulseaudio.audio.pulse_audio_device_watcher import PulseAudioDeviceWatcher
+        return PulseAudioDeviceWatcher(self)
+
     def add_module(self, name: str, args: list[str] = list) -> PulseAudioCreatedModule:
         try:
-            with pulsectl.Pulse("create-module") as p:
-                module_index = p.module_load(name, args)
-                return PulseAudioCreatedModule.objects.create(module_id=module_index)
+            module_index = pulse_connection.call(lambda p: p.module_load(name, args))
+            return PulseAudioCreatedModule.objects.create(module_id=module_index)
         except PulseError as e:
             logger.error(f"Failed to load PulseAudio module: {e}")
             raise e
 
     def del_module(self, module: PulseAudioCreatedModule):
         try:
-            with pulsectl.Pulse("unload-module") as p:
-                p.module_unload(module.module_id)
-                module.delete()
+            pulse_connection.call(lambda p: p.module_unload(module.module_id))
+            module.delete()
         except PulseError as e:
             logger.error(f"Failed to unload PulseAudio module: {e}")
             raise e
@@ -0,0 +1,102 @@
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, TypeVar
+
+import pulsectl
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class PulseAudioConnection:
+    """
+    Connection to PulseAudio shared by the whole process, instead of a connection per call.
+
+    pulsectl connections are not thread safe, calls are serialized by a lock. The connection is opened
+    lazily and opened again when it was lost or when the process was forked. Every call of a pipeline
+    apply, module loads and unloads included, therefore goes through the same connection.
+
+    The device watcher keeps its own connection, as listening to events blocks it.
+    """
+
+    def __init__(self, client_name: str, lock_timeout: float = 30.0):
+        self.client_name = client_name
+        self.lock_timeout = lock_timeout
+        self._lock = threading.RLock()
+        self._pulse: pulsectl.Pulse | None = None
+        self._pid: int | None = None
+        self._connects = 0
+        self._uses = 0
+        self._reconnects = 0
+
+    def _drop(self) -> None:
+        if self._pulse is not None and self._pid == os.getpid():
+            try:
+                self._pulse.close()
+            except Exception as e:
+                logger.debug(f"Failed to close PulseAudio connection: {e}")
+        self._pulse = None
+
+    def _get(self) -> pulsectl.Pulse:
+        if self._pulse is not None and (self._pid != os.getpid() or not self._pulse.connected):
+            self._drop()
+        if self._pulse is None:
+            self._pulse = pulsectl.Pulse(self.client_name)
+            self._pid = os.getpid()
+            self._connects += 1
+        return self._pulse
+
+    @contextmanager
+    def use(self) -> Iterator[pulsectl.Pulse]:
+        """
+        Locks the connection for the duration of the block.
+
+        :raises pulsectl.PulseError: If the connection is still used by another thread after lock_timeout
+        seconds, for example by a node that timed out in the middle of a call.
+        """
+        if not self._lock.acquire(timeout=self.lock_timeout):
+            raise pulsectl.PulseError(f'PulseAudio connection still busy after {self.lock_timeout}s')
+        try:
+            pulse = self._get()
+            self._uses += 1
+            try:
+                yield pulse
+            except pulsectl.PulseDisconnected:
+                self._drop()
+                raise
+        finally:
+            self._lock.release()
+
+    def call(self, fn: Callable[[pulsectl.Pulse], T]) -> T:
+        """
+        Runs `fn` with the connection, once more on a new connection if it was lost,
+        typically because the server restarted since the last call.
+        """
+        try:
+            with self.use() as pulse:
+                return fn(pulse)
+        except pulsectl.PulseDisconnected as e:
+            logger.warning(f"PulseAudio connection lost, reconnecting: {e}")
+            self._reconnects += 1
+            with self.use() as pulse:
+                return fn(pulse)
+
+    def close(self) -> None:
+        with self._lock:
+            self._drop()
+
+    def stats(self) -> dict:
+        return {
+            'connected': self._pulse is not None and bool(self._pulse.connected),
+            'connects': self._connects,
+            'reconnects': self._reconnects,
+            'uses': self._uses,
+            # Calls that did not need to open a connection
+            'reused': max(0, self._uses - self._connects),
+        }
+
+
+pulse_connection = PulseAudioConnection('opencinema')
@@ -0,0 +1,124 @@
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import pulsectl
+from django.conf import settings
+from django.db import close_old_connections
+
+from api.tasks.audio_device_discovery import update_known_devices, deactivate_known_devices, \
+    reconcile_backend_devices
+from core.audio.audio_device import AudioDevice
+from core.audio.audio_device_watcher import AudioDeviceWatcher
+from plugin.pulseaudio.audio import pulse_audio_introspection as introspection
+
+if TYPE_CHECKING:
+    from plugin.pulseaudio.audio.backend import PulseAudioBackend
+
+logger = logging.getLogger(__name__)
+
+
+class PulseAudioDeviceWatcher(AudioDeviceWatcher):
+    """
+    Subscribes to the sink and source events of PulseAudio and applies them to the known devices.
+
+    The callbacks of pulsectl cannot query the server, so events are queued and the listening loop is
+    stopped to process them. Change events are frequent (volume, mute...), a device is only written
+    when its description actually changed.
+    """
+
+    def __init__(self, backend: 'PulseAudioBackend', reconcile_interval: float | None = None,
+                 retry_delay: float = 5.0):
+        self.backend = backend
+        self.reconcile_interval = reconcile_interval or getattr(settings, 'AUDIO_DEVICE_RECONCILE_INTERVAL', 300)
+        self.retry_delay = retry_delay
+        self._events: list[tuple[str, str, int]] = []
+        # (facility, index) -> last known device, used to resolve removals and skip no-op changes
+        self._devices: dict[tuple[str, int], AudioDevice] = {}
+
+    def run(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            try:
+                with pulsectl.Pulse('device-watcher') as pulse:
+                    self._watch(pulse, stop)
+            except pulsectl.PulseError as e:
+                logger.warning(f"PulseAudio device watcher disconnected, retrying in {self.retry_delay}s: {e}")
+            except Exception as e:
+                logger.exception(f"PulseAudio device watcher failed, retrying in {self.retry_delay}s: {e}")
+            finally:
+                close_old_connections()
+            stop.wait(self.retry_delay)
+
+    def _watch(self, pulse: pulsectl.Pulse, stop: threading.Event) -> None:
+        self._reconcile(pulse)
+        next_reconcile = time.monotonic() + self.reconcile_interval
+
+        pulse.event_mask_set('sink', 'source')
+        pulse.event_callback_set(self._on_event)
+        logger.info("Watching PulseAudio devices")
+        while not stop.is_set():
+            # Wake up regularly to notice the stop request, this costs nothing when idle
+            pulse.event_listen(timeout=min(1.0, max(0.0, next_reconcile - time.monotonic())))
+            if self._events:
+                events, self._events = self._events, []
+                self._apply(pulse, events)
+            if time.monotonic() >= next_reconcile:
+                self._reconcile(pulse)
+                next_reconcile = time.monotonic() + self.reconcile_interval
+
+    def _on_event(self, event) -> None:
+        self._events.append((str(event.facility), str(event.t), event.index))
+        raise pulsectl.PulseLoopStop
+
+    def _reconcile(self, pulse: pulsectl.Pulse) -> None:
+        """
+        Full synchronization of the known devices, on start and periodically in case an event was missed.
+        """
+        devices = {}
+        for source in introspection.source_list(pulse):
+            devices[('source', source.index)] = self.backend.source_to_device(source)
+        for sink in introspection.sink_list(pulse):
+            devices[('sink', sink.index)] = self.backend.sink_to_device(sink)
+        self._devices = devices
+        reconcile_backend_devices(self.backend.name, list(devices.values()))
+        logger.debug(f"Reconciled {len(devices)} PulseAudio devices")
+
+    def _fetch(self, pulse: pulsectl.Pulse, facility: str, index: int) -> AudioDevice | None:
+        try:
+            if facility == 'sink':
+                return self.backend.sink_to_device(introspection.sink_info(pulse, index))
+            return self.backend.source_to_device(introspection.source_info(pulse, index))
+        except pulsectl.PulseIndexError:
+            # Removed before we could read it, its remove event follows
+            return None
+
+    def _apply(self, pulse: pulsectl.Pulse, events: list[tuple[str, str, int]]) -> None:
+        # Only the last event of each device matters
+        latest: dict[tuple[str, int], str] = {}
+        for facility, event_type, index in events:
+            latest[(facility, index)] = event_type
+
+        updated: list[AudioDevice] = []
+        removed: list[str] = []
+        for (facility, index), event_type in latest.items():
+            previous = self._devices.get((facility, index))
+            device = None if event_type == 'remove' else self._fetch(pulse, facility, index)
+            if device is None:
+                self._devices.pop((facility, index), None)
+                if previous is not None:
+                    removed.append(previous.name)
+                continue
+            self._devices[(facility, index)] = device
+            if previous is None or str(previous) != str(device) or previous.nice_name != device.nice_name:
+                updated.append(device)
+
+        # A device that was removed then re-created under another index is still there
+        names = {device.name for device in self._devices.values()}
+        removed = [name for name in removed if name not in names]
+
+        if updated:
+            update_known_devices(updated)
+        if removed:
+            deactivate_known_devices(self.backend.name, removed)
+        logger.debug(f"Applied {len(events)} PulseAudio events: {len(updated)} updated, {len(removed)} removed")
@@ -0,0 +1,91 @@
+"""
+Sink and source introspection with correct sample specs.
+
+pulsectl keeps the `sample_spec` of an info as a ctypes view on the memory of the callback, which
+libpulse reuses once the callback returns: in a listing, every entry ends up with a garbage spec.
+The info classes below copy the spec while the memory is still valid, so a single listing per
+object type is enough instead of one extra lookup per device.
+
+The calls are built from private internals of pulsectl, its version is pinned in the requirements and
+tests/test_pulse_audio_introspection.py checks that they are still there.
+"""
+import logging
+from typing import NamedTuple
+
+import pulsectl
+
+logger = logging.getLogger(__name__)
+
+
+class PulseSampleSpec(NamedTuple):
+    format: int
+    rate: int
+    channels: int
+
+
+def _copy_sample_spec(info, struct) -> None:
+    spec = struct.sample_spec
+    info.sample_spec = PulseSampleSpec(spec.format, spec.rate, spec.channels)
+
+
+class PulseSinkSpecInfo(pulsectl.PulseSinkInfo):
+
+    def _init_from_struct(self, struct):
+        super()._init_from_struct(struct)
+        _copy_sample_spec(self, struct)
+
+
+class PulseSourceSpecInfo(pulsectl.PulseSourceInfo):
+
+    def _init_from_struct(self, struct):
+        super()._init_from_struct(struct)
+        _copy_sample_spec(self, struct)
+
+
+def _build_getters() -> dict | None:
+    """
+    Builds the introspection calls from the private factory of pulsectl.
+    Returns None if it is not available, the lookup per device is then used.
+    """
+    try:
+        from pulsectl import _pulsectl as c
+        factory = pulsectl.Pulse._pulse_get_list
+        return {
+            'sink_list': factory(c.PA_SINK_INFO_CB_T, c.pa.context_get_sink_info_list, PulseSinkSpecInfo),
+            'sink_info': factory(c.PA_SINK_INFO_CB_T, c.pa.context_get_sink_info_by_index, PulseSinkSpecInfo),
+            'source_list': factory(c.PA_SOURCE_INFO_CB_T, c.pa.context_get_source_info_list, PulseSourceSpecInfo),
+            'source_info': factory(c.PA_SOURCE_INFO_CB_T, c.pa.context_get_source_info_by_index,
+                                   PulseSourceSpecInfo),
+        }
+    except Exception as e:
+        logger.warning(f"pulsectl introspection is not available, falling back on a lookup per device: {e}")
+        return None
+
+
+_getters = _build_getters()
+
+
+def sink_list(pulse: pulsectl.Pulse) -> list:
+    if _getters is None:
+        return [pulse.get_sink_by_name(sink.name) for sink in pulse.sink_list()]
+    return _getters['sink_list'](pulse)
+
+
+def source_list(pulse: pulsectl.Pulse) -> list:
+    if _getters is None:
+        return [pulse.get_source_by_name(source.name) for source in pulse.source_list()]
+    return _getters['source_list'](pulse)
+
+
+def sink_info(pulse: pulsectl.Pulse, index: int):
+    """:raises pulsectl.PulseIndexError: If there is no sink with this index."""
+    if _getters is None:
+        return pulse.get_sink_by_name(pulse.sink_info(index).name)
+    return _getters['sink_info'](pulse, index)
+
+
+def source_info(pulse: pulsectl.Pulse, index: int):
+    """:raises pulsectl.PulseIndexError: If there is no source with this index."""
+    if _getters is None:
+        return pulse.get_source_by_name(pulse.source_info(index).name)
+    return _getters['source_info'](pulse, index)
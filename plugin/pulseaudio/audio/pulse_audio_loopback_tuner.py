@@ -0,0 +1,120 @@
+import logging
+import time
+from typing import Callable, NamedTuple
+
+import pulsectl
+
+from plugin.pulseaudio.audio.pulse_audio_connection import pulse_connection
+from plugin.pulseaudio.models.pulse_audio_created_device import PulseAudioCreatedModule
+
+logger = logging.getLogger(__name__)
+
+
+class LoopbackMeasure(NamedTuple):
+    """Latency of a loopback sampled over a window, in milliseconds."""
+    samples: int
+    min_latency: float
+    max_latency: float
+    # Samples where the buffer of the sink input was empty
+    underruns: int
+
+    def to_dict(self) -> dict:
+        return self._asdict()
+
+
+def _sample(pulse: pulsectl.Pulse, module_id: int) -> tuple[float, bool] | None:
+    """
+    :return: The end to end latency of the loopback and whether its sink input buffer is empty,
+        None if its streams are not there yet.
+    """
+    sink_input = next((i for i in pulse.sink_input_list() if i.owner_module == module_id), None)
+    source_output = next((o for o in pulse.source_output_list() if o.owner_module == module_id), None)
+    if sink_input is None or source_output is None:
+        return None
+    latency = sink_input.buffer_usec + sink_input.sink_usec + source_output.buffer_usec + source_output.source_usec
+    return latency / 1000, sink_input.buffer_usec == 0
+
+
+def measure(module: PulseAudioCreatedModule, window: float, interval: float = 0.1) -> LoopbackMeasure | None:
+    """
+    Samples the latency of a loopback module during `window` seconds.
+
+    :return: None if the streams of the loopback could not be found.
+    """
+    latencies = []
+    underruns = 0
+    end = time.monotonic() + window
+    while time.monotonic() < end:
+        sample = pulse_connection.call(lambda p: _sample(p, module.module_id))
+        if sample is not None:
+            latencies.append(sample[0])
+            underruns += sample[1]
+        time.sleep(interval)
+    if not latencies:
+        return None
+    return LoopbackMeasure(len(latencies), min(latencies), max(latencies), underruns)
+
+
+class LoopbackTuner:
+    """
+    Lowers the latency target of a loopback step by step, until the loopback stops being stable:
+    its sink input runs dry, or its latency drifts above the target, which is what module-loopback
+    does after underruns. The module is loaded again for each step, the last stable target is kept.
+    """
+
+    def __init__(self, load: Callable[[int], PulseAudioCreatedModule],
+                 unload: Callable[[PulseAudioCreatedModule], None], min_latency: int = 10, step: float = 0.75,
+                 settle_time: float = 1.0, window: float = 1.0, tolerance: float = 0.5, budget: float = 15.0):
+        self.load = load
+        self.unload = unload
+        self.min_latency = min_latency
+        self.step = step
+        # The loopback needs some time to fill its buffers after being loaded
+        self.settle_time = settle_time
+        self.window = window
+        # Measured latencies up to target * (1 + tolerance) are considered stable
+        self.tolerance = tolerance
+        self.budget = budget
+
+    def is_stable(self, module: PulseAudioCreatedModule, latency: int) -> bool:
+        time.sleep(self.settle_time)
+        result = measure(module, self.window)
+        logger.debug(f"Loopback module {module.module_id} at {latency}ms: {result}")
+        return (result is not None and result.underruns == 0
+                and result.max_latency <= latency * (1 + self.tolerance))
+
+    def tune(self, latency: int) -> tuple[PulseAudioCreatedModule, int]:
+        """
+        Loads the loopback at `latency` and lowers it while it is stable.
+
+        :return: The loaded module and its latency target.
+        """
+        deadline = time.monotonic() + self.budget
+        module = self.load(latency)
+        try:
+            if not self.is_stable(module, latency):
+                logger.warning(f"Loopback module {module.module_id} is not stable at {latency}ms, not tuning it")
+                return module, latency
+
+            while time.monotonic() + self.settle_time + self.window < deadline:
+                candidate = max(self.min_latency, int(latency * self.step))
+                if candidate >= latency:
+                    break
+                self.unload(module)
+                module = None
+                module = self.load(candidate)
+                if self.is_stable(module, candidate):
+                    latency = candidate
+                    continue
+                self.unload(module)
+                module = None
+                module = self.load(latency)
+                break
+        except Exception:
+            # The node has no state yet, unapply could not unload the module
+            if module is not None:
+                self.unload(module)
+            raise
+
+        logger.info(f"Loopback module {module.module_id} tuned to {latency}ms")
+        return module, latency
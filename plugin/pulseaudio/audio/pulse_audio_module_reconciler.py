@@ -0,0 +1,186 @@
+import logging
+import re
+from typing import NamedTuple
+
+import pulsectl
+from django.db import transaction
+
+from api.models.audio.audio_pipeline import AudioPipeline
+from core.audio.pipeline.audio_pipeline_job_lock import pipeline_lock
+from core.audio.pipeline.pipeline_lock_timeout_exception import PipelineLockTimeoutException
+from plugin.pulseaudio.audio.pulse_audio_connection import pulse_connection
+from plugin.pulseaudio.models.pulse_audio_created_device import PulseAudioCreatedModule
+from plugin.pulseaudio.models.pulse_audio_pipe_node_state import PulseAudioPipeNodeState
+from plugin.pulseaudio.models.pulse_audio_rtp_node_state import PulseAudioRtpNodeState
+from plugin.pulseaudio.models.pulse_audio_tunnel_node_state import PulseAudioTunnelNodeState
+
+logger = logging.getLogger(__name__)
+
+# Set by the node managers on the modules they load, as <pipeline id>_<node id>. The RTP modules are
+# recognized from the name of their null sink, opencinema_rtp_<pipeline id>_<node id>
+_OPENCINEMA_ID = re.compile(r'opencinema(?:\.id=|_rtp_)(\d+)_(\d+)')
+
+# Modules loaded by the node managers, only those are unloaded when no row references them
+MANAGED_MODULES = ('module-loopback', 'module-tunnel-sink', 'module-tunnel-source', 'module-null-sink',
+                   'module-rtp-send', 'module-rtp-recv')
+
+STATE_MODELS = (PulseAudioPipeNodeState, PulseAudioTunnelNodeState, PulseAudioRtpNodeState)
+
+# Fields of the node states referencing the modules they loaded
+_STATE_MODULE_FIELDS = {
+    PulseAudioPipeNodeState: ('module',),
+    PulseAudioTunnelNodeState: ('module',),
+    PulseAudioRtpNodeState: ('module', 'sink_module'),
+}
+
+
+class ModuleReconcileReport(NamedTuple):
+    # Managed modules loaded in the sound server
+    loaded: int = 0
+    kept: int = 0
+    # Indexes of the modules that were (or would be, in a dry run) unloaded
+    unloaded: tuple[int, ...] = ()
+    # Node states and module rows whose module is no longer loaded
+    pruned_states: int = 0
+    pruned_modules: int = 0
+    # Pipelines that were skipped because a job is running on them
+    busy_pipelines: tuple[int, ...] = ()
+    errors: tuple[str, ...] = ()
+    dry_run: bool = False
+
+    def to_dict(self) -> dict:
+        return self._asdict()
+
+
+def _state_modules(state) -> list[PulseAudioCreatedModule]:
+    return [getattr(state, field) for field in _STATE_MODULE_FIELDS[type(state)]]
+
+
+def _pipeline_of(module: pulsectl.PulseModuleInfo) -> int | None:
+    match = _OPENCINEMA_ID.search(module.argument or '')
+    return int(match.group(1)) if match is not None else None
+
+
+def _list_modules() -> dict[int, pulsectl.PulseModuleInfo]:
+    return {module.index: module for module in pulse_connection.call(lambda p: p.module_list())
+            if module.name in MANAGED_MODULES}
+
+
+def _read_states(pipeline_id: int | None = None) -> list:
+    states = []
+    for model in STATE_MODELS:
+        query = model.objects.select_related('node', *_STATE_MODULE_FIELDS[model])
+        if pipeline_id is not None:
+            query = query.filter(node__pipeline_id=pipeline_id)
+        states.extend(query)
+    return states
+
+
+def _unload(indexes: set[int], errors: list[str]) -> list[int]:
+    unloaded: list[int] = []
+
+    def unload(pulse: pulsectl.Pulse) -> None:
+        # Most recent first, modules such as module-rtp-send depend on a module loaded before them
+        for index in sorted(indexes, reverse=True):
+            try:
+                pulse.module_unload(index)
+                unloaded.append(index)
+            except pulsectl.PulseError as e:
+                errors.append(f'Failed to unload module {index}: {e}')
+    if indexes:
+        pulse_connection.call(unload)
+    return unloaded
+
+
+def _reconcile_pipeline(pipeline_id: int, dry_run: bool, errors: list[str]) -> tuple[list[int], list]:
+    """
+    Unloads the orphaned modules of a pipeline and deletes its stale states, the pipeline lock must be held.
+    The rows of the modules are pruned by the caller.
+    Both the modules and the states are read again, a job may have changed them since the first pass.
+
+    :return: The unloaded module indexes and the deleted states.
+    """
+    modules = {index: module for index, module in _list_modules().items() if _pipeline_of(module) == pipeline_id}
+    states = _read_states(pipeline_id)
+    referenced = {module.module_id for state in states for module in _state_modules(state)}
+
+    stale = [state for state in states
+             if any(module.module_id not in modules for module in _state_modules(state))]
+    # A state is stale as soon as one of its modules is gone, the others are unloaded with it
+    to_unload = {index for index in modules if index not in referenced}
+    to_unload |= {module.module_id for state in stale for module in _state_modules(state) if module.module_id in modules}
+    if dry_run:
+        return sorted(to_unload, reverse=True), stale
+
+    unloaded = _unload(to_unload, errors)
+    with transaction.atomic():
+        for model in STATE_MODELS:
+            model.objects.filter(id__in=[state.id for state in stale if isinstance(state, model)]).delete()
+        if stale:
+            AudioPipeline.objects.filter(id=pipeline_id).update(stale=True)
+    return unloaded, stale
+
+
+def reconcile_modules(dry_run: bool = False, lock_timeout: float = 5.0) -> ModuleReconcileReport:
+    """
+    Brings the PulseAudio modules and the node states back in sync, after a worker crashed in the middle
+    of an apply for example:
+    - the managed modules that no node state references are unloaded,
+    - the node states and module rows whose module is no longer loaded are deleted, their pipeline is marked
+      stale as it is no longer applied as recorded.
+
+    A first pass lists the loaded modules in one call to find the pipelines that need to be reconciled.
+    Each of them is then reconciled while its lock is held, those with a running job are skipped.
+    """
+    # Read before the modules are listed, a row created afterwards is never taken for a leftover
+    rows = {row.module_id: row for row in PulseAudioCreatedModule.objects.all()}
+    modules = _list_modules()
+    states = _read_states()
+    referenced = {module.module_id for state in states for module in _state_modules(state)}
+
+    # Modules and states grouped by pipeline, None for the modules we cannot attribute
+    by_pipeline: dict[int | None, tuple[list, list]] = {}
+    for index, module in modules.items():
+        by_pipeline.setdefault(_pipeline_of(module), ([], []))[0].append(module)
+    for state in states:
+        by_pipeline.setdefault(state.node.pipeline_id, ([], []))[1].append(state)
+
+    unloaded: list[int] = []
+    stale_states = []
+    busy: list[int] = []
+    errors: list[str] = []
+    for pipeline_id, (pipeline_modules, pipeline_states) in by_pipeline.items():
+        has_orphans = any(module.index not in referenced for module in pipeline_modules)
+        has_stale = any(module.module_id not in modules for state in pipeline_states for module in _state_modules(state))
+        if not has_orphans and not has_stale:
+            continue
+        if pipeline_id is None:
+            # Modules loaded before the opencinema.id property, only those we created are ours
+            orphans = {module.index for module in pipeline_modules if module.index not in referenced and module.index in rows}
+            unloaded.extend(sorted(orphans, reverse=True) if dry_run else _unload(orphans, errors))
+            continue
+        try:
+            with pipeline_lock(pipeline_id, blocking_timeout=lock_timeout):
+                pipeline_unloaded, pipeline_stale = _reconcile_pipeline(pipeline_id, dry_run, errors)
+        except PipelineLockTimeoutException:
+            busy.append(pipeline_id)
+            continue
+        unloaded.extend(pipeline_unloaded)
+        stale_states.extend(pipeline_stale)
+
+    # Rows of the modules that were gone when listed unless a state still references them, module indexes
+    # are never reused. Then the rows of the unloaded modules and of the deleted states.
+    gone = set(rows) - set(modules) - referenced
+    gone |= set(unloaded) | {module.module_id for state in stale_states for module in _state_modules(state)}
+    if dry_run:
+        pruned_modules = len(gone)
+    else:
+        _, deleted = PulseAudioCreatedModule.objects.filter(module_id__in=gone).delete()
+        pruned_modules = deleted.get(PulseAudioCreatedModule._meta.label, 0)
+
+    report = ModuleReconcileReport(len(modules), len(modules) - len(unloaded), tuple(unloaded), len(stale_states),
+                                   pruned_modules, tuple(busy), tuple(errors), dry_run)
+    logger.info(f"PulseAudio modules reconciled: {len(modules)} loaded, {len(unloaded)} unloaded, "
+                f"{len(stale_states)} stale states and {pruned_modules} module rows pruned"
+                f"{', dry run' if dry_run else ''}")
+    return report
@@ -1,6 +1,8 @@
 from typing import Any
 
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
+from django.utils import timezone
 
 from api.models import KnownAudioDevice
 from api.models.audio.pipeline.audio_pipeline_node_slot import AudioPipelineNodeSlot, SlotType, SlotDirection
@@ -8,6 +10,8 @@ from core.audio.pipeline.audio_pipeline_graph import AudioPipelineGraphNode, Aud
 from core.audio.pipeline.audio_pipeline_node_manager import AudioPipelineNodeManager
 from core.audio.pipeline.validation_result import ValidationResultNode
 from plugin.pulseaudio.audio.backend import PulseAudioBackend
+from plugin.pulseaudio.audio.pulse_audio_loopback_tuner import LoopbackTuner
+from plugin.pulseaudio.models.pulse_audio_created_device import PulseAudioCreatedModule
 from plugin.pulseaudio.models.pulse_audio_pipe_node import PulseAudioPipeNode
 from plugin.pulseaudio.models.pulse_audio_pipe_node_state import PulseAudioPipeNodeState
 
@@ -25,6 +29,24 @@ class PulseAudioPipeNodeManager(AudioPipelineNodeManager):
                                   node=self.node)
         ]
 
+    def _loopback_args(self, source: str, sink: str, latency_msec: int) -> list[str]:
+        internal_id = f'{self.node.pipeline_id}_{self.node.id}'
+        args = [
+            f'source={source}',
+            f'sink={sink}',
+            f'latency_msec={latency_msec}',
+            f'sink_input_properties=opencinema.id={internal_id}',
+            f'source_output_properties=opencinema.id={internal_id}',
+        ]
+        if self.node.adjust_time is not None: args.append(f'adjust_time={self.node.adjust_time}')
+        if self.node.max_latency_msec is not None: args.append(f'max_latency_msec={self.node.max_latency_msec}')
+        if self.node.fast_adjust_threshold_msec is not None:
+            args.append(f'fast_adjust_threshold_msec={self.node.fast_adjust_threshold_msec}')
+        return args
+
+    def _is_tuned(self) -> bool:
+        return self.node.tuned_latency_msec is not None and self.node.tuned_from_msec == self.node.latency_msec
+
     def apply(self, graph_node: AudioPipelineGraphNode, graph: AudioPipelineGraph):
         previous_node = graph_node.incoming[0].from_node.data
         previous_node_slot = graph_node.incoming[0].data.incoming_slot
@@ -35,12 +57,25 @@ class PulseAudioPipeNodeManager(AudioPipelineNodeManager):
         next_device: KnownAudioDevice = next_node.get_manager().get_slot_data(next_node_slot.name)
 
         kind = f'module-loopback'
-        args = [
-            f'source={previous_device.name}',
-            f'sink={next_device.name}',
-        ]
+        backend = PulseAudioBackend()
+
+        def load(latency_msec: int) -> PulseAudioCreatedModule:
+            return backend.add_module(kind, self._loopback_args(previous_device.name, next_device.name, latency_msec))
+
+        if not self.node.auto_tune:
+            module = load(self.node.latency_msec)
+        elif self._is_tuned():
+            module = load(self.node.tuned_latency_msec)
+        else:
+            tuner = LoopbackTuner(load, backend.del_module,
+                                  min_latency=getattr(settings, 'PULSEAUDIO_LOOPBACK_MIN_LATENCY', 10),
+                                  budget=getattr(settings, 'PULSEAUDIO_LOOPBACK_TUNE_BUDGET', 15.0))
+            module, latency = tuner.tune(self.node.latency_msec)
+            self.node.tuned_latency_msec = latency
+            self.node.tuned_from_msec = self.node.latency_msec
+            self.node.tuned_at = timezone.now()
+            self.node.save(update_fields=['tuned_latency_msec', 'tuned_from_msec', 'tuned_at'])
 
-        module = PulseAudioBackend().add_module(kind, args)
         PulseAudioPipeNodeState.objects.create(node=self.node, module=module)
 
     def unapply(self, graph_node: AudioPipelineGraphNode, graph: AudioPipelineGraph):
@@ -54,8 +89,16 @@ class PulseAudioPipeNodeManager(AudioPipelineNodeManager):
     def validate(self, graph_node: AudioPipelineGraphNode, graph: AudioPipelineGraph) -> ValidationResultNode | None:
         field_errors = {}
 
+        if self.node.latency_msec is None or self.node.latency_msec <= 0:
+            field_errors['latency_msec'] = 'Latency must be a positive number of milliseconds'
+        if self.node.adjust_time is not None and self.node.adjust_time < 0:
+            field_errors['adjust_time'] = 'Adjust time must not be negative'
+        if self.node.max_latency_msec is not None and self.node.max_latency_msec < (self.node.latency_msec or 0):
+            field_errors['max_latency_msec'] = 'Max latency must not be lower than the latency'
+        if self.node.fast_adjust_threshold_msec is not None and self.node.fast_adjust_threshold_msec <= 0:
+            field_errors['fast_adjust_threshold_msec'] = 'Fast adjust threshold must be a positive number of milliseconds'
+
         return ValidationResultNode(self.node.id, [], field_errors, {}) if len(field_errors) > 0 else None
 
     def get_slot_data(self, slot_name: str) -> Any:
         pass
-
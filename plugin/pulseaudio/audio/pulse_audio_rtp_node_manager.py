@@ -0,0 +1,146 @@
+import ipaddress
+from typing import Any
+
+from django.core.exceptions import ObjectDoesNotExist
+
+from api.models import KnownAudioDevice
+from api.models.audio.pipeline.audio_pipeline_node_slot import AudioPipelineNodeSlot, SlotType, SlotDirection
+from core.audio.pipeline.audio_pipeline_graph import AudioPipelineGraphNode, AudioPipelineGraph
+from core.audio.pipeline.audio_pipeline_node_manager import AudioPipelineNodeManager
+from core.audio.pipeline.validation_result import ValidationResultNode
+from plugin.pulseaudio.audio.backend import PulseAudioBackend
+from plugin.pulseaudio.models.pulse_audio_rtp_node import PulseAudioRtpNode
+from plugin.pulseaudio.models.pulse_audio_rtp_node_state import PulseAudioRtpNodeState
+
+
+def _is_multicast(address: str | None) -> bool:
+    try:
+        return ipaddress.ip_address(address).is_multicast
+    except ValueError:
+        return False
+
+
+class PulseAudioRtpNodeManager(AudioPipelineNodeManager):
+    """
+    A sender plays into a null sink whose monitor is sent by module-rtp-send, it is exposed as an output device.
+    A receiver plays the streams received by module-rtp-recv into a null sink, whose monitor is exposed as
+    an input device. Both ends can run on the same host when the sender has `loop` enabled.
+
+    module-rtp-recv cannot pick a stream: it plays every stream announced on its SAP address, whatever the
+    group it is sent to, and module-rtp-send always announces on 224.0.0.56. The senders of a network are
+    mixed by every receiver, streams are kept apart by running a single sender per network.
+    """
+
+    def __init__(self, node):
+        self.node: PulseAudioRtpNode = node
+
+    def _mode(self) -> str:
+        return (self.node.mode or '').lower()
+
+    def _sink_name(self) -> str:
+        return f'opencinema_rtp_{self.node.pipeline_id}_{self.node.id}'
+
+    def get_dynamic_slots_schematics(self) -> list[AudioPipelineNodeSlot]:
+        if self._mode() == 'receive':
+            return [AudioPipelineNodeSlot(name='RTP Receiver', type=SlotType.DEVICE_AUDIO_INPUT, direction=SlotDirection.OUTPUT, node=self.node)]
+        elif self._mode() == 'send':
+            return [AudioPipelineNodeSlot(name='RTP Sender', type=SlotType.DEVICE_AUDIO_OUTPUT, direction=SlotDirection.INPUT, node=self.node)]
+        return []
+
+    def _sink_args(self) -> list[str]:
+        name = self._sink_name()
+        args = [
+            f'sink_name={name}',
+            f'sink_properties=opencinema.id={self.node.pipeline_id}_{self.node.id}',
+        ]
+        if self.node.rate is not None: args.append(f'rate={self.node.rate}')
+        if self.node.channels is not None: args.append(f'channels={self.node.channels}')
+        return args
+
+    def _send_args(self) -> list[str]:
+        args = [
+            f'source={self._sink_name()}.monitor',
+            f'destination_ip={self.node.destination_ip}',
+            f'loop={int(self.node.loop)}',
+        ]
+        if self.node.port is not None: args.append(f'port={self.node.port}')
+        if self.node.ttl is not None: args.append(f'ttl={self.node.ttl}')
+        if self.node.rate is not None: args.append(f'rate={self.node.rate}')
+        if self.node.channels is not None: args.append(f'channels={self.node.channels}')
+        return args
+
+    def _recv_args(self) -> list[str]:
+        args = [f'sink={self._sink_name()}']
+        if self.node.sap_address is not None and self.node.sap_address != '': args.append(f'sap_address={self.node.sap_address}')
+        if self.node.latency_msec is not None: args.append(f'latency_msec={self.node.latency_msec}')
+        return args
+
+    def apply(self, graph_node: AudioPipelineGraphNode, graph: AudioPipelineGraph):
+        mode = self._mode()
+        name = self._sink_name()
+
+        backend = PulseAudioBackend()
+        sink_module = backend.add_module('module-null-sink', self._sink_args())
+        module = None
+        try:
+            if mode == 'send':
+                module = backend.add_module('module-rtp-send', self._send_args())
+                device = backend.get_sink(name)
+            elif mode == 'receive':
+                module = backend.add_module('module-rtp-recv', self._recv_args())
+                device = backend.get_source(f'{name}.monitor')
+            else:
+                raise ValueError(f'Invalid node mode: {self.node.mode}')
+            known_device, created = KnownAudioDevice.objects.update_or_create(
+                backend=device.backend.name,
+                name=device.name,
+                defaults={
+                    'device_type': device.device_type.name,
+                    'format': device.device_format.name,
+                    'sample_rate': device.sample_rate,
+                    'channels': device.channels,
+                    'active': True,
+                }
+            )
+            PulseAudioRtpNodeState.objects.create(node=self.node, module=module, sink_module=sink_module,
+                                                  device=known_device)
+        except Exception:
+            # A rollback of the transaction would drop the rows but leave the modules loaded, the RTP module
+            # uses the null sink so it is unloaded first
+            if module is not None:
+                backend.del_module(module)
+            backend.del_module(sink_module)
+            raise
+
+    def unapply(self, graph_node: AudioPipelineGraphNode, graph: AudioPipelineGraph):
+        try:
+            state = self.node.pulseaudiortpnodestate
+        except ObjectDoesNotExist:
+            return
+        state.delete()
+        state.device.delete()
+        backend = PulseAudioBackend()
+        # The RTP module uses the null sink, it is unloaded first
+        backend.del_module(state.module)
+        backend.del_module(state.sink_module)
+
+    def validate(self, graph_node: AudioPipelineGraphNode, graph: AudioPipelineGraph) -> ValidationResultNode | None:
+        field_errors = {}
+
+        if self.node.mode is None or self.node.mode == '':
+            field_errors['mode'] = 'Mode must be specified'
+        if self._mode() == 'send' and not _is_multicast(self.node.destination_ip):
+            field_errors['destination_ip'] = 'Destination must be a multicast address when mode is send'
+        if self.node.port is not None and not 0 < self.node.port < 65536:
+            field_errors['port'] = 'Port must be between 1 and 65535'
+        if self.node.ttl is not None and not 0 < self.node.ttl < 256:
+            field_errors['ttl'] = 'TTL must be between 1 and 255'
+        if self.node.sap_address is not None and self.node.sap_address != '' and not _is_multicast(self.node.sap_address):
+            field_errors['sap_address'] = 'SAP address must be a multicast address'
+        if self.node.latency_msec is not None and self.node.latency_msec <= 0:
+            field_errors['latency_msec'] = 'Latency must be a positive number of milliseconds'
+
+        return ValidationResultNode(self.node.id, [], field_errors, {}) if len(field_errors) > 0 else None
+
+    def get_slot_data(self, slot_name: str) -> Any:
+        return self.node.pulseaudiortpnodestate.device
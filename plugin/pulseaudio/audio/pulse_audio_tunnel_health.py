@@ -0,0 +1,182 @@
+import json
+import logging
+import os
+import time
+from typing import NamedTuple
+
+from django.conf import settings
+
+from core.audio.pipeline.audio_pipeline_job_stream import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class TunnelHealthSample(NamedTuple):
+    at: float
+    # Whether the tunnel module and its sink or source are loaded
+    present: bool
+    latency_usec: int | None = None
+
+    def to_dict(self) -> dict:
+        return self._asdict()
+
+
+class TunnelHealthStore:
+    """
+    Bounded series of health samples of the tunnel nodes, with their reconnect counts.
+
+    Only the monitor process writes them. They are kept in redis when it is configured, and otherwise in a file
+    per node of PULSEAUDIO_TUNNEL_HEALTH_DIR, so that the web workers can read what the monitor recorded.
+    """
+
+    def __init__(self, max_samples: int, ttl: int = 3600):
+        self.max_samples = max_samples
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(node_id: int) -> str:
+        return f'opencinema:tunnel:{node_id}:health'
+
+    @staticmethod
+    def _reconnects_key() -> str:
+        return 'opencinema:tunnel:reconnects'
+
+    @staticmethod
+    def _path(node_id: int) -> str:
+        return os.path.join(settings.PULSEAUDIO_TUNNEL_HEALTH_DIR, f'tunnel-{node_id}.json')
+
+    def _read_file(self, node_id: int) -> tuple[list[TunnelHealthSample], int]:
+        path = self._path(node_id)
+        try:
+            # Series of the nodes unapplied while no monitor was running expire on their own
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return [], 0
+            with open(path) as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return [], 0
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read tunnel health of node {node_id}: {e}")
+            return [], 0
+        return [TunnelHealthSample(*sample) for sample in data['samples']], data['reconnects']
+
+    def _write_file(self, node_id: int, samples: list[TunnelHealthSample], reconnects: int) -> None:
+        path = self._path(node_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Replaced at once, the readers never see a partial file
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as file:
+            json.dump({'samples': samples[-self.max_samples:], 'reconnects': reconnects}, file)
+        os.replace(tmp, path)
+
+    def add(self, samples: dict[int, TunnelHealthSample]) -> None:
+        client = get_redis()
+        if client is None:
+            for node_id, sample in samples.items():
+                series, reconnects = self._read_file(node_id)
+                try:
+                    self._write_file(node_id, series + [sample], reconnects)
+                except OSError as e:
+                    logger.warning(f"Failed to record tunnel health of node {node_id}: {e}")
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for node_id, sample in samples.items():
+                pipe.rpush(self._key(node_id), json.dumps(sample))
+                pipe.ltrim(self._key(node_id), -self.max_samples, -1)
+                # Series of the nodes unapplied while no monitor was running expire on their own
+                pipe.expire(self._key(node_id), self.ttl)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to record tunnel health samples: {e}")
+
+    def count_reconnect(self, node_id: int) -> None:
+        client = get_redis()
+        if client is None:
+            series, reconnects = self._read_file(node_id)
+            try:
+                self._write_file(node_id, series, reconnects + 1)
+            except OSError as e:
+                logger.warning(f"Failed to record the reconnect of tunnel node {node_id}: {e}")
+            return
+        try:
+            client.hincrby(self._reconnects_key(), str(node_id), 1)
+        except Exception as e:
+            logger.warning(f"Failed to record the reconnect of tunnel node {node_id}: {e}")
+
+    def forget(self, node_ids: set[int]) -> None:
+        """Drops the series of the nodes that are no longer applied."""
+        if not node_ids:
+            return
+        client = get_redis()
+        if client is None:
+            for node_id in node_ids:
+                try:
+                    os.remove(self._path(node_id))
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.warning(f"Failed to forget tunnel health of node {node_id}: {e}")
+            return
+        try:
+            client.delete(*[self._key(node_id) for node_id in node_ids])
+            client.hdel(self._reconnects_key(), *[str(node_id) for node_id in node_ids])
+        except Exception as e:
+            logger.warning(f"Failed to forget tunnel health of nodes {node_ids}: {e}")
+
+    def read(self, node_ids: list[int]) -> dict[int, tuple[list[TunnelHealthSample], int]]:
+        """
+        :return: The samples, oldest first, and the reconnect count of each node, in one round trip.
+        """
+        if not node_ids:
+            return {}
+        client = get_redis()
+        if client is None:
+            return {node_id: self._read_file(node_id) for node_id in node_ids}
+        try:
+            pipe = client.pipeline(transaction=False)
+            for node_id in node_ids:
+                pipe.lrange(self._key(node_id), 0, -1)
+            pipe.hmget(self._reconnects_key(), [str(node_id) for node_id in node_ids])
+            results = pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to read tunnel health: {e}")
+            return {}
+        reconnects = results[-1]
+        return {
+            node_id: ([TunnelHealthSample(*json.loads(raw)) for raw in results[i]], int(reconnects[i] or 0))
+            for i, node_id in enumerate(node_ids)
+        }
+
+
+def summarize(samples: list[TunnelHealthSample], reconnects: int) -> dict | None:
+    """Health of a tunnel from its series, None if it was never sampled."""
+    if not samples:
+        return None
+    last = samples[-1]
+    latencies = [sample.latency_usec for sample in samples if sample.latency_usec is not None]
+    down_since = None
+    for sample in reversed(samples):
+        if sample.present:
+            break
+        down_since = sample.at
+    return {
+        'alive': last.present,
+        'sampled_at': last.at,
+        'down_since': down_since,
+        'latency_ms': last.latency_usec / 1000 if last.latency_usec is not None else None,
+        'avg_latency_ms': round(sum(latencies) / len(latencies) / 1000, 3) if latencies else None,
+        'max_latency_ms': max(latencies) / 1000 if latencies else None,
+        'availability': round(sum(sample.present for sample in samples) / len(samples), 4),
+        'reconnects': reconnects,
+        'samples': len(samples),
+    }
+
+
+def tunnel_health(node_ids: list[int]) -> dict[int, dict | None]:
+    """Health summaries of tunnel nodes, see summarize. Recorded by `manage.py monitor_pulseaudio_tunnels`."""
+    return {node_id: summarize(samples, reconnects)
+            for node_id, (samples, reconnects) in tunnel_health_store.read(node_ids).items()}
+
+
+tunnel_health_store = TunnelHealthStore(getattr(settings, 'PULSEAUDIO_TUNNEL_HEALTH_SAMPLES', 120))
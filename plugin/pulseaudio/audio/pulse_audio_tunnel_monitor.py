@@ -0,0 +1,104 @@
+import logging
+import threading
+import time
+
+import pulsectl
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from core.audio.pipeline.audio_pipeline_job_lock import pipeline_lock
+from core.audio.pipeline.pipeline_lock_timeout_exception import PipelineLockTimeoutException
+from plugin.pulseaudio.audio.pulse_audio_connection import pulse_connection
+from plugin.pulseaudio.audio.pulse_audio_tunnel_health import TunnelHealthSample, tunnel_health_store
+from plugin.pulseaudio.models.pulse_audio_tunnel_node_state import PulseAudioTunnelNodeState
+
+logger = logging.getLogger(__name__)
+
+
+class TunnelMonitor:
+    """
+    Samples the tunnel nodes that are applied: whether their module and device are still loaded, and the
+    latency of their device. module-tunnel unloads itself when the remote server goes away, with
+    `auto_reapply` such a tunnel is loaded again once `reapply_after` seconds have passed since it went down.
+    """
+
+    def __init__(self, interval: float | None = None, auto_reapply: bool | None = None,
+                 reapply_after: float | None = None):
+        self.interval = interval or getattr(settings, 'PULSEAUDIO_TUNNEL_MONITOR_INTERVAL', 5.0)
+        self.auto_reapply = auto_reapply if auto_reapply is not None else \
+            getattr(settings, 'PULSEAUDIO_TUNNEL_AUTO_REAPPLY', False)
+        self.reapply_after = reapply_after if reapply_after is not None else \
+            getattr(settings, 'PULSEAUDIO_TUNNEL_REAPPLY_AFTER', 30.0)
+        self._down_since: dict[int, float] = {}
+        self._known: set[int] = set()
+
+    def run(self, stop: threading.Event) -> None:
+        logger.info(f"Monitoring PulseAudio tunnels every {self.interval}s")
+        while not stop.is_set():
+            try:
+                self.sample()
+            except pulsectl.PulseError as e:
+                logger.warning(f"Cannot sample PulseAudio tunnels: {e}")
+            except Exception as e:
+                logger.exception(f"PulseAudio tunnel monitor failed: {e}")
+            finally:
+                close_old_connections()
+            stop.wait(self.interval)
+
+    @staticmethod
+    def _read_server(pulse: pulsectl.Pulse) -> tuple[set[int], dict[str, int]]:
+        """:return: The loaded module indexes, and the latency of the sinks and sources by name."""
+        modules = {module.index for module in pulse.module_list()}
+        latencies = {sink.name: sink.latency for sink in pulse.sink_list()}
+        latencies.update({source.name: source.latency for source in pulse.source_list()})
+        return modules, latencies
+
+    def sample(self) -> None:
+        states = list(PulseAudioTunnelNodeState.objects.select_related('node', 'module', 'device'))
+        node_ids = {state.node_id for state in states}
+        tunnel_health_store.forget(self._known - node_ids)
+        self._known = node_ids
+        if not states:
+            return
+
+        modules, latencies = pulse_connection.call(self._read_server)
+        now = time.time()
+        samples = {}
+        for state in states:
+            name = state.device.name if state.device is not None else None
+            present = state.module.module_id in modules and name in latencies
+            samples[state.node_id] = TunnelHealthSample(now, present, latencies.get(name) if present else None)
+            if present:
+                self._down_since.pop(state.node_id, None)
+                continue
+            down_since = self._down_since.setdefault(state.node_id, now)
+            if self.auto_reapply and now - down_since >= self.reapply_after:
+                self._reapply(state)
+        tunnel_health_store.add(samples)
+
+    def _reapply(self, state: PulseAudioTunnelNodeState) -> None:
+        node = state.node
+        try:
+            with pipeline_lock(node.pipeline_id, blocking_timeout=0):
+                if not PulseAudioTunnelNodeState.objects.filter(id=state.id).exists():
+                    # Unapplied in the meantime
+                    return
+                # Tried again after reapply_after seconds if the server is still unreachable
+                self._down_since.pop(node.id, None)
+                try:
+                    # The module is gone, only the rows are left, unapply would fail to unload it.
+                    # They are kept if the tunnel cannot be loaded again, apply unloads the module
+                    # it loaded before failing
+                    with transaction.atomic():
+                        state.delete()
+                        state.module.delete()
+                        node.get_manager().apply(None, None)
+                except Exception as e:
+                    logger.warning(f"Failed to reapply tunnel node {node.id} to {node.server}: {e}")
+                    return
+        except PipelineLockTimeoutException:
+            # A job is running on the pipeline, it will be reapplied on the next sample if still needed
+            return
+        tunnel_health_store.count_reconnect(node.id)
+        logger.info(f"Tunnel node {node.id} to {node.server} reapplied")
+
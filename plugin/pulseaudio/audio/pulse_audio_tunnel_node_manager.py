@@ -8,6 +8,7 @@ from core.audio.pipeline.audio_pipeline_graph import AudioPipelineGraphNode, Aud
 from core.audio.pipeline.audio_pipeline_node_manager import AudioPipelineNodeManager
 from core.audio.pipeline.validation_result import ValidationResultNode
 from plugin.pulseaudio.audio.backend import PulseAudioBackend
+from plugin.pulseaudio.audio.pulse_audio_tunnel_health import tunnel_health
 from plugin.pulseaudio.models.pulse_audio_tunnel_node import PulseAudioTunnelNode
 from plugin.pulseaudio.models.pulse_audio_tunnel_node_state import PulseAudioTunnelNodeState
 
@@ -17,17 +18,20 @@ class PulseAudioTunnelNodeManager(AudioPipelineNodeManager):
     def __init__(self, node):
         self.node: PulseAudioTunnelNode = node
 
+    def _mode(self) -> str:
+        return (self.node.mode or '').lower()
+
     def get_dynamic_slots_schematics(self) -> list[AudioPipelineNodeSlot]:
-        if self.node.mode == 'SOURCE' or self.node.mode == 'source':
+        if self._mode() == 'source':
             name = self.node.source if self.node.source is not None else 'Source Name'
             return [AudioPipelineNodeSlot(name=name, type=SlotType.DEVICE_AUDIO_INPUT, direction=SlotDirection.OUTPUT, node=self.node)]
-        elif self.node.mode == 'SINK' or self.node.mode == 'sink':
+        elif self._mode() == 'sink':
             name = self.node.sink if self.node.sink is not None else 'Sink Name'
             return [AudioPipelineNodeSlot(name=name, type=SlotType.DEVICE_AUDIO_OUTPUT, direction=SlotDirection.INPUT, node=self.node)]
         return []
 
     def apply(self, graph_node: AudioPipelineGraphNode, graph: AudioPipelineGraph):
-        mode = self.node.mode.lower()
+        mode = self._mode()
         internal_id = f'{self.node.pipeline.id}_{self.node.id}'
         name = f'opencinema_tunnel_{internal_id}'
         kind = f'module-tunnel-{mode}'
@@ -42,24 +46,29 @@ class PulseAudioTunnelNodeManager(AudioPipelineNodeManager):
 
         backend = PulseAudioBackend()
         module = backend.add_module(kind, args)
-        if self.node.mode == 'SOURCE' or self.node.mode == 'source':
-            device = backend.get_source(name)
-        elif self.node.mode == 'SINK' or self.node.mode == 'sink':
-            device = backend.get_sink(name)
-        else:
-            raise ValueError(f'Invalid node mode: {self.node.mode}')
-        known_device, created = KnownAudioDevice.objects.update_or_create(
-            backend=device.backend.name,
-            name=device.name,
-            defaults={
-                'device_type': device.device_type.name,
-                'format': device.device_format.name,
-                'sample_rate': device.sample_rate,
-                'channels': device.channels,
-                'active': True,
-            }
-        )
-        PulseAudioTunnelNodeState.objects.create(node=self.node, module=module, device=known_device)
+        try:
+            if self._mode() == 'source':
+                device = backend.get_source(name)
+            elif self._mode() == 'sink':
+                device = backend.get_sink(name)
+            else:
+                raise ValueError(f'Invalid node mode: {self.node.mode}')
+            known_device, created = KnownAudioDevice.objects.update_or_create(
+                backend=device.backend.name,
+                name=device.name,
+                defaults={
+                    'device_type': device.device_type.name,
+                    'format': device.device_format.name,
+                    'sample_rate': device.sample_rate,
+                    'channels': device.channels,
+                    'active': True,
+                }
+            )
+            PulseAudioTunnelNodeState.objects.create(node=self.node, module=module, device=known_device)
+        except Exception:
+            # A rollback of the transaction would drop the rows but leave the module loaded
+            backend.del_module(module)
+            raise
 
     def unapply(self, graph_node: AudioPipelineGraphNode, graph: AudioPipelineGraph):
         try:
@@ -77,12 +86,19 @@ class PulseAudioTunnelNodeManager(AudioPipelineNodeManager):
             field_errors['server'] = 'Server must be specified'
         if self.node.mode is None or self.node.mode == '':
             field_errors['mode'] = 'Mode must be specified'
-        if self.node.mode == 'SOURCE' or self.node.mode == 'source' and self.node.source is None:
+        if self._mode() == 'source' and self.node.source is None:
             field_errors['source'] = 'Source must be specified when mode is source'
-        if self.node.mode == 'SINK' or self.node.mode == 'sink' and self.node.sink is None:
+        if self._mode() == 'sink' and self.node.sink is None:
             field_errors['sink'] = 'Sink must be specified when mode is sink'
 
         return ValidationResultNode(self.node.id, [], field_errors, {}) if len(field_errors) > 0 else None
 
+    def get_health(self) -> dict | None:
+        return tunnel_health([self.node.id]).get(self.node.id)
+
+    @classmethod
+    def get_nodes_health(cls, nodes: list) -> dict[int, dict | None]:
+        return tunnel_health([node.id for node in nodes])
+
     def get_slot_data(self, slot_name: str) -> Any:
         return self.node.pulseaudiotunnelnodestate.device
\ No newline at end of file
@@ -1,5 +1,6 @@
 from typing import TYPE_CHECKING
 
+from django.db import models
 from django.db.models import Field
 
 from api.models.audio.pipeline.audio_pipeline_processing_node import AudioPipelineProcessingNode
@@ -12,6 +13,36 @@ if TYPE_CHECKING:
 class PulseAudioPipeNode(AudioPipelineProcessingNode):
     """Represents a PulseAudio pipe node in the audio pipeline."""
 
+    latency_msec = models.IntegerField(
+        default=200,
+        help_text='The latency target of the loopback, in milliseconds'
+    )
+
+    adjust_time = models.IntegerField(
+        null=True,
+        help_text='How often the loopback adjusts its rate to keep the latency, in seconds. 0 disables it'
+    )
+
+    max_latency_msec = models.IntegerField(
+        null=True,
+        help_text='The latency the loopback may increase to after underruns, in milliseconds'
+    )
+
+    fast_adjust_threshold_msec = models.IntegerField(
+        null=True,
+        help_text='Deviation from the latency target above which the loopback jumps back to it, in milliseconds'
+    )
+
+    auto_tune = models.BooleanField(
+        default=False,
+        help_text='Lower the latency target after applying, as long as the loopback stays stable'
+    )
+
+    # Result of the last auto-tune, reused by the next applies as long as latency_msec is the same
+    tuned_latency_msec = models.IntegerField(null=True)
+    tuned_from_msec = models.IntegerField(null=True)
+    tuned_at = models.DateTimeField(null=True)
+
     class Meta:
         app_label = 'api'
 
@@ -21,4 +52,10 @@ class PulseAudioPipeNode(AudioPipelineProcessingNode):
 
     @classmethod
     def get_exposed_fields(cls) -> list[Field]:
-        return []
\ No newline at end of file
+        return [
+            cls._meta.get_field('latency_msec'),
+            cls._meta.get_field('adjust_time'),
+            cls._meta.get_field('max_latency_msec'),
+            cls._meta.get_field('fast_adjust_threshold_msec'),
+            cls._meta.get_field('auto_tune'),
+        ]
@@ -0,0 +1,90 @@
+from typing import TYPE_CHECKING
+
+from django.db import models
+from django.db.models import Field
+
+from api.models.audio.pipeline.audio_pipeline_io_node import AudioPipelineIONode
+from core.audio.pipeline.audio_pipeline_node_manager import AudioPipelineNodeManager
+
+if TYPE_CHECKING:
+    from plugin.pulseaudio.audio.pulse_audio_rtp_node_manager import PulseAudioRtpNodeManager
+
+
+class PulseAudioRtpNode(AudioPipelineIONode):
+    """
+    Represents a PulseAudio RTP node in the audio pipeline. A sender streams a local sink to a multicast group,
+    any number of receivers play it, the cost of the sender does not depend on the number of rooms.
+    A receiver plays every stream announced on its SAP address, the streams of several senders are mixed.
+    """
+
+    mode = models.CharField(
+        max_length=255,
+        null=True,
+        choices=[('SEND', 'send'), ('RECEIVE', 'receive')],
+        help_text='The mode of the node. Either send or receive'
+    )
+
+    destination_ip = models.CharField(
+        max_length=255,
+        null=True,
+        default='224.0.0.56',
+        help_text='The multicast group to send the stream to. Only available in send mode'
+    )
+
+    port = models.IntegerField(
+        null=True,
+        help_text='The port to send the stream to, picked by PulseAudio if empty. Only available in send mode'
+    )
+
+    ttl = models.IntegerField(
+        null=True,
+        help_text='The multicast TTL, 1 keeps the stream on the local network. Only available in send mode'
+    )
+
+    loop = models.BooleanField(
+        default=False,
+        help_text='Also deliver the stream to the local host, for a receiver on the same machine. Only available in send mode'
+    )
+
+    sap_address = models.CharField(
+        max_length=255,
+        null=True,
+        help_text='The address the streams are announced on, 224.0.0.56 if empty. Every stream announced there is '
+                  'played, whatever its multicast group. Only available in receive mode'
+    )
+
+    latency_msec = models.IntegerField(
+        null=True,
+        help_text='The latency of the receiver, in milliseconds. Only available in receive mode'
+    )
+
+    rate = models.IntegerField(
+        null=True,
+        help_text='The sample rate of the stream'
+    )
+
+    channels = models.IntegerField(
+        null=True,
+        help_text='The number of channels of the stream'
+    )
+
+    class Meta:
+        app_label = 'api'
+
+    @classmethod
+    def get_exposed_fields(cls) -> list[Field]:
+        return [
+            cls._meta.get_field('mode'),
+            cls._meta.get_field('destination_ip'),
+            cls._meta.get_field('port'),
+            cls._meta.get_field('ttl'),
+            cls._meta.get_field('loop'),
+            cls._meta.get_field('sap_address'),
+            cls._meta.get_field('latency_msec'),
+            cls._meta.get_field('rate'),
+            cls._meta.get_field('channels'),
+        ]
+
+    def get_manager(self) -> 'AudioPipelineNodeManager':
+        from plugin.pulseaudio.audio.pulse_audio_rtp_node_manager import PulseAudioRtpNodeManager
+        return PulseAudioRtpNodeManager(self)
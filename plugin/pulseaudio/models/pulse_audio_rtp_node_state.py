@@ -0,0 +1,20 @@
+from django.db import models
+
+from api.models import KnownAudioDevice
+from plugin.pulseaudio.models.pulse_audio_created_device import PulseAudioCreatedModule
+
+
+class PulseAudioRtpNodeState(models.Model):
+
+    node = models.OneToOneField('PulseAudioRtpNode', on_delete=models.CASCADE)
+
+    # module-rtp-send or module-rtp-recv
+    module = models.ForeignKey(PulseAudioCreatedModule, on_delete=models.CASCADE, null=False)
+
+    # The null sink the stream is sent from or received into
+    sink_module = models.ForeignKey(PulseAudioCreatedModule, on_delete=models.CASCADE, null=False, related_name='+')
+
+    device = models.ForeignKey(KnownAudioDevice, on_delete=models.RESTRICT, null=True)
+
+    class Meta:
+        app_label = 'api'
@@ -56,6 +56,10 @@ class PulseAudioTunnelNode(AudioPipelineIONode):
             cls._meta.get_field('cookie')
         ]
 
+    @classmethod
+    def get_secret_fields(cls) -> list[Field]:
+        return [cls._meta.get_field('cookie')]
+
     def get_manager(self) -> 'AudioPipelineNodeManager':
         from plugin.pulseaudio.audio.pulse_audio_tunnel_node_manager import PulseAudioTunnelNodeManager
         return PulseAudioTunnelNodeManager(self)
\ No newline at end of file
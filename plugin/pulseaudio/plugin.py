@@ -1,9 +1,19 @@
 """Counter API Plugin - provides REST endpoints for counter operations."""
 
+from django.http import JsonResponse, HttpResponse
+from django.urls import path
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
 from core.audio.audio_backend import AudioBackend
 from core.plugin_system.oc_plugin import OCPlugin
 from plugin.counter.models import CounterLog
 from plugin.pulseaudio.audio.backend import PulseAudioBackend
+from plugin.pulseaudio.audio.pulse_audio_connection import pulse_connection
+from plugin.pulseaudio.audio.pulse_audio_module_reconciler import reconcile_modules
+from plugin.pulseaudio.audio.pulse_audio_tunnel_health import tunnel_health, tunnel_health_store
+from plugin.pulseaudio.models.pulse_audio_tunnel_node_state import PulseAudioTunnelNodeState
 
 
 class PulseAudioOCPlugin(OCPlugin):
@@ -16,7 +26,57 @@ class PulseAudioOCPlugin(OCPlugin):
         return "pulseaudio"
 
     def get_urls(self):
-        return [ ]
+        return [
+            path('connection', self.get_connection, name='connection'),
+            path('modules/reconcile', self.reconcile_modules, name='reconcile_modules'),
+            path('tunnels/<int:node_id>/health', self.get_tunnel_health, name='tunnel_health'),
+            path('metrics', self.get_metrics, name='metrics'),
+        ]
+
+    def get_connection(self, request):
+        """GET /api/plugins/pulseaudio/connection - Usage of the shared PulseAudio connection of this process."""
+        return JsonResponse(pulse_connection.stats())
+
+    @method_decorator(csrf_exempt)
+    @method_decorator(require_http_methods(["GET", "POST"]))
+    def reconcile_modules(self, request):
+        """
+        GET /api/plugins/pulseaudio/modules/reconcile - Report of what a reconciliation would do.
+        POST /api/plugins/pulseaudio/modules/reconcile - Unloads the orphaned modules and prunes the stale node states.
+        """
+        return JsonResponse(reconcile_modules(dry_run=request.method == 'GET').to_dict())
+
+    def get_tunnel_health(self, request, node_id):
+        """GET /api/plugins/pulseaudio/tunnels/<node_id>/health - Health summary and samples of a tunnel node."""
+        samples, reconnects = tunnel_health_store.read([node_id]).get(node_id, ([], 0))
+        return JsonResponse({
+            'node': node_id,
+            'health': tunnel_health([node_id]).get(node_id),
+            'samples': [sample.to_dict() for sample in samples],
+        })
+
+    def get_metrics(self, request):
+        """GET /api/plugins/pulseaudio/metrics - Health of the applied tunnel nodes, in the Prometheus text format."""
+        states = list(PulseAudioTunnelNodeState.objects.select_related('node'))
+        health = tunnel_health([state.node_id for state in states])
+        lines = [
+            '# HELP opencinema_tunnel_up Whether the tunnel module and its device are loaded.',
+            '# TYPE opencinema_tunnel_up gauge',
+            '# HELP opencinema_tunnel_latency_seconds Latency of the device of the tunnel.',
+            '# TYPE opencinema_tunnel_latency_seconds gauge',
+            '# HELP opencinema_tunnel_reconnects_total Times the tunnel was reapplied after going down.',
+            '# TYPE opencinema_tunnel_reconnects_total counter',
+        ]
+        for state in states:
+            summary = health.get(state.node_id)
+            if summary is None:
+                continue
+            labels = f'pipeline="{state.node.pipeline_id}",node="{state.node_id}",server="{state.node.server}"'
+            lines.append(f'opencinema_tunnel_up{{{labels}}} {int(summary["alive"])}')
+            if summary['latency_ms'] is not None:
+                lines.append(f'opencinema_tunnel_latency_seconds{{{labels}}} {summary["latency_ms"] / 1000}')
+            lines.append(f'opencinema_tunnel_reconnects_total{{{labels}}} {summary["reconnects"]}')
+        return HttpResponse('\n'.join(lines) + '\n', content_type='text/plain; version=0.0.4')
 
     def get_audio_backend(self) -> None | AudioBackend:
         return PulseAudioBackend()
\ No newline at end of file
@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(tmp_path_factory):
+    """The jobs run on other threads, an in-memory database would lock its tables on every concurrent write."""
+    from django.conf import settings
+    settings.DATABASES['default']['TEST']['NAME'] = str(tmp_path_factory.mktemp('db') / 'benchmark.sqlite3')
@@ -0,0 +1,86 @@
+"""
+Latency from the apply request to the start of the first node, for each job executor.
+The Celery executor runs an in-process worker and needs the broker to be reachable.
+"""
+import statistics
+import threading
+import time
+
+import pytest
+
+from api.models import KnownAudioDevice, CamillaDSPPipeline
+from api.models.audio.audio_pipeline import AudioPipeline
+from api.models.audio.pipeline.audio_pipeline_apply_job import AudioPipelineApplyJob
+from core.audio.pipeline import audio_pipeline_job_executor
+from core.audio.pipeline.audio_pipeline_job_stream import FINAL_STATUSES
+from core.camilladsp import CamillaDSPAudioPipelineNode
+from core.camilladsp.camilladsp_audio_pipeline_node_manager import CamillaDSPAudioPipelineNodeManager
+
+RUNS = 20
+
+
+def _wait_for_jobs(pipeline: AudioPipeline, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while AudioPipelineApplyJob.objects.filter(pipeline=pipeline).exclude(status__in=FINAL_STATUSES).exists():
+        assert time.monotonic() < deadline, 'Jobs did not complete'
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def pipeline(transactional_db):
+    devices = [KnownAudioDevice.objects.create(backend='bench', name=name, device_type=name, format='S16LE',
+                                               sample_rate=48000, channels=2) for name in ('CAPTURE', 'PLAYBACK')]
+    camilladsp_pipeline = CamillaDSPPipeline.objects.create(name='bench', input_device=devices[0],
+                                                            output_device=devices[1], samplerate=48000)
+    pipeline = AudioPipeline.objects.create(name='bench')
+    CamillaDSPAudioPipelineNode.objects.create(pipeline=pipeline, type_name='CamillaDSPAudioPipelineNode',
+                                               camilladsp_pipeline=camilladsp_pipeline)
+    return pipeline
+
+
+@pytest.fixture
+def executor(request, settings, monkeypatch):
+    settings.PIPELINE_JOB_EXECUTOR = request.param
+    monkeypatch.setattr(audio_pipeline_job_executor, '_executor', None)
+    if request.param != 'celery':
+        yield request.param
+    else:
+        from celery.contrib.testing.worker import start_worker
+        from opencinema.celery import app
+        settings.JOB_EVENTS_REDIS_URL = settings.CELERY_BROKER_URL
+        try:
+            app.connection_for_write().ensure_connection(max_retries=1)
+        except Exception as e:
+            pytest.skip(f'Celery broker is not reachable: {e}')
+        with start_worker(app, perform_ping_check=False):
+            yield request.param
+    if isinstance(audio_pipeline_job_executor._executor, audio_pipeline_job_executor.ThreadPoolJobExecutor):
+        audio_pipeline_job_executor._executor.pool.shutdown()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('executor', ['eager', 'thread', 'celery'], indirect=True)
+def test_apply_to_first_node_latency(executor, pipeline, client, monkeypatch):
+    started = threading.Event()
+    started_at: list[float] = []
+
+    def apply(manager, graph_node, graph):
+        started_at.append(time.perf_counter())
+        started.set()
+
+    monkeypatch.setattr(CamillaDSPAudioPipelineNodeManager, 'apply', apply)
+
+    latencies = []
+    for _ in range(RUNS):
+        started.clear()
+        requested_at = time.perf_counter()
+        assert client.post(f'/api/pipelines/{pipeline.id}/apply').status_code == 200
+        assert started.wait(10), 'The first node was not started'
+        latencies.append(started_at[-1] - requested_at)
+        _wait_for_jobs(pipeline)
+        assert client.delete(f'/api/pipelines/{pipeline.id}/apply').status_code == 200
+        _wait_for_jobs(pipeline)
+
+    latencies.sort()
+    print(f'\n{executor}: median {statistics.median(latencies) * 1000:.1f}ms, '
+          f'p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f}ms, max {latencies[-1] * 1000:.1f}ms')
@@ -0,0 +1,30 @@
+"""Time and queries taken to serialize a large pipeline, as served by GET /api/pipelines/<id>."""
+import statistics
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models.audio.audio_pipeline import AudioPipeline
+from api.views.audio.pipeline.audio_pipelines import pipeline_to_json
+from pipeline_factories import make_pipeline
+
+RUNS = 20
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize('size', [10, 100, 500])
+def test_pipeline_to_json(size):
+    pipeline = make_pipeline(f'bench-{size}', size)
+
+    durations = []
+    for _ in range(RUNS):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            pipeline_to_json(AudioPipeline.objects.get(id=pipeline.id))
+            durations.append(time.perf_counter() - start)
+
+    print(f'\n{size} nodes: median {statistics.median(durations) * 1000:.1f}ms, '
+          f'max {max(durations) * 1000:.1f}ms, {len(queries)} queries')
@@ -0,0 +1,36 @@
+"""Time taken to list PulseAudio devices in a single listing, against the lookup per device it replaced."""
+import time
+
+import pytest
+
+try:
+    import pulsectl  # noqa: F401
+except (ImportError, OSError) as e:
+    pytest.skip(f'pulsectl is not usable: {e}', allow_module_level=True)
+
+from plugin.pulseaudio.audio import pulse_audio_introspection as introspection
+from plugin.pulseaudio.audio.backend import PulseAudioBackend
+from pulse_fakes import FakePulse, single_listing_getters
+
+# Round trip to a local sound server
+ROUND_TRIP = 0.0001
+
+
+def _discover(monkeypatch, getters, size: int) -> tuple[float, int]:
+    fake = FakePulse(sinks=size, sources=size, round_trip=ROUND_TRIP)
+    monkeypatch.setattr(introspection, '_getters', getters)
+    start = time.perf_counter()
+    devices = PulseAudioBackend()._list_devices(fake)
+    elapsed = time.perf_counter() - start
+    assert len(devices) == 2 * size
+    return elapsed, fake.round_trips
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('size', [10, 100, 300])
+def test_pulse_audio_discovery(monkeypatch, size):
+    single, single_trips = _discover(monkeypatch, single_listing_getters(), size)
+    lookup, lookup_trips = _discover(monkeypatch, None, size)
+    assert single_trips == 2 and lookup_trips == 2 + 2 * size
+    print(f'\n{size} sinks and sources: single listing {single * 1e3:.2f}ms ({single_trips} round trips), '
+          f'lookup per device {lookup * 1e3:.2f}ms ({lookup_trips} round trips)')
@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def no_redis(settings, tmp_path):
+    """Tests do not reach the broker, pipeline locks, job events and tunnel health go without redis."""
+    settings.JOB_EVENTS_REDIS_URL = ''
+    settings.PIPELINE_JOB_LOCK_DIR = str(tmp_path / 'locks')
+    settings.PULSEAUDIO_TUNNEL_HEALTH_DIR = str(tmp_path / 'tunnel-health')
@@ -0,0 +1,31 @@
+from api.models import KnownAudioDevice, CamillaDSPPipeline
+from api.models.audio.audio_pipeline import AudioPipeline
+from api.models.audio.pipeline.audio_pipeline_edge import AudioPipelineEdge
+from api.models.audio.pipeline.audio_pipeline_node_slot import AudioPipelineNodeSlot, SlotType, SlotDirection
+from core.camilladsp import CamillaDSPAudioPipelineNode
+from plugin.pulseaudio.models.pulse_audio_pipe_node import PulseAudioPipeNode
+
+
+def make_pipeline(name: str, size: int) -> AudioPipeline:
+    """A chain of `size` nodes, alternating between two node types."""
+    devices = [KnownAudioDevice.objects.create(backend='test', name=f'{name}-{device_type}', device_type=device_type,
+                                               format='S16LE', sample_rate=48000, channels=2)
+               for device_type in ('CAPTURE', 'PLAYBACK')]
+    camilladsp_pipeline = CamillaDSPPipeline.objects.create(name=name, input_device=devices[0],
+                                                            output_device=devices[1], samplerate=48000)
+    pipeline = AudioPipeline.objects.create(name=name)
+    previous = None
+    for i in range(size):
+        if i % 2:
+            node = PulseAudioPipeNode.objects.create(pipeline=pipeline, type_name='PulseAudioPipeNode')
+        else:
+            node = CamillaDSPAudioPipelineNode.objects.create(pipeline=pipeline, type_name='CamillaDSPAudioPipelineNode',
+                                                              camilladsp_pipeline=camilladsp_pipeline)
+        slot_in = AudioPipelineNodeSlot.objects.create(name='Input', type=SlotType.AUDIO_CONSUMER,
+                                                       direction=SlotDirection.INPUT, node=node)
+        slot_out = AudioPipelineNodeSlot.objects.create(name='Output', type=SlotType.AUDIO_PRODUCER,
+                                                        direction=SlotDirection.OUTPUT, node=node)
+        if previous is not None:
+            AudioPipelineEdge.objects.create(slot_a=previous, slot_b=slot_in)
+        previous = slot_out
+    return pipeline
@@ -0,0 +1,66 @@
+import time
+from types import SimpleNamespace
+
+import pulsectl
+
+from plugin.pulseaudio.audio.pulse_audio_introspection import PulseSampleSpec
+
+
+class FakePulse:
+    """
+    Stand-in for a PulseAudio server, with the calls of pulsectl.Pulse used by the plugin.
+    Every call counts as a round trip and takes `round_trip` seconds.
+    """
+
+    def __init__(self, sinks: int = 0, sources: int = 0, round_trip: float = 0.0):
+        self.round_trip = round_trip
+        self.round_trips = 0
+        self.modules: dict[int, SimpleNamespace] = {}
+        spec = PulseSampleSpec(3, 48000, 2)  # S16LE
+        self.sinks = [SimpleNamespace(index=i, name=f'sink_{i}', proplist={'device.string': f'sink {i}'},
+                                      sample_spec=spec, channel_count=2) for i in range(sinks)]
+        self.sources = [SimpleNamespace(index=i, name=f'source_{i}', proplist={'device.string': f'source {i}'},
+                                        sample_spec=spec, channel_count=2) for i in range(sources)]
+
+    def _call(self):
+        self.round_trips += 1
+        if self.round_trip:
+            time.sleep(self.round_trip)
+
+    def load(self, index: int, pipeline_id: int, node_id: int) -> None:
+        self.modules[index] = SimpleNamespace(index=index, name='module-loopback',
+                                              argument=f'sink_input_properties=opencinema.id={pipeline_id}_{node_id}')
+
+    def module_list(self):
+        self._call()
+        return list(self.modules.values())
+
+    def module_unload(self, index: int) -> None:
+        self._call()
+        if index not in self.modules:
+            raise pulsectl.PulseError(f'No module {index}')
+        del self.modules[index]
+
+    def sink_list(self):
+        self._call()
+        return list(self.sinks)
+
+    def source_list(self):
+        self._call()
+        return list(self.sources)
+
+    def get_sink_by_name(self, name: str):
+        self._call()
+        return next(sink for sink in self.sinks if sink.name == name)
+
+    def get_source_by_name(self, name: str):
+        self._call()
+        return next(source for source in self.sources if source.name == name)
+
+
+def single_listing_getters() -> dict:
+    """Introspection calls answering in one round trip per listing, as the native ones do."""
+    return {
+        'sink_list': lambda pulse: pulse.sink_list(),
+        'source_list': lambda pulse: pulse.source_list(),
+    }
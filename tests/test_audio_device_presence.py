@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from api.models import AudioDevicePresence, KnownAudioDevice
+from api.tasks.audio_device_discovery import deactivate_known_devices
+
+
+def _update_or_create(active: bool) -> KnownAudioDevice:
+    # As done by the tunnel and RTP node managers
+    device, _ = KnownAudioDevice.objects.update_or_create(
+        backend='pulseaudio', name='tunnel.host',
+        defaults={'device_type': 'PLAYBACK', 'format': 'S16LE', 'sample_rate': 48000, 'channels': 2,
+                  'active': active},
+    )
+    return device
+
+
+def _intervals(device: KnownAudioDevice) -> list[bool]:
+    return [presence.up_to is None for presence in AudioDevicePresence.objects.filter(device=device)]
+
+
+@pytest.mark.django_db
+def test_created_active_device_opens_an_interval():
+    device = _update_or_create(active=True)
+
+    assert _intervals(device) == [True]
+
+
+@pytest.mark.django_db
+def test_saving_an_active_device_keeps_its_interval():
+    device = _update_or_create(active=True)
+    _update_or_create(active=True)
+    device.save(update_fields=['last_seen'])
+
+    assert _intervals(device) == [True]
+
+
+@pytest.mark.django_db
+def test_reactivated_device_opens_a_new_interval():
+    device = _update_or_create(active=True)
+    assert deactivate_known_devices('pulseaudio', ['tunnel.host']) == 1
+    assert _intervals(device) == [False]
+
+    _update_or_create(active=True)
+
+    assert _intervals(device) == [False, True]
+
+
+@pytest.mark.django_db
+def test_deactivation_by_save_closes_the_interval():
+    device = _update_or_create(active=True)
+    device.active = False
+    device.save()
+
+    assert _intervals(device) == [False]
+
+
+@pytest.mark.django_db
+def test_presence_window_without_timezone(client):
+    device = _update_or_create(active=True)
+    today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    since = (today - timedelta(days=1)).strftime('%Y-%m-%dT%H:%M:%S')
+    until = (today + timedelta(days=1)).strftime('%Y-%m-%dT%H:%M:%S')
+
+    response = client.get('/api/devices/presence', {'since': since, 'until': until})
+
+    assert response.status_code == 200
+    assert [entry['id'] for entry in response.json()['devices']] == [device.id]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('params', [{'since': 'yesterday'}, {'until': '2026-13-01T00:00:00'}, {'device': 'abc'}])
+def test_invalid_presence_query(client, params):
+    assert client.get('/api/devices/presence', params).status_code == 400
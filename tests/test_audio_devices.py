@@ -0,0 +1,26 @@
+import pytest
+
+from api.models import KnownAudioDevice
+
+
+@pytest.fixture
+def device(db):
+    return KnownAudioDevice.objects.create(backend='pulseaudio', name='alsa_output.hdmi', nice_name='HDMI',
+                                           device_type='PLAYBACK', format='S16LE', sample_rate=48000,
+                                           channels=2, active=True)
+
+
+@pytest.mark.django_db
+def test_get_devices(client, device):
+    response = client.get('/api/devices')
+
+    assert response.status_code == 200
+    assert [d['name'] for d in response.json()] == ['alsa_output.hdmi']
+    assert 'Server-Timing' not in response
+
+
+@pytest.mark.django_db
+def test_get_devices_filters(client, device):
+    assert client.get('/api/devices', {'active': 'false'}).json() == []
+    assert client.get('/api/devices', {'device_type': 'capture'}).json() == []
+    assert len(client.get('/api/devices', {'device_type': 'playback'}).json()) == 1
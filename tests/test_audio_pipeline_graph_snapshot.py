@@ -0,0 +1,22 @@
+import json
+
+import pytest
+
+from core.audio.pipeline.audio_pipeline_graph import AudioPipelineGraph
+from core.audio.pipeline.audio_pipeline_graph_snapshot import graph_from_snapshot, graph_to_snapshot
+from pipeline_factories import make_pipeline
+from plugin.pulseaudio.models.pulse_audio_tunnel_node import PulseAudioTunnelNode
+
+
+@pytest.mark.django_db
+def test_secret_fields_are_read_from_the_database():
+    pipeline = make_pipeline('snapshot', 2)
+    tunnel = PulseAudioTunnelNode.objects.create(pipeline=pipeline, type_name='PulseAudioTunnelNode', server='remote',
+                                                 mode='SINK', sink='sink', cookie='/etc/pulse/secret-cookie')
+
+    snapshot = graph_to_snapshot(pipeline, AudioPipelineGraph(pipeline))
+
+    assert 'secret-cookie' not in json.dumps(snapshot)
+    node = next(node.data for node in graph_from_snapshot(snapshot).nodes if node.data.id == tunnel.id)
+    assert node.server == 'remote'
+    assert node.cookie == '/etc/pulse/secret-cookie'
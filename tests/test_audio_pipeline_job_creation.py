@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+import pytest
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from api.models.audio.audio_pipeline import AudioPipeline
+from api.models.audio.pipeline.audio_pipeline_apply_job import AudioPipelineApplyJob, JobKind, JobStatus
+from core.audio.pipeline import audio_pipeline_job_utils
+from core.audio.pipeline.audio_pipeline_job_utils import cancel_pending_jobs, create_pipeline_job
+
+
+@pytest.fixture
+def pipeline(db):
+    return AudioPipeline.objects.create(name='pipeline')
+
+
+@pytest.mark.django_db
+def test_pending_jobs_are_coalesced(pipeline):
+    apply, created = create_pipeline_job(pipeline, JobKind.APPLY)
+    assert created
+    assert create_pipeline_job(pipeline, JobKind.APPLY) == (apply, False)
+
+    unapply, created = create_pipeline_job(pipeline, JobKind.UNAPPLY)
+
+    assert created
+    apply.refresh_from_db()
+    assert apply.status == JobStatus.CANCELLED
+
+
+@pytest.mark.django_db
+def test_pipeline_has_one_pending_job(pipeline):
+    AudioPipelineApplyJob.objects.create(pipeline=pipeline, kind=JobKind.APPLY)
+
+    with pytest.raises(IntegrityError), transaction.atomic():
+        AudioPipelineApplyJob.objects.create(pipeline=pipeline, kind=JobKind.APPLY)
+
+
+@pytest.mark.django_db
+def test_concurrent_creation_coalesces_with_the_winner(pipeline, monkeypatch):
+    winner = AudioPipelineApplyJob.objects.create(pipeline=pipeline, kind=JobKind.APPLY)
+    pending_jobs = audio_pipeline_job_utils._pending_jobs
+    reads = []
+
+    def stale_read(pipeline):
+        # The first read happened before another request committed its job
+        reads.append(pipeline)
+        return [] if len(reads) == 1 else pending_jobs(pipeline)
+    monkeypatch.setattr(audio_pipeline_job_utils, '_pending_jobs', stale_read)
+
+    job, created = create_pipeline_job(pipeline, JobKind.APPLY)
+
+    assert (job, created) == (winner, False)
+    assert len(reads) == 2
+    assert AudioPipelineApplyJob.objects.filter(pipeline=pipeline).count() == 1
+
+
+@pytest.mark.django_db
+def test_cancellation_is_published_on_commit(pipeline, monkeypatch, django_capture_on_commit_callbacks):
+    published = []
+    monkeypatch.setattr(audio_pipeline_job_utils, 'publish_job_events',
+                        lambda job_id, status, events: published.append((job_id, status, len(events))))
+    job, _ = create_pipeline_job(pipeline, JobKind.APPLY)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            cancel_pending_jobs([job], 'Cancelled on request')
+            assert published == []
+
+    assert published == [(job.id, JobStatus.CANCELLED, 1)]
+
+
+@pytest.mark.django_db
+def test_stuck_pending_job_is_superseded(pipeline, settings):
+    settings.PIPELINE_JOB_PENDING_TIMEOUT = 60
+    stuck, _ = create_pipeline_job(pipeline, JobKind.APPLY)
+    AudioPipelineApplyJob.objects.filter(id=stuck.id).update(created_at=timezone.now() - timedelta(minutes=5))
+
+    job, created = create_pipeline_job(pipeline, JobKind.APPLY)
+
+    assert created and job.id != stuck.id
+    stuck.refresh_from_db()
+    assert stuck.status == JobStatus.CANCELLED
+
+
+@pytest.mark.django_db
+def test_job_that_cannot_be_submitted_is_failed(client, pipeline, monkeypatch):
+    class BrokenExecutor:
+        def submit(self, job, snapshot=None):
+            raise ConnectionError('Broker unreachable')
+    monkeypatch.setattr(audio_pipeline_job_utils, 'get_job_executor', lambda: BrokenExecutor())
+
+    response = client.delete(f'/api/pipelines/{pipeline.id}/apply')
+
+    assert response.status_code == 503
+    job = AudioPipelineApplyJob.objects.get(pipeline=pipeline)
+    assert job.status == JobStatus.FAILED
+    # The pipeline is not left with a pending job that every later request would coalesce onto
+    assert create_pipeline_job(pipeline, JobKind.UNAPPLY)[1]
@@ -0,0 +1,44 @@
+import pytest
+from django.core.management import call_command
+
+from api.models.audio.audio_pipeline import AudioPipeline
+from api.models.audio.pipeline.audio_pipeline_apply_job import AudioPipelineApplyJob, JobKind, JobStatus
+from api.models.audio.pipeline.audio_pipeline_job_summary import AudioPipelineJobSummary
+
+
+@pytest.fixture
+def pipeline(db):
+    pipeline = AudioPipeline.objects.create(name='pipeline')
+    AudioPipelineApplyJob.objects.bulk_create(
+        AudioPipelineApplyJob(pipeline=pipeline, kind=JobKind.APPLY, status=JobStatus.SUCCESS) for _ in range(5))
+    return pipeline
+
+
+@pytest.mark.django_db
+def test_jobs_are_paginated(client, pipeline):
+    ids = list(AudioPipelineApplyJob.objects.order_by('-id').values_list('id', flat=True))
+
+    page = client.get(f'/api/pipelines/{pipeline.id}/jobs', {'limit': 2}).json()
+    assert [job['id'] for job in page['jobs']] == ids[:2]
+    assert page['next'] == ids[1]
+
+    page = client.get(f'/api/pipelines/{pipeline.id}/jobs', {'limit': 2, 'before': page['next']}).json()
+    page = client.get(f'/api/pipelines/{pipeline.id}/jobs', {'limit': 2, 'before': page['next']}).json()
+    assert [job['id'] for job in page['jobs']] == ids[4:]
+    assert page['next'] is None
+
+
+@pytest.mark.django_db
+def test_invalid_page(client, pipeline):
+    assert client.get(f'/api/pipelines/{pipeline.id}/jobs', {'limit': 'all'}).status_code == 400
+    assert client.get(f'/api/pipelines/{pipeline.id}/jobs', {'limit': 0}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_compact_command(settings, pipeline):
+    settings.PIPELINE_JOB_HISTORY_KEEP = 2
+
+    call_command('compact_pipeline_jobs')
+
+    assert AudioPipelineApplyJob.objects.count() == 2
+    assert AudioPipelineJobSummary.objects.count() == 3
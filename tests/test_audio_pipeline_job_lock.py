@@ -0,0 +1,39 @@
+import multiprocessing
+
+import pytest
+
+from core.audio.pipeline.audio_pipeline_job_lock import pipeline_lock
+from core.audio.pipeline.pipeline_lock_timeout_exception import PipelineLockTimeoutException
+
+
+def _try_lock(lock_dir: str, pipeline_id: int, result) -> None:
+    from django.conf import settings
+    settings.PIPELINE_JOB_LOCK_DIR = lock_dir
+    try:
+        with pipeline_lock(pipeline_id, blocking_timeout=0.1):
+            result.value = 1
+    except PipelineLockTimeoutException:
+        result.value = 0
+
+
+def _lock_in_other_process(settings, pipeline_id: int) -> bool:
+    result = multiprocessing.Value('i', -1)
+    process = multiprocessing.get_context('fork').Process(target=_try_lock,
+                                                          args=(settings.PIPELINE_JOB_LOCK_DIR, pipeline_id, result))
+    process.start()
+    process.join()
+    return result.value == 1
+
+
+def test_lock_is_shared_between_processes(settings):
+    with pipeline_lock(1):
+        assert not _lock_in_other_process(settings, 1)
+        assert _lock_in_other_process(settings, 2)
+    assert _lock_in_other_process(settings, 1)
+
+
+def test_lock_times_out_within_the_process():
+    with pipeline_lock(1):
+        with pytest.raises(PipelineLockTimeoutException):
+            with pipeline_lock(1, blocking_timeout=0.1):
+                pass
@@ -0,0 +1,108 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from api.models.audio.audio_pipeline import AudioPipeline
+from api.tasks.audio_pipeline_job import _rollback, _run_node
+from core.audio.pipeline.audio_pipeline_job_deadline import JobDeadline, run_with_timeout
+from core.audio.pipeline.pipeline_job_interrupted_exception import PipelineJobTimeoutException
+
+
+class SlowManager:
+
+    def __init__(self, apply_delay: float = 0.0, unapply_delay: float = 0.0):
+        self.apply_delay = apply_delay
+        self.unapply_delay = unapply_delay
+        self.calls: list[str] = []
+        self.lock = threading.Lock()
+
+    def apply(self, node, graph):
+        time.sleep(self.apply_delay)
+        with self.lock:
+            self.calls.append('apply')
+
+    def unapply(self, node, graph):
+        time.sleep(self.unapply_delay)
+        with self.lock:
+            self.calls.append('unapply')
+
+
+def _node(manager: SlowManager, node_id: int = 1):
+    return SimpleNamespace(data=SimpleNamespace(id=node_id, get_manager=lambda: manager))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_with_timeout_keeps_the_worker():
+    with pytest.raises(PipelineJobTimeoutException) as info:
+        run_with_timeout(lambda: time.sleep(0.2), 0.01, 'Sleeping')
+
+    assert info.value.worker.thread.is_alive()
+    assert info.value.wait_worker(1.0)
+    assert not info.value.worker.thread.is_alive()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_abandoned_worker_does_not_commit():
+    def create():
+        time.sleep(0.2)
+        AudioPipeline.objects.create(name='late')
+
+    with pytest.raises(PipelineJobTimeoutException) as info:
+        run_with_timeout(create, 0.01, 'Creating')
+
+    # The wait is bounded, the job goes on while the worker is still running
+    assert not info.value.wait_worker(0.01)
+    info.value.worker.thread.join()
+    assert not AudioPipeline.objects.filter(name='late').exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_completing_within_the_grace_period_commits():
+    def create():
+        time.sleep(0.05)
+        AudioPipeline.objects.create(name='late')
+
+    with pytest.raises(PipelineJobTimeoutException) as info:
+        run_with_timeout(create, 0.01, 'Creating')
+
+    assert info.value.wait_worker(1.0)
+    assert AudioPipeline.objects.filter(name='late').exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rollback_runs_after_the_timed_out_apply():
+    manager = SlowManager(apply_delay=0.2)
+    node = _node(manager)
+    deadline = JobDeadline(1, None, 0.01)
+
+    with pytest.raises(PipelineJobTimeoutException) as info:
+        _run_node(node, None, deadline, apply=True)
+    assert info.value.wait_worker(1.0)
+
+    assert _rollback([node], None, JobDeadline(1, None, 1.0))
+    assert manager.calls == ['apply', 'unapply']
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rollback_fails_when_an_unapply_times_out():
+    manager = SlowManager(unapply_delay=0.2)
+
+    assert not _rollback([_node(manager)], None, JobDeadline(1, None, 0.01))
+    # The timed-out unapply is over when the rollback returns
+    assert manager.calls == ['unapply']
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rollback_gives_up_on_a_hung_unapply(settings):
+    settings.PIPELINE_NODE_ABANDON_AFTER = 0.01
+    manager = SlowManager(unapply_delay=0.5)
+
+    started = time.monotonic()
+    assert not _rollback([_node(manager)], None, JobDeadline(1, None, 0.01))
+    assert time.monotonic() - started < 0.4
+    # Leaves no thread running behind the test
+    for thread in threading.enumerate():
+        if thread.name.startswith('pipeline-node-'):
+            thread.join()
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from api.models.audio.audio_pipeline import AudioPipeline
+from api.models.audio.pipeline.audio_pipeline_apply_event import AudioPipelineApplyEvent, EventType
+from api.models.audio.pipeline.audio_pipeline_apply_job import AudioPipelineApplyJob, JobKind, JobStatus
+from api.views.audio.pipeline import audio_pipeline_events
+from core.audio.pipeline import audio_pipeline_job_stream
+from core.audio.pipeline.audio_pipeline_job_stream import StreamSlots, stream_job_events
+
+
+@pytest.fixture
+def job(db):
+    pipeline = AudioPipeline.objects.create(name='pipeline')
+    return AudioPipelineApplyJob.objects.create(pipeline=pipeline, kind=JobKind.APPLY, status=JobStatus.RUNNING)
+
+
+@pytest.mark.django_db
+def test_stream_of_a_running_job_ends_after_max_duration(job):
+    messages = list(stream_job_events(job.id, poll_interval=0.01, max_duration=0.05))
+
+    assert messages and all(message == ': keepalive\n\n' for message in messages)
+
+
+class LossyPubSub:
+    """Pub/sub on which the job ends while subscribed, the publish of its first event is lost."""
+
+    def __init__(self, job):
+        self.job = job
+        self.sent = False
+
+    def subscribe(self, channel):
+        pass
+
+    def get_message(self, timeout):
+        if self.sent:
+            return None
+        self.sent = True
+        AudioPipelineApplyEvent.objects.create(job=self.job, event_type=EventType.START)
+        last = AudioPipelineApplyEvent.objects.create(job=self.job, event_type=EventType.SUCCESS)
+        AudioPipelineApplyJob.objects.filter(id=self.job.id).update(status=JobStatus.SUCCESS)
+        return {'data': json.dumps({'status': JobStatus.SUCCESS, 'event': {'id': last.id}})}
+
+    def close(self):
+        pass
+
+
+class LossyRedis:
+
+    def __init__(self, job):
+        self.job = job
+
+    def pubsub(self, ignore_subscribe_messages):
+        return LossyPubSub(self.job)
+
+
+@pytest.mark.django_db
+def test_stream_replays_events_whose_publish_was_lost(job, monkeypatch):
+    monkeypatch.setattr(audio_pipeline_job_stream, 'get_redis', lambda: LossyRedis(job))
+
+    messages = list(stream_job_events(job.id, max_duration=5))
+
+    assert [json.loads(message.split('data: ')[1])['event']['event_type'] for message in messages] == \
+        [EventType.START, EventType.SUCCESS]
+
+
+def test_slots_are_freed_when_streams_close():
+    slots = StreamSlots(1)
+    first = slots.open(message for message in ['event'])
+    assert slots.open(message for message in []) is None
+
+    # Closed by the response even if the client went away before the first event
+    first.close()
+    first.close()
+
+    assert slots.open(message for message in []) is not None
+
+
+@pytest.mark.django_db
+def test_stream_is_refused_when_every_slot_is_taken(client, job, monkeypatch):
+    monkeypatch.setattr(audio_pipeline_events, 'stream_slots', StreamSlots(1))
+    audio_pipeline_events.stream_slots.open(message for message in [])
+
+    response = client.get(f'/api/pipelines/{job.pipeline_id}/job/{job.id}/stream')
+
+    assert response.status_code == 503
+    assert response['Retry-After'] == '5'
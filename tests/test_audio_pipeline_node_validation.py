@@ -0,0 +1,107 @@
+import pytest
+from django.db import models
+from rest_framework import serializers
+
+from api.views.audio.pipeline.node.audio_pipeline_nodes import NodeSerializer
+from core.audio.pipeline.audio_pipeline_node_registry import node_types
+
+
+def legacy_validate(type_name: str, fields_data: dict) -> str | None:
+    """The per-field checks NodeValidationPlan replaced, they stopped at the first error."""
+    cls = node_types.get(type_name).cls
+    for field in cls.get_exposed_fields():
+        if '_ptr' in field.name:
+            continue
+        if not field.null and not field.blank and field.default == models.NOT_PROVIDED:
+            if field.name not in fields_data and field.name not in ['id', 'type_name']:
+                return f'Field "{field.name}" is required for type {type_name}'
+    for field_name, field_value in fields_data.items():
+        try:
+            field = cls._meta.get_field(field_name)
+        except Exception:
+            return f'Field "{field_name}" does not exist for type {type_name}'
+        if field_value is None:
+            if not field.null:
+                return f'Field "{field_name}" does not allow null values'
+            continue
+        if isinstance(field, models.IntegerField):
+            if not isinstance(field_value, int):
+                return f'Field "{field_name}" must be an integer, got {type(field_value).__name__}'
+        elif isinstance(field, models.FloatField):
+            if not isinstance(field_value, (int, float)):
+                return f'Field "{field_name}" must be a number, got {type(field_value).__name__}'
+        elif isinstance(field, models.BooleanField):
+            if not isinstance(field_value, bool):
+                return f'Field "{field_name}" must be a boolean, got {type(field_value).__name__}'
+        elif isinstance(field, (models.CharField, models.TextField)):
+            if not isinstance(field_value, str):
+                return f'Field "{field_name}" must be a string, got {type(field_value).__name__}'
+            if isinstance(field, models.CharField) and field.max_length and len(field_value) > field.max_length:
+                return f'Field "{field_name}" max length is {field.max_length}, got {len(field_value)}'
+        elif field.is_relation:
+            if not isinstance(field_value, int):
+                return f'Field "{field_name}" (foreign key) must be an integer ID, got {type(field_value).__name__}'
+    return None
+
+
+CASES = [
+    # Missing required field
+    ('AudioPipelineDeviceNode', {'pipeline': 1},
+     'Field "device" is required for type AudioPipelineDeviceNode'),
+    # Unknown field
+    ('PulseAudioTunnelNode', {'unknown': 1},
+     'Field "unknown" does not exist for type PulseAudioTunnelNode'),
+    # Null on a non-null field
+    ('AudioPipelineDeviceNode', {'device': None},
+     'Field "device" does not allow null values'),
+    # String too long
+    ('PulseAudioTunnelNode', {'server': 'x' * 256},
+     'Field "server" max length is 255, got 256'),
+    ('PulseAudioTunnelNode', {'server': 1},
+     'Field "server" must be a string, got int'),
+    # Foreign key given as a non-int
+    ('AudioPipelineDeviceNode', {'device': '1'},
+     'Field "device" (foreign key) must be an integer ID, got str'),
+    ('CamillaDSPAudioPipelineNode', {'camilladsp_pipeline': 1.5},
+     'Field "camilladsp_pipeline" (foreign key) must be an integer ID, got float'),
+    ('PulseAudioPipeNode', {'latency_msec': '200'},
+     'Field "latency_msec" must be an integer, got str'),
+    ('PulseAudioPipeNode', {'auto_tune': 1},
+     'Field "auto_tune" must be a boolean, got int'),
+]
+
+
+@pytest.mark.parametrize('type_name,fields,message', CASES)
+def test_messages_match_the_per_field_checks(type_name, fields, message):
+    assert node_types.get(type_name).validation.validate(fields) == [message]
+    assert legacy_validate(type_name, fields) == message
+
+
+@pytest.mark.parametrize('type_name,fields', [
+    ('PulseAudioTunnelNode', {'server': 'host', 'mode': 'SINK', 'cookie': None}),
+    ('AudioPipelineDeviceNode', {'device': 1}),
+    ('CamillaDSPAudioPipelineNode', {'camilladsp_pipeline': None}),
+    ('PulseAudioPipeNode', {'latency_msec': 200, 'auto_tune': True}),
+])
+def test_valid_fields(type_name, fields):
+    assert node_types.get(type_name).validation.validate(fields) == []
+    assert legacy_validate(type_name, fields) is None
+
+
+def test_every_error_is_reported():
+    errors = node_types.get('AudioPipelineDeviceNode').validation.validate({'device': '1', 'unknown': 1})
+
+    assert errors == ['Field "device" (foreign key) must be an integer ID, got str',
+                      'Field "unknown" does not exist for type AudioPipelineDeviceNode']
+
+
+def test_serializer_raises_every_error():
+    serializer = NodeSerializer(data={'type_name': 'PulseAudioTunnelNode',
+                                      'fields': {'server': 1, 'unknown': 1}})
+
+    with pytest.raises(serializers.ValidationError) as info:
+        serializer.is_valid(raise_exception=True)
+    assert [str(error) for error in info.value.detail['non_field_errors']] == [
+        'Field "server" must be a string, got int',
+        'Field "unknown" does not exist for type PulseAudioTunnelNode',
+    ]
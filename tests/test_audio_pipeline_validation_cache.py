@@ -0,0 +1,78 @@
+import pytest
+
+from api.models import KnownAudioDevice, CamillaDSPPipeline
+from api.models.audio.audio_pipeline import AudioPipeline
+from api.models.audio.pipeline.audio_pipeline_edge import AudioPipelineEdge
+from api.models.audio.pipeline.audio_pipeline_node_slot import AudioPipelineNodeSlot, SlotType, SlotDirection
+from core.audio.pipeline.audio_pipeline_graph import AudioPipelineGraph
+from core.audio.pipeline.validation_cache import node_validation_cache, edge_validation_cache
+from core.camilladsp import CamillaDSPAudioPipelineNode
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    node_validation_cache.clear()
+    edge_validation_cache.clear()
+
+
+def _device(name: str, device_type: str) -> KnownAudioDevice:
+    return KnownAudioDevice.objects.create(backend='pulseaudio', name=name, device_type=device_type,
+                                           format='S16LE', sample_rate=48000, channels=2)
+
+
+@pytest.fixture
+def camilladsp_pipeline(db):
+    return CamillaDSPPipeline.objects.create(name='dsp', input_device=_device('capture', 'CAPTURE'),
+                                             output_device=_device('playback', 'PLAYBACK'), samplerate=48000)
+
+
+@pytest.fixture
+def pipeline(db, camilladsp_pipeline):
+    """Two CamillaDSP nodes, the producer slot of the first one feeds the consumer slot of the second."""
+    pipeline = AudioPipeline.objects.create(name='pipeline')
+    first, second = [CamillaDSPAudioPipelineNode.objects.create(pipeline=pipeline, type_name='CamillaDSPAudioPipelineNode',
+                                                                camilladsp_pipeline=camilladsp_pipeline)
+                     for _ in range(2)]
+    slot_a = AudioPipelineNodeSlot.objects.create(name='playback', type=SlotType.AUDIO_PRODUCER,
+                                                  direction=SlotDirection.OUTPUT, node=first)
+    slot_b = AudioPipelineNodeSlot.objects.create(name='capture', type=SlotType.AUDIO_CONSUMER,
+                                                  direction=SlotDirection.INPUT, node=second)
+    AudioPipelineEdge.objects.create(slot_a=slot_a, slot_b=slot_b)
+    return pipeline
+
+
+def _validate(pipeline: AudioPipeline):
+    return AudioPipelineGraph(pipeline).validate()
+
+
+@pytest.mark.django_db
+def test_edge_validation_follows_the_camilladsp_pipeline(pipeline, camilladsp_pipeline):
+    assert [edge.errors for edge in _validate(pipeline).edges] == [['Producer cannot only send audio to an output device']]
+
+    # The foreign key is cleared by a bulk update, the nodes are not saved
+    camilladsp_pipeline.delete()
+
+    result = _validate(pipeline)
+    assert result.edges == []
+    assert {node.fields['camilladsp_pipeline'] for node in result.nodes} == {'CamillaDSP Pipeline not set'}
+
+
+@pytest.mark.django_db
+def test_edge_validation_follows_the_devices(pipeline, camilladsp_pipeline):
+    assert len(_validate(pipeline).edges) == 1
+
+    # The slot schematics are named after the devices, the edge slots no longer match them
+    KnownAudioDevice.objects.filter(id=camilladsp_pipeline.output_device_id).update(name='other')
+
+    assert _validate(pipeline).edges == []
+
+
+@pytest.mark.django_db
+def test_validation_is_cached(pipeline, django_assert_max_num_queries):
+    _validate(pipeline)
+    graph = AudioPipelineGraph(pipeline)
+    graph.slot_schematics
+
+    # Only the revisions are read, the managers do not validate again
+    with django_assert_max_num_queries(0):
+        assert len(graph.validate().edges) == 1
@@ -0,0 +1,69 @@
+import pytest
+
+try:
+    import pulsectl  # noqa: F401
+except (ImportError, OSError) as e:
+    # The health of the pulseaudio nodes is read through their managers, which load libpulse
+    pytest.skip(f'pulsectl is not usable: {e}', allow_module_level=True)
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models.audio.audio_pipeline import AudioPipeline
+from api.views.audio.pipeline.audio_pipelines import pipeline_to_json
+from core.audio.pipeline.audio_pipeline_node_manager import AudioPipelineNodeManager
+from core.camilladsp.camilladsp_audio_pipeline_node_manager import CamillaDSPAudioPipelineNodeManager
+from pipeline_factories import make_pipeline
+
+
+def _count_queries(pipeline: AudioPipeline) -> int:
+    with CaptureQueriesContext(connection) as queries:
+        pipeline_to_json(AudioPipeline.objects.get(id=pipeline.id))
+    return len(queries)
+
+
+@pytest.mark.django_db
+def test_queries_do_not_depend_on_the_number_of_nodes():
+    small = make_pipeline('small', 2)
+    large = make_pipeline('large', 40)
+
+    assert _count_queries(small) == _count_queries(large)
+
+
+@pytest.mark.django_db
+def test_serialization(client):
+    pipeline = make_pipeline('pipeline', 3)
+
+    data = client.get(f'/api/pipelines/{pipeline.id}').json()
+
+    assert [node['type_name'] for node in data['nodes']] == ['CamillaDSPAudioPipelineNode', 'PulseAudioPipeNode',
+                                                             'CamillaDSPAudioPipelineNode']
+    assert len(data['edges']) == 2
+    assert data['nodes'][0]['fields']['camilladsp_pipeline'] is not None
+
+
+@pytest.mark.django_db
+def test_serialization_fetches_the_health_once_per_manager_class(client, monkeypatch):
+    pipeline = make_pipeline('pipeline', 4)
+    calls = []
+
+    def get_nodes_health(cls, nodes):
+        calls.append(cls)
+        return {node.id: {'alive': True} for node in nodes}
+
+    monkeypatch.setattr(AudioPipelineNodeManager, 'get_nodes_health', classmethod(get_nodes_health))
+
+    data = client.get(f'/api/pipelines/{pipeline.id}').json()
+    assert all(node['health'] == {'alive': True} for node in data['nodes'])
+    assert len(calls) == len(set(calls)) == 2
+
+
+@pytest.mark.django_db
+def test_health(client, monkeypatch):
+    pipeline = make_pipeline('pipeline', 1)
+    monkeypatch.setattr(CamillaDSPAudioPipelineNodeManager, 'get_health', lambda manager: {'alive': True})
+
+    node_id = pipeline.audiopipelinenode_set.get().id
+    assert client.get(f'/api/pipelines/{pipeline.id}').json()['nodes'][0]['health'] == {'alive': True}
+    assert client.get(f'/api/pipelines/{pipeline.id}/health').json() == {str(node_id): {'alive': True}}
+    assert client.get(f'/api/pipelines/{pipeline.id}/nodes/{node_id}').json()['health'] == {'alive': True}
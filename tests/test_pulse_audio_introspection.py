@@ -0,0 +1,63 @@
+import pytest
+
+try:
+    import pulsectl
+    from pulsectl import _pulsectl as c
+except (ImportError, OSError) as e:
+    # pulsectl loads libpulse when it is imported
+    pytest.skip(f'pulsectl is not usable: {e}', allow_module_level=True)
+
+from plugin.pulseaudio.audio import pulse_audio_introspection as introspection
+from plugin.pulseaudio.audio.backend import PulseAudioBackend
+from plugin.pulseaudio.audio.pulse_audio_introspection import (PulseSampleSpec, PulseSinkSpecInfo,
+                                                               PulseSourceSpecInfo)
+from pulse_fakes import FakePulse, single_listing_getters
+
+
+def test_private_internals_are_available():
+    # Breaks on a pulsectl upgrade changing them, the devices would then be listed one lookup at a time
+    assert callable(pulsectl.Pulse._pulse_get_list)
+    assert c.PA_SINK_INFO_CB_T and c.PA_SOURCE_INFO_CB_T
+    for name in ('context_get_sink_info_list', 'context_get_sink_info_by_index',
+                 'context_get_source_info_list', 'context_get_source_info_by_index'):
+        assert hasattr(c.pa, name)
+    assert 'sample_spec' in pulsectl.PulseSinkInfo.c_struct_fields
+    assert 'sample_spec' in pulsectl.PulseSourceInfo.c_struct_fields
+    assert introspection._getters is not None
+
+
+@pytest.mark.parametrize('info_cls, struct_cls', [
+    (PulseSinkSpecInfo, c.PA_SINK_INFO),
+    (PulseSourceSpecInfo, c.PA_SOURCE_INFO),
+])
+def test_sample_spec_is_copied_out_of_the_struct(info_cls, struct_cls):
+    struct = struct_cls()
+    struct.sample_spec.format, struct.sample_spec.rate, struct.sample_spec.channels = 3, 48000, 2
+    info = info_cls.__new__(info_cls)
+    info._init_from_struct(struct)
+
+    # libpulse reuses the memory of the struct once the callback returns
+    struct.sample_spec.format, struct.sample_spec.rate, struct.sample_spec.channels = 0, 0, 0
+
+    assert info.sample_spec == PulseSampleSpec(3, 48000, 2)
+
+
+def test_devices_are_listed_once_per_object_type(monkeypatch):
+    fake = FakePulse(sinks=3, sources=2)
+    monkeypatch.setattr(introspection, '_getters', single_listing_getters())
+
+    devices = PulseAudioBackend()._list_devices(fake)
+
+    assert fake.round_trips == 2
+    assert [device.name for device in devices] == ['source_0', 'source_1', 'sink_0', 'sink_1', 'sink_2']
+
+
+def test_fallback_looks_up_each_device(monkeypatch):
+    fake = FakePulse(sinks=3, sources=2)
+    monkeypatch.setattr(introspection, '_getters', None)
+
+    devices = PulseAudioBackend()._list_devices(fake)
+
+    assert fake.round_trips == 2 + 5
+    assert [device.name for device in devices] == ['source_0', 'source_1', 'sink_0', 'sink_1', 'sink_2']
+    assert all(device.sample_rate == 48000 and device.channels == 2 for device in devices)
@@ -0,0 +1,83 @@
+from contextlib import contextmanager
+
+import pytest
+
+try:
+    import pulsectl  # noqa: F401
+except (ImportError, OSError) as e:
+    # pulsectl loads libpulse when it is imported
+    pytest.skip(f'pulsectl is not usable: {e}', allow_module_level=True)
+
+from api.models.audio.audio_pipeline import AudioPipeline
+from plugin.pulseaudio.audio import pulse_audio_module_reconciler
+from plugin.pulseaudio.audio.pulse_audio_module_reconciler import reconcile_modules
+from plugin.pulseaudio.models.pulse_audio_created_device import PulseAudioCreatedModule
+from plugin.pulseaudio.models.pulse_audio_pipe_node import PulseAudioPipeNode
+from plugin.pulseaudio.models.pulse_audio_pipe_node_state import PulseAudioPipeNodeState
+from pulse_fakes import FakePulse
+
+
+@pytest.fixture
+def pulse(monkeypatch):
+    fake = FakePulse()
+    monkeypatch.setattr(pulse_audio_module_reconciler.pulse_connection, 'call', lambda fn: fn(fake))
+    return fake
+
+
+@pytest.fixture
+def node(db):
+    pipeline = AudioPipeline.objects.create(name='pipeline')
+    return PulseAudioPipeNode.objects.create(pipeline=pipeline, type_name='PulseAudioPipeNode')
+
+
+def _apply(pulse: FakePulse, node: PulseAudioPipeNode, index: int) -> None:
+    pulse.load(index, node.pipeline_id, node.id)
+    module = PulseAudioCreatedModule.objects.create(module_id=index)
+    PulseAudioPipeNodeState.objects.update_or_create(node=node, defaults={'module': module})
+
+
+@pytest.mark.django_db
+def test_orphans_are_unloaded(pulse, node):
+    _apply(pulse, node, 1)
+    pulse.load(2, node.pipeline_id, node.id)
+
+    report = reconcile_modules()
+
+    assert report.unloaded == (2,)
+    assert list(pulse.modules) == [1]
+
+
+@pytest.mark.django_db
+def test_stale_states_are_pruned(pulse, node):
+    _apply(pulse, node, 1)
+    del pulse.modules[1]
+
+    report = reconcile_modules()
+
+    assert report.pruned_states == 1
+    assert not PulseAudioPipeNodeState.objects.exists()
+    assert not PulseAudioCreatedModule.objects.exists()
+    assert AudioPipeline.objects.get(id=node.pipeline_id).stale
+
+
+@pytest.mark.django_db
+def test_module_of_an_apply_completed_while_waiting_for_the_lock_is_kept(pulse, node, monkeypatch):
+    # Loaded by an apply that has not recorded its state yet when the modules are first listed
+    pulse.load(1, node.pipeline_id, node.id)
+    lock = pulse_audio_module_reconciler.pipeline_lock
+
+    @contextmanager
+    def pipeline_lock(pipeline_id, blocking_timeout=None):
+        # The apply records its state and releases the lock
+        module = PulseAudioCreatedModule.objects.create(module_id=1)
+        PulseAudioPipeNodeState.objects.create(node=node, module=module)
+        with lock(pipeline_id, blocking_timeout):
+            yield
+
+    monkeypatch.setattr(pulse_audio_module_reconciler, 'pipeline_lock', pipeline_lock)
+
+    report = reconcile_modules()
+
+    assert report.unloaded == ()
+    assert list(pulse.modules) == [1]
+    assert PulseAudioPipeNodeState.objects.filter(node=node).exists()
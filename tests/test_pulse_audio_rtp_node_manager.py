@@ -0,0 +1,63 @@
+import pytest
+
+try:
+    import pulsectl  # noqa: F401
+except (ImportError, OSError) as e:
+    # pulsectl loads libpulse when it is imported
+    pytest.skip(f'pulsectl is not usable: {e}', allow_module_level=True)
+
+from itertools import count
+
+from django.db import DatabaseError
+
+from api.models.audio.audio_pipeline import AudioPipeline
+from core.audio.audio_device import AudioDevice, AudioDeviceType
+from core.audio.sample_format_enum import SampleFormatEnum
+from plugin.pulseaudio.audio.backend import PulseAudioBackend
+from plugin.pulseaudio.models.pulse_audio_created_device import PulseAudioCreatedModule
+from plugin.pulseaudio.models.pulse_audio_rtp_node import PulseAudioRtpNode
+from plugin.pulseaudio.models.pulse_audio_rtp_node_state import PulseAudioRtpNodeState
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('mode', ['SEND', 'RECEIVE'])
+def test_failed_apply_unloads_its_modules(mode, monkeypatch):
+    pipeline = AudioPipeline.objects.create(name='pipeline')
+    node = PulseAudioRtpNode.objects.create(pipeline=pipeline, type_name='PulseAudioRtpNode', mode=mode)
+    module_ids = count(42)
+    unloaded = []
+    monkeypatch.setattr(PulseAudioBackend, 'add_module',
+                        lambda self, name, args: PulseAudioCreatedModule.objects.create(module_id=next(module_ids)))
+    monkeypatch.setattr(PulseAudioBackend, 'del_module', lambda self, module: unloaded.append(module.module_id))
+
+    def get_device(self, name):
+        return AudioDevice(self, name, name, AudioDeviceType.PLAYBACK, SampleFormatEnum.S16LE, 48000, 2)
+    monkeypatch.setattr(PulseAudioBackend, 'get_sink', get_device)
+    monkeypatch.setattr(PulseAudioBackend, 'get_source', get_device)
+
+    def unavailable(**kwargs):
+        raise DatabaseError('database is locked')
+    monkeypatch.setattr(PulseAudioRtpNodeState.objects, 'create', unavailable)
+
+    with pytest.raises(DatabaseError):
+        node.get_manager().apply(None, None)
+
+    # The RTP module first, then the null sink it uses
+    assert unloaded == [43, 42]
+    assert not PulseAudioRtpNodeState.objects.exists()
+
+
+@pytest.mark.parametrize('mode, slot', [('RECEIVE', 'RTP Receiver'), ('receive', 'RTP Receiver'),
+                                        ('SEND', 'RTP Sender'), ('send', 'RTP Sender')])
+def test_mode_is_case_insensitive(mode, slot):
+    node = PulseAudioRtpNode(id=1, pipeline_id=1, mode=mode)
+
+    assert [s.name for s in node.get_manager().get_dynamic_slots_schematics()] == [slot]
+
+
+@pytest.mark.parametrize('mode', ['SEND', 'send'])
+def test_sender_needs_a_multicast_destination(mode):
+    node = PulseAudioRtpNode(id=1, pipeline_id=1, mode=mode, destination_ip='192.168.1.10')
+
+    assert node.get_manager().validate(None, None).fields == {
+        'destination_ip': 'Destination must be a multicast address when mode is send'}
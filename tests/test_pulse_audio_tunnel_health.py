@@ -0,0 +1,29 @@
+import os
+import time
+
+from plugin.pulseaudio.audio.pulse_audio_tunnel_health import TunnelHealthSample, TunnelHealthStore
+
+
+def test_series_are_shared_without_redis():
+    monitor, worker = TunnelHealthStore(max_samples=3), TunnelHealthStore(max_samples=3)
+    for at in range(5):
+        monitor.add({1: TunnelHealthSample(at, True, 1000 * at), 2: TunnelHealthSample(at, at % 2 == 0)})
+    monitor.count_reconnect(2)
+
+    series = worker.read([1, 2, 3])
+
+    assert series[1] == ([TunnelHealthSample(2, True, 2000), TunnelHealthSample(3, True, 3000),
+                          TunnelHealthSample(4, True, 4000)], 0)
+    assert [sample.present for sample in series[2][0]] == [True, False, True] and series[2][1] == 1
+    assert series[3] == ([], 0)
+
+
+def test_forgotten_and_expired_series_are_not_read(settings):
+    store = TunnelHealthStore(max_samples=3, ttl=60)
+    store.add({1: TunnelHealthSample(0, True), 2: TunnelHealthSample(0, True)})
+
+    store.forget({1})
+    path = os.path.join(settings.PULSEAUDIO_TUNNEL_HEALTH_DIR, 'tunnel-2.json')
+    os.utime(path, (time.time() - 120, time.time() - 120))
+
+    assert store.read([1, 2]) == {1: ([], 0), 2: ([], 0)}
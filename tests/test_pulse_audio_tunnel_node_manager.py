@@ -0,0 +1,47 @@
+import pytest
+
+try:
+    import pulsectl  # noqa: F401
+except (ImportError, OSError) as e:
+    # pulsectl loads libpulse when it is imported
+    pytest.skip(f'pulsectl is not usable: {e}', allow_module_level=True)
+
+from api.models.audio.audio_pipeline import AudioPipeline
+from plugin.pulseaudio.audio.backend import PulseAudioBackend
+from plugin.pulseaudio.models.pulse_audio_created_device import PulseAudioCreatedModule
+from plugin.pulseaudio.models.pulse_audio_tunnel_node import PulseAudioTunnelNode
+from plugin.pulseaudio.models.pulse_audio_tunnel_node_state import PulseAudioTunnelNodeState
+
+
+@pytest.mark.django_db
+def test_failed_apply_unloads_its_module(monkeypatch):
+    pipeline = AudioPipeline.objects.create(name='pipeline')
+    node = PulseAudioTunnelNode.objects.create(pipeline=pipeline, type_name='PulseAudioTunnelNode',
+                                               server='remote', mode='SOURCE', source='source')
+    unloaded = []
+    monkeypatch.setattr(PulseAudioBackend, 'add_module',
+                        lambda self, name, args: PulseAudioCreatedModule.objects.create(module_id=42))
+    monkeypatch.setattr(PulseAudioBackend, 'del_module', lambda self, module: unloaded.append(module.module_id))
+
+    def unreachable(self, name):
+        raise ValueError(f"Device '{name}' not found")
+    monkeypatch.setattr(PulseAudioBackend, 'get_source', unreachable)
+
+    with pytest.raises(ValueError):
+        node.get_manager().apply(None, None)
+
+    assert unloaded == [42]
+    assert not PulseAudioTunnelNodeState.objects.exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('mode', ['SOURCE', 'source'])
+def test_mode_is_case_insensitive(mode):
+    pipeline = AudioPipeline.objects.create(name='pipeline')
+    node = PulseAudioTunnelNode(pipeline=pipeline, type_name='PulseAudioTunnelNode', server='remote', mode=mode)
+    manager = node.get_manager()
+
+    assert manager.validate(None, None).fields == {'source': 'Source must be specified when mode is source'}
+    node.source = 'source'
+    assert manager.validate(None, None) is None
+    assert [slot.name for slot in manager.get_dynamic_slots_schematics()] == ['source']